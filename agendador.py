@@ -0,0 +1,101 @@
+import threading
+import time
+
+import numpy as np
+
+from telemetria import TELEMETRIA
+
+
+class AgendadorInferencia:
+    """Escolhe a taxa de inferência e faz a entrega de frames entre threads
+
+    Substitui o frame_skip fixo e a flag processando. O intervalo entre
+    frames entregues ao YOLO sai da latência medida de inferência, da
+    ocupação atual e de um orçamento de latência:
+
+    - pessoa perto da máquina: taxa cheia (intervalo 0)
+    - pessoa presente, longe: metade da folga do orçamento
+    - área vazia: toda a folga (orçamento - latência média), ou seja, quem
+      entrar é detectado em no máximo ~orcamento_latencia segundos
+
+    A entrega usa uma Condition: a thread do YOLO dorme em aguardar_frame()
+    em vez de ficar consultando uma fila.
+    """
+
+    def __init__(self, orcamento_latencia=0.3, distancia_perto=200, alfa=0.2):
+        self.orcamento_latencia = orcamento_latencia  # s
+        self.distancia_perto = distancia_perto  # cm
+        self.alfa = alfa  # suavização da latência medida
+
+        self.latencia_media = 0.0
+        self.ocupacao = 'vazio'  # 'vazio' | 'presente' | 'perto'
+        self.enviados = 0
+
+        self._condicao = threading.Condition()
+        self._pendente = None
+        self._ocupado = False
+        self._ultimo_envio = -float('inf')
+        self._tempo_entrega = 0.0
+
+    def intervalo_alvo(self):
+        """Intervalo desejado entre entregas ao YOLO (s)"""
+        if self.ocupacao == 'perto':
+            return 0.0
+        folga = max(0.0, self.orcamento_latencia - self.latencia_media)
+        if self.ocupacao == 'presente':
+            return folga / 2
+        return folga
+
+    def tempo_ate_pronto(self):
+        """None se o YOLO está ocupado; senão segundos até a próxima entrega"""
+        with self._condicao:
+            if self._ocupado:
+                return None
+            return max(0.0, self._ultimo_envio + self.intervalo_alvo() - time.monotonic())
+
+    def pronto(self):
+        """O YOLO está livre e já é hora de mandar um frame?"""
+        return self.tempo_ate_pronto() == 0.0
+
+    def entregar(self, frame_info):
+        """Produtor: entregar o frame (o buffer fica com o YOLO até concluir)"""
+        with self._condicao:
+            self._pendente = frame_info
+            self._ocupado = True
+            self._ultimo_envio = time.monotonic()
+            self._tempo_entrega = time.perf_counter()
+            self.enviados += 1
+            self._condicao.notify_all()
+        TELEMETRIA.contar('frames_entregues')
+
+    def aguardar_frame(self, timeout=0.5):
+        """Thread do YOLO: bloquear até haver frame (sem polling)"""
+        with self._condicao:
+            self._condicao.wait_for(lambda: self._pendente is not None, timeout)
+            frame_info, self._pendente = self._pendente, None
+            if frame_info is not None:
+                TELEMETRIA.observar('espera_fila', time.perf_counter() - self._tempo_entrega)
+            return frame_info
+
+    def concluir(self, pessoas, duracao=None):
+        """Thread do YOLO: frame terminado (pessoas = array PESSOA_DTYPE)
+
+        duracao=None quando o YOLO foi pulado (não entra na média).
+        """
+        with self._condicao:
+            if duracao is not None:
+                if self.latencia_media == 0.0:
+                    self.latencia_media = duracao
+                else:
+                    self.latencia_media += self.alfa * (duracao - self.latencia_media)
+
+            distancias = pessoas['distancia']
+            if np.any((distancias > 0) & (distancias < self.distancia_perto)):
+                self.ocupacao = 'perto'
+            elif len(pessoas):
+                self.ocupacao = 'presente'
+            else:
+                self.ocupacao = 'vazio'
+
+            self._ocupado = False
+            self._condicao.notify_all()
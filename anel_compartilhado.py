@@ -0,0 +1,226 @@
+import multiprocessing as mp
+from multiprocessing import shared_memory
+
+import numpy as np
+
+# Cabeçalho de cada slot do anel de frames. sequencia < 0 = slot sendo escrito.
+CABECALHO_FRAME = np.dtype([
+    ('sequencia', 'i8'),
+    ('tempo', 'f8'),
+    ('relogio', 'f8'),  # time.time() da decodificação em fontes gravadas (0 = ao vivo)
+    ('altura', 'i4'),
+    ('largura', 'i4'),
+])
+
+
+def aguardar_sinal(sinal, timeout):
+    """Dormir até o semáforo ser liberado e zerar os avisos acumulados"""
+    avisado = sinal.acquire(timeout=timeout)
+    while sinal.acquire(False):
+        pass
+    return avisado
+
+
+class AnelFrames:
+    """Anel de frames BGR em multiprocessing.shared_memory (sem pickle por frame)
+
+    Um único escritor (processo de captura) decodifica direto num slot com
+    reservar()/publicar(); os leitores copiam um frame com ler(k),
+    normalmente k = publicados (o mais recente). Cada slot tem um seqlock:
+    o leitor confere a sequência antes e depois da cópia e descarta o frame
+    se o escritor deu a volta no anel durante a leitura.
+
+    Nenhuma trava é compartilhada: um processo morto no meio de uma
+    operação não bloqueia os outros. Os leitores dormem num semáforo
+    próprio (um por leitor), liberado a cada frame publicado.
+
+    Os slots têm capacidade fixa (capacidade = (altura, largura) máxima);
+    a forma real de cada frame vai no cabeçalho do slot. O objeto pode ser
+    passado como argumento para multiprocessing.Process: no processo filho
+    ele se reanexa ao mesmo bloco pelo nome.
+    """
+
+    def __init__(self, capacidade=(1080, 1920), slots=4, leitores=1, contexto=mp):
+        self.capacidade = capacidade
+        self.slots = slots
+        self.sinais = [contexto.Semaphore(0) for _ in range(leitores)]
+        tamanho_slot = capacidade[0] * capacidade[1] * 3
+        tamanho = 8 + slots * CABECALHO_FRAME.itemsize + slots * tamanho_slot
+        self.shm = shared_memory.SharedMemory(create=True, size=tamanho)
+        self.dono = True
+        self._mapear()
+        self._publicados[0] = 0
+        self._cabecalhos['sequencia'] = 0
+
+    def _mapear(self):
+        buf = self.shm.buf
+        self._publicados = np.ndarray((1,), np.int64, buf)
+        self._cabecalhos = np.ndarray((self.slots,), CABECALHO_FRAME, buf, offset=8)
+        self._tamanho_slot = self.capacidade[0] * self.capacidade[1] * 3
+        self._inicio_dados = 8 + self.slots * CABECALHO_FRAME.itemsize
+
+    def __getstate__(self):
+        return {'capacidade': self.capacidade, 'slots': self.slots,
+                'sinais': self.sinais, 'nome': self.shm.name}
+
+    def __setstate__(self, estado):
+        self.capacidade = estado['capacidade']
+        self.slots = estado['slots']
+        self.sinais = estado['sinais']
+        self.shm = shared_memory.SharedMemory(name=estado['nome'])
+        self.dono = False
+        self._mapear()
+
+    @property
+    def publicados(self):
+        """Sequência do frame mais recente (0 = nenhum ainda)"""
+        return int(self._publicados[0])
+
+    def _view(self, slot, shape):
+        offset = self._inicio_dados + slot * self._tamanho_slot
+        return np.ndarray(shape, np.uint8, self.shm.buf, offset=offset)
+
+    def reservar(self, shape):
+        """Buffer (view do próximo slot) onde o escritor decodifica o frame"""
+        if shape[0] > self.capacidade[0] or shape[1] > self.capacidade[1]:
+            raise ValueError(f"frame {shape[:2]} maior que a capacidade do anel {self.capacidade}")
+        k = self.publicados + 1
+        cabecalho = self._cabecalhos[k % self.slots]
+        cabecalho['sequencia'] = -k
+        cabecalho['altura'], cabecalho['largura'] = shape[:2]
+        return self._view(k % self.slots, (shape[0], shape[1], 3))
+
+    def publicar(self, tempo, relogio=None):
+        """Liberar o slot reservado para os leitores"""
+        k = self.publicados + 1
+        cabecalho = self._cabecalhos[k % self.slots]
+        cabecalho['tempo'] = tempo
+        cabecalho['relogio'] = relogio or 0.0
+        cabecalho['sequencia'] = k
+        self._publicados[0] = k
+        for sinal in self.sinais:
+            sinal.release()
+        return k
+
+    def aguardar(self, visto, timeout=1.0, leitor=0):
+        """Bloquear até existir frame mais novo que `visto`"""
+        if self.publicados <= visto:
+            aguardar_sinal(self.sinais[leitor], timeout)
+        return self.publicados
+
+    def ler(self, k, destino=None):
+        """Copiar o frame k: (tempo, relogio, frame), ou None se o escritor já reescreveu o slot
+
+        destino é reaproveitado quando tem a forma certa.
+        """
+        cabecalho = self._cabecalhos[k % self.slots]
+        if cabecalho['sequencia'] != k:
+            return None
+        shape = (int(cabecalho['altura']), int(cabecalho['largura']), 3)
+        tempo = float(cabecalho['tempo'])
+        relogio = float(cabecalho['relogio']) or None
+        if destino is None or destino.shape != shape:
+            destino = np.empty(shape, np.uint8)
+        np.copyto(destino, self._view(k % self.slots, shape))
+        if cabecalho['sequencia'] != k:
+            return None  # o escritor deu a volta durante a cópia
+        return tempo, relogio, destino
+
+    def fechar(self):
+        """Soltar o mapeamento (e remover o bloco, no processo que o criou)"""
+        self._publicados = self._cabecalhos = None
+        self.shm.close()
+        if self.dono:
+            self.shm.unlink()
+
+
+class AnelRegistros:
+    """Anel de registros de tamanho fixo (array estruturado) em memória compartilhada
+
+    Para resultados pequenos entre processos (caixas de um frame, valores
+    do PLC): um escritor, um leitor que percorre os registros em ordem com
+    novos(). Mesmo seqlock do AnelFrames, sem trava compartilhada. O dtype
+    precisa de um campo 'sequencia' (i8), preenchido pelo anel.
+
+    sinal: semáforo liberado a cada registro; vários anéis podem dividir o
+    mesmo sinal quando um leitor consome de vários escritores.
+    """
+
+    def __init__(self, dtype, slots=16, sinal=None, contexto=mp):
+        self.dtype = np.dtype(dtype)
+        self.slots = slots
+        self.sinal = sinal if sinal is not None else contexto.Semaphore(0)
+        self.shm = shared_memory.SharedMemory(create=True, size=8 + slots * self.dtype.itemsize)
+        self.dono = True
+        self._mapear()
+        self._publicados[0] = 0
+        self._registros['sequencia'] = 0
+
+    def _mapear(self):
+        self._publicados = np.ndarray((1,), np.int64, self.shm.buf)
+        self._registros = np.ndarray((self.slots,), self.dtype, self.shm.buf, offset=8)
+
+    def __getstate__(self):
+        return {'dtype': self.dtype, 'slots': self.slots,
+                'sinal': self.sinal, 'nome': self.shm.name}
+
+    def __setstate__(self, estado):
+        self.dtype = estado['dtype']
+        self.slots = estado['slots']
+        self.sinal = estado['sinal']
+        self.shm = shared_memory.SharedMemory(name=estado['nome'])
+        self.dono = False
+        self._mapear()
+
+    @property
+    def publicados(self):
+        return int(self._publicados[0])
+
+    def escrever(self, **campos):
+        """Gravar um registro (campos ausentes ficam zerados); retorna a sequência"""
+        k = self.publicados + 1
+        registro = np.zeros((), self.dtype)
+        for nome, valor in campos.items():
+            if registro[nome].ndim:
+                registro[nome][:len(valor)] = valor  # campo vetorial parcialmente preenchido
+            else:
+                registro[nome] = valor
+        registro['sequencia'] = -k
+
+        slot = k % self.slots
+        self._registros['sequencia'][slot] = -k
+        self._registros[slot] = registro
+        self._registros['sequencia'][slot] = k
+        self._publicados[0] = k
+        self.sinal.release()
+        return k
+
+    def aguardar(self, visto, timeout=1.0):
+        """Bloquear até existir registro mais novo que `visto`"""
+        if self.publicados <= visto:
+            aguardar_sinal(self.sinal, timeout)
+        return self.publicados
+
+    def ler(self, k):
+        """Cópia do registro k, ou None se ele já foi sobrescrito (leitor atrasado)"""
+        slot = k % self.slots
+        registro = self._registros[slot].copy()
+        if registro['sequencia'] != k or self._registros['sequencia'][slot] != k:
+            return None
+        return registro
+
+    def novos(self, lido):
+        """(publicados, registros depois de `lido` que ainda estão no anel)"""
+        publicados = self.publicados
+        registros = []
+        for k in range(max(lido + 1, publicados - self.slots + 1), publicados + 1):
+            registro = self.ler(k)
+            if registro is not None:
+                registros.append(registro)
+        return publicados, registros
+
+    def fechar(self):
+        self._publicados = self._registros = None
+        self.shm.close()
+        if self.dono:
+            self.shm.unlink()
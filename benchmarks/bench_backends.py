@@ -0,0 +1,108 @@
+"""Benchmark: backends de inferência (PyTorch vs ONNX Runtime vs OpenVINO, FP32/INT8)
+
+Roda o mesmo clipe em cada backend e mede a latência por frame (média,
+p50, p99), o throughput e a concordância das detecções com o primeiro
+backend da lista (referência): caixas pareadas com IoU >= 0.5, recall e
+precisão em relação à referência e IoU médio dos pares.
+
+Variantes: ultralytics, onnx, onnx:int8, openvino, openvino:int8.
+
+Uso (na raiz do repositório):
+    python -m benchmarks.bench_backends gravacao.mp4 --variantes ultralytics onnx onnx:int8 openvino --threads 4
+"""
+import argparse
+import time
+
+import cv2
+import numpy as np
+
+from inferencia import criar_backend
+from rastreador import CUSTO_INVIAVEL, associar, matriz_iou
+
+
+def carregar_clipe(caminho, limite):
+    """Decodificar até `limite` frames em meia resolução (fora da medição)"""
+    cap = cv2.VideoCapture(caminho)
+    frames = []
+    while len(frames) < limite:
+        ret, frame = cap.read()
+        if not ret:
+            break
+        frames.append(cv2.resize(frame, (frame.shape[1]//2, frame.shape[0]//2)))
+    cap.release()
+    if not frames:
+        raise SystemExit(f"❌ Nenhum frame lido de {caminho}")
+    return frames
+
+
+def medir(backend, frames, aquecimento=10):
+    for frame in frames[:aquecimento]:
+        backend.detectar([frame])
+
+    tempos = []
+    saidas = []
+    inicio = time.perf_counter()
+    for frame in frames:
+        t0 = time.perf_counter()
+        saidas.append(backend.detectar([frame])[0])
+        tempos.append((time.perf_counter() - t0) * 1000)
+    parede = time.perf_counter() - inicio
+    return np.array(tempos), len(frames) / parede, saidas
+
+
+def concordancia(referencia, saidas, limiar_iou=0.5):
+    """(recall, precisão, IoU médio) das detecções em relação à referência"""
+    pares = total_ref = total = 0
+    soma_iou = 0.0
+    for ref, det in zip(referencia, saidas):
+        total_ref += len(ref)
+        total += len(det)
+        if len(ref) == 0 or len(det) == 0:
+            continue
+        iou = matriz_iou(ref.xyxy.astype(np.float64), det.xyxy.astype(np.float64))
+        custo = np.where(iou >= limiar_iou, 1.0 - iou, CUSTO_INVIAVEL)
+        linhas, colunas = associar(custo)
+        pares += len(linhas)
+        soma_iou += float(iou[linhas, colunas].sum())
+
+    recall = pares / total_ref if total_ref else 1.0
+    precisao = pares / total if total else 1.0
+    return recall, precisao, soma_iou / pares if pares else 0.0
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('clipe')
+    parser.add_argument('--variantes', nargs='+', default=['ultralytics', 'onnx', 'openvino'])
+    parser.add_argument('--frames', type=int, default=300)
+    parser.add_argument('--modelo', default='yolov8n.pt')
+    parser.add_argument('--imgsz', type=int, default=640)
+    parser.add_argument('--threads', type=int, default=None, help='threads intra-op')
+    parser.add_argument('--calibracao', default=None,
+                        help='frames para o INT8 (padrão: o próprio clipe)')
+    args = parser.parse_args()
+
+    frames = carregar_clipe(args.clipe, args.frames)
+
+    referencia = None
+    print(f"{'backend':<14} | {'média ms':>8} | {'p50 ms':>7} | {'p99 ms':>7} | {'frames/s':>8} | "
+          f"{'recall':>6} | {'precisão':>8} | {'IoU':>5}")
+    for variante in args.variantes:
+        tipo, _, sufixo = variante.partition(':')
+        try:
+            backend = criar_backend(tipo, args.modelo, args.imgsz, args.threads,
+                                    int8=sufixo == 'int8', calibracao=args.calibracao or args.clipe)
+        except ImportError as e:
+            print(f"{variante:<14} | indisponível ({e.name} não instalado)")
+            continue
+
+        tempos, fps, saidas = medir(backend, frames)
+        if referencia is None:
+            referencia = saidas
+        recall, precisao, iou = concordancia(referencia, saidas)
+        print(f"{variante:<14} | {tempos.mean():8.2f} | {np.percentile(tempos, 50):7.2f} | "
+              f"{np.percentile(tempos, 99):7.2f} | {fps:8.1f} | {recall:6.3f} | {precisao:8.3f} | {iou:5.3f}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,115 @@
+"""Benchmark: captura síncrona (legado) vs thread de captura com buffers pré-alocados
+
+Mede, por frame processado, a latência decodificação→detecção (com inferência
+simulada), os bytes alocados pelo laço consumidor (tracemalloc) e os frames
+pulados para manter só o mais recente. Com arquivo, --tempo-real cadencia a
+fonte no FPS do vídeo. O atraso de buffer do RTSP só aparece com a câmera
+real: passe a URL rtsp:// como fonte.
+
+Uso (na raiz do repositório):
+    python -m benchmarks.bench_captura gravacao.mp4 --tempo-real --inferencia-ms 60
+    python -m benchmarks.bench_captura gravacao.mp4 --backend ffmpeg --tamanho 640x360
+"""
+import argparse
+import time
+import tracemalloc
+
+import cv2
+import numpy as np
+
+from captura import CapturaFrames
+
+
+def resumo(nome, latencias, alocados, pulados):
+    latencias = np.array(latencias) * 1000
+    print(f"{nome:<16} latência média: {latencias.mean():6.1f} ms | p95: {np.percentile(latencias, 95):6.1f} ms "
+          f"| alocado/frame: {np.mean(alocados) / 1024:8.1f} KB | frames pulados: {pulados}")
+
+
+def legado(fonte, frames, inferencia_s, tempo_real):
+    """Caminho anterior: cap.read() no laço + cv2.resize alocando a cada frame
+
+    Com --tempo-real o frame k "chega" em t0 + k/fps, como numa câmera ao
+    vivo que não espera o consumidor: o atraso acumulado no buffer entra
+    na latência.
+    """
+    cap = cv2.VideoCapture(fonte)
+    cap.set(cv2.CAP_PROP_BUFFERSIZE, 1)
+    intervalo = 1.0 / (cap.get(cv2.CAP_PROP_FPS) or 30) if tempo_real else 0.0
+
+    latencias, alocados = [], []
+    inicio = time.time()
+    k = 0
+    while len(latencias) < frames:
+        chegada = inicio + k * intervalo
+        k += 1
+        if intervalo:
+            time.sleep(max(0.0, chegada - time.time()))
+
+        base, _ = tracemalloc.get_traced_memory()
+        tracemalloc.reset_peak()
+        ret, frame = cap.read()
+        if not ret:
+            break
+        tempo = chegada if intervalo else time.time()
+        frame_pequeno = cv2.resize(frame, (frame.shape[1]//2, frame.shape[0]//2))
+        alocados.append(tracemalloc.get_traced_memory()[1] - base)
+
+        time.sleep(inferencia_s)  # YOLO simulado sobre frame_pequeno
+        latencias.append(time.time() - (tempo if relogio is None else relogio))
+        del frame, frame_pequeno
+
+    cap.release()
+    resumo('legado', latencias, alocados, 0)
+
+
+def com_thread(fonte, frames, inferencia_s, tempo_real, backend, tamanho):
+    captura = CapturaFrames(fonte, backend=backend, tamanho_ffmpeg=tamanho, tempo_real=tempo_real)
+    if not captura.iniciar():
+        print(f"❌ Falha abrindo {fonte} ({backend})")
+        return
+
+    frame = captura.novo_buffer()
+    frame_pequeno = captura.novo_buffer_inferencia()
+
+    latencias, alocados = [], []
+    sequencia, _, _ = captura.copiar()
+    primeira = sequencia
+    while len(latencias) < frames:
+        nova = captura.aguardar(sequencia, timeout=2.0)
+        if nova == sequencia:
+            break
+
+        base, _ = tracemalloc.get_traced_memory()
+        tracemalloc.reset_peak()
+        sequencia, tempo, relogio = captura.copiar(frame, frame_pequeno)
+        alocados.append(tracemalloc.get_traced_memory()[1] - base)
+
+        time.sleep(inferencia_s)  # YOLO simulado sobre frame_pequeno
+        latencias.append(time.time() - (tempo if relogio is None else relogio))
+
+    captura.parar()
+    pulados = sequencia - primeira - len(latencias)
+    resumo(f'thread/{backend}', latencias, alocados, pulados)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('fonte')
+    parser.add_argument('--frames', type=int, default=200)
+    parser.add_argument('--inferencia-ms', type=float, default=50.0)
+    parser.add_argument('--tempo-real', action='store_true', help='cadenciar arquivo no FPS do vídeo')
+    parser.add_argument('--backend', choices=['opencv', 'ffmpeg'], default='opencv')
+    parser.add_argument('--tamanho', default=None, help='LxA de saída do decoder (backend ffmpeg)')
+    args = parser.parse_args()
+
+    tamanho = tuple(int(v) for v in args.tamanho.split('x')) if args.tamanho else None
+
+    tracemalloc.start()
+    legado(args.fonte, args.frames, args.inferencia_ms / 1000, args.tempo_real)
+    com_thread(args.fonte, args.frames, args.inferencia_ms / 1000, args.tempo_real, args.backend, tamanho)
+    tracemalloc.stop()
+
+
+if __name__ == '__main__':
+    main()
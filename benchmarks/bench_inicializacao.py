@@ -0,0 +1,123 @@
+"""Benchmark: tempo de partida até a primeira escrita válida no PLC
+
+Cada partida é um processo novo (imports, modelo, câmera) contra o
+servidor snap7 local. A partir do lançamento do processo mede:
+
+- PLC conectado: o heartbeat já chega ao PLC
+- Sistema_Funcionando: DB17.DBX16.0 = TRUE
+- 1ª escrita válida: Sistema_Funcionando = TRUE com dados de detecção
+  (Timestamp_Unix preenchido)
+
+Modos: 'sequencial' (modelo → câmera → laço, sem aquecimento, como antes)
+e 'rapido' (inicializar(): modelo e câmera em paralelo, modelo exportado em
+cache e aquecimento). O modo rápido roda com o cache vazio e depois quente.
+
+Uso (na raiz do repositório):
+    python -m benchmarks.bench_inicializacao gravacao.mp4 --backend onnx --repeticoes 3
+"""
+import argparse
+import os
+import subprocess
+import sys
+import tempfile
+import time
+
+import numpy as np
+
+from plc_db17 import LAYOUT_DB17
+from plc_simulado import ServidorPLCSimulado
+
+
+def executar_filho(args):
+    """Processo medido: sobe o detector pelo caminho pedido e roda headless"""
+    from detector_pessoas import DetectorPessoasInteligente
+    from plc_io import EscritorPLC
+
+    escritor = EscritorPLC('127.0.0.1', porta=args.porta, pronto=args.filho == 'sequencial')
+    escritor.iniciar()
+
+    detector = DetectorPessoasInteligente(args.clipe, canal_plc=escritor.canal_padrao)
+    detector.headless = True
+    detector.backend_inferencia = args.backend
+    detector.modelo_yolo = args.modelo
+
+    if args.filho == 'sequencial':
+        ok = detector.carregar_yolo() and detector.conectar_camera()
+    else:
+        ok = detector.inicializar()
+    if ok:
+        detector.executar()
+
+
+def medir_partida(args, modo, servidor, timeout=120):
+    """Lançar um processo e cronometrar os marcos vistos no DB do servidor"""
+    servidor.memoria_db[:] = bytes(len(servidor.memoria_db))
+    byte_status, bit_status = LAYOUT_DB17.campos['sistema_funcionando'][1:3]
+    byte_tempo = LAYOUT_DB17.offset('timestamp_unix')
+
+    comando = [sys.executable, '-m', 'benchmarks.bench_inicializacao', args.clipe,
+               '--filho', modo, '--porta', str(args.porta),
+               '--backend', args.backend, '--modelo', args.modelo]
+    inicio = time.monotonic()
+    processo = subprocess.Popen(comando, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+
+    marcos = {'conectado': None, 'funcionando': None, 'valido': None}
+    try:
+        while marcos['valido'] is None and time.monotonic() - inicio < timeout:
+            agora = time.monotonic() - inicio
+            if marcos['conectado'] is None and servidor.servidor.get_status()[2] > 0:
+                marcos['conectado'] = agora
+
+            funcionando = servidor.memoria_db[byte_status] >> bit_status & 1
+            if funcionando and marcos['funcionando'] is None:
+                marcos['funcionando'] = agora
+            if funcionando and any(servidor.ler(byte_tempo, 4)):
+                marcos['valido'] = agora
+
+            if processo.poll() is not None:
+                break
+            time.sleep(0.002)
+    finally:
+        processo.kill()
+        processo.wait()
+        time.sleep(0.5)  # o servidor derruba a conexão antiga
+    return marcos
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('clipe', help='vídeo gravado no lugar da câmera')
+    parser.add_argument('--backend', default='ultralytics')
+    parser.add_argument('--modelo', default='yolov8n.pt')
+    parser.add_argument('--repeticoes', type=int, default=3)
+    parser.add_argument('--porta', type=int, default=1102)
+    parser.add_argument('--filho', default=None, help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.filho:
+        return executar_filho(args)
+
+    # Cache de modelos isolado: a 1ª partida rápida começa com ele vazio
+    os.environ['DETECTOR_CACHE'] = tempfile.mkdtemp(prefix='cache_detector_')
+
+    rodadas = [('rapido', 'frio')] + [('rapido', 'quente')] * args.repeticoes
+    rodadas += [('sequencial', '-')] * args.repeticoes
+
+    resultados = {}
+    with ServidorPLCSimulado(porta=args.porta) as servidor:
+        for modo, cache in rodadas:
+            marcos = medir_partida(args, modo, servidor)
+            resultados.setdefault((modo, cache), []).append(marcos)
+
+    def mediana(lista, chave):
+        valores = [m[chave] for m in lista if m[chave] is not None]
+        return f"{np.median(valores):8.2f}" if valores else f"{'—':>8}"
+
+    print(f"{'modo':<11} | {'cache':<6} | {'PLC conectado s':>15} | {'Sist_Funcionando s':>18} | {'1ª escrita válida s':>19}")
+    for (modo, cache), lista in resultados.items():
+        print(f"{modo:<11} | {cache:<6} | {mediana(lista, 'conectado'):>15} | "
+              f"{mediana(lista, 'funcionando'):>18} | {mediana(lista, 'valido'):>19}")
+
+
+if __name__ == '__main__':
+    main()
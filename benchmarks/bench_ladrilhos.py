@@ -0,0 +1,142 @@
+"""Benchmark: resolução de inferência e ladrilhos (alcance vs latência)
+
+Roda o mesmo clipe com cada variante e mede a latência por inferência
+(média, p95), quantas entradas vão ao YOLO por inferência, pessoas por
+frame e a concordância com a primeira variante (referência, por padrão
+todos os ladrilhos): recall geral e recall das pessoas pequenas (altura
+< --altura-pequena px no frame da câmera, ou seja, longe), além da menor
+altura detectada.
+
+Variantes:
+- grosso:F  só a passada grossa, frame de inferência = F x frame da câmera
+  (grosso:0.5 é o comportamento padrão)
+- auto      passada grossa 0.5 + ladrilhos onde há pessoas pequenas + varredura
+- completo  passada grossa 0.5 + todos os ladrilhos
+
+Uso (na raiz do repositório):
+    python -m benchmarks.bench_ladrilhos gravacao.mp4 --variantes completo grosso:0.5 grosso:1.0 auto --frames 300
+"""
+import argparse
+import time
+
+import cv2
+import numpy as np
+
+from inferencia import criar_backend
+from ladrilhos import InferenciaLadrilhada
+from pos_processamento import criar_pessoas, sem_pessoas
+from rastreador import CUSTO_INVIAVEL, associar, matriz_iou
+from telemetria import TELEMETRIA
+
+
+def carregar_clipe(caminho, limite):
+    """Decodificar até `limite` frames em resolução cheia (fora da medição)"""
+    cap = cv2.VideoCapture(caminho)
+    frames = []
+    while len(frames) < limite:
+        ret, frame = cap.read()
+        if not ret:
+            break
+        frames.append(frame)
+    cap.release()
+    if not frames:
+        raise SystemExit(f"❌ Nenhum frame lido de {caminho}")
+    return frames
+
+
+def rodar(backend, frames, variante, tamanho, confianca, aquecimento=5):
+    """Caixas (frame da câmera) por frame, tempos em ms e entradas por inferência"""
+    tipo, _, fator = variante.partition(':')
+    fator = float(fator) if fator else 0.5
+    h, w = frames[0].shape[:2]
+    tamanho_grosso = (int(w * fator), int(h * fator))
+    escala = w / tamanho_grosso[0]  # entrada grossa → frame da câmera
+
+    ladrilhos = None
+    if tipo in ('auto', 'completo'):
+        ladrilhos = InferenciaLadrilhada(tipo, tamanho)
+        ladrilhos.preparar(frames[0].shape, escala, None, backend.imgsz)
+
+    pessoas = sem_pessoas()
+    grosso = np.empty((tamanho_grosso[1], tamanho_grosso[0], 3), np.uint8)
+    tempos = []
+    saidas = []
+    TELEMETRIA.zerar()
+    for k, frame in enumerate(frames[:aquecimento] + frames):
+        inicio = time.perf_counter()
+        cv2.resize(frame, tamanho_grosso, dst=grosso, interpolation=cv2.INTER_LINEAR)
+        if ladrilhos is None:
+            deteccoes = backend.detectar([grosso])[0]
+        else:
+            deteccoes = ladrilhos.detectar(backend, grosso, frame, pessoas)
+        duracao = time.perf_counter() - inicio
+
+        manter = deteccoes.conf >= confianca
+        caixas = deteccoes.xyxy[manter] * escala
+        pessoas = criar_pessoas(caixas.astype(np.int32), deteccoes.conf[manter], 0.0)
+        if k >= aquecimento:
+            tempos.append(duracao * 1000)
+            saidas.append(caixas)
+        elif k == aquecimento - 1:
+            TELEMETRIA.zerar()
+
+    entradas = 1 + TELEMETRIA.contadores.get('ladrilhos_inferidos', 0) / len(frames)
+    return saidas, np.array(tempos), entradas
+
+
+def concordancia(referencia, saidas, altura_pequena, limiar_iou=0.5):
+    """(recall geral, recall das pessoas pequenas) em relação à referência"""
+    pares = total = pares_pequenas = total_pequenas = 0
+    for ref, det in zip(referencia, saidas):
+        pequenas = (ref[:, 3] - ref[:, 1]) < altura_pequena
+        total += len(ref)
+        total_pequenas += int(pequenas.sum())
+        if len(ref) == 0 or len(det) == 0:
+            continue
+        iou = matriz_iou(ref.astype(np.float64), det.astype(np.float64))
+        custo = np.where(iou >= limiar_iou, 1.0 - iou, CUSTO_INVIAVEL)
+        linhas, _ = associar(custo)
+        pares += len(linhas)
+        pares_pequenas += int(pequenas[linhas].sum())
+
+    recall = pares / total if total else 1.0
+    recall_pequenas = pares_pequenas / total_pequenas if total_pequenas else float('nan')
+    return recall, recall_pequenas
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('clipe')
+    parser.add_argument('--variantes', nargs='+', default=['completo', 'grosso:0.5', 'grosso:1.0', 'auto'])
+    parser.add_argument('--frames', type=int, default=300)
+    parser.add_argument('--backend', default='ultralytics')
+    parser.add_argument('--modelo', default='yolov8n.pt')
+    parser.add_argument('--imgsz', type=int, default=640)
+    parser.add_argument('--threads', type=int, default=None, help='threads intra-op')
+    parser.add_argument('--tamanho', type=int, default=None, help='lado do ladrilho em px (padrão: imgsz)')
+    parser.add_argument('--confianca', type=float, default=0.7, help='confiança mínima (a do detector)')
+    parser.add_argument('--altura-pequena', type=int, default=80,
+                        help='altura (px no frame da câmera) abaixo da qual a pessoa conta como pequena')
+    args = parser.parse_args()
+
+    frames = carregar_clipe(args.clipe, args.frames)
+    backend = criar_backend(args.backend, args.modelo, args.imgsz, args.threads)
+    backend.aquecer()
+
+    referencia = None
+    print(f"{frames[0].shape[1]}x{frames[0].shape[0]}, {len(frames)} frames, imgsz {args.imgsz}")
+    print(f"{'variante':<11} | {'média ms':>8} | {'p95 ms':>7} | {'entradas':>8} | {'pessoas/frame':>13} | "
+          f"{'recall':>6} | {'recall pequenas':>15} | {'menor altura px':>15}")
+    for variante in args.variantes:
+        saidas, tempos, entradas = rodar(backend, frames, variante, args.tamanho or args.imgsz, args.confianca)
+        if referencia is None:
+            referencia = saidas
+        recall, recall_pequenas = concordancia(referencia, saidas, args.altura_pequena)
+        alturas = np.concatenate([c[:, 3] - c[:, 1] for c in saidas])
+        menor = f"{alturas.min():15.0f}" if len(alturas) else f"{'-':>15}"
+        print(f"{variante:<11} | {tempos.mean():8.1f} | {np.percentile(tempos, 95):7.1f} | {entradas:8.2f} | "
+              f"{len(alturas) / len(saidas):13.2f} | {recall:6.3f} | {recall_pequenas:15.3f} | {menor}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,78 @@
+"""Benchmark: throughput de inferência por número de streams (lote vs sequencial)
+
+Usa vídeos gravados; cada stream simulado reproduz um dos vídeos. Reporta
+frames/s totais e frames por segundo de CPU (frames/s por núcleo).
+
+Uso (na raiz do repositório):
+    python -m benchmarks.bench_multi_camera gravacao1.mp4 gravacao2.mp4 --streams 1 2 4 8 16
+"""
+import argparse
+import time
+
+import cv2
+
+from inferencia import BACKENDS, criar_backend
+
+
+def carregar_frames(caminho, limite):
+    """Decodificar até `limite` frames em meia resolução (fora da medição)"""
+    cap = cv2.VideoCapture(caminho)
+    frames = []
+    while len(frames) < limite:
+        ret, frame = cap.read()
+        if not ret:
+            break
+        frames.append(cv2.resize(frame, (frame.shape[1]//2, frame.shape[0]//2)))
+    cap.release()
+    if not frames:
+        raise SystemExit(f"❌ Nenhum frame lido de {caminho}")
+    return frames
+
+
+def medir(modelo, videos, streams, ciclos, lote):
+    inicio_cpu = time.process_time()
+    inicio = time.perf_counter()
+
+    for k in range(ciclos):
+        frames = [videos[s % len(videos)][k % len(videos[s % len(videos)])] for s in range(streams)]
+        if lote:
+            modelo.detectar(frames)
+        else:
+            for frame in frames:
+                modelo.detectar([frame])
+
+    parede = time.perf_counter() - inicio
+    cpu = time.process_time() - inicio_cpu
+    total = ciclos * streams
+    return total / parede, total / cpu if cpu > 0 else 0.0
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('videos', nargs='+')
+    parser.add_argument('--streams', type=int, nargs='+', default=[1, 2, 4, 8, 16])
+    parser.add_argument('--ciclos', type=int, default=30, help='ciclos de inferência por medição')
+    parser.add_argument('--frames', type=int, default=100, help='frames carregados por vídeo')
+    parser.add_argument('--modelo', default='yolov8n.pt')
+    parser.add_argument('--backend', choices=BACKENDS, default='ultralytics')
+    args = parser.parse_args()
+
+    videos = [carregar_frames(v, args.frames) for v in args.videos]
+    modelo = criar_backend(args.backend, args.modelo)
+
+    # Aquecimento (grafo, alocações)
+    modelo.detectar([videos[0][0]] * 2)
+    lote_maximo = getattr(modelo, 'lote_maximo', None)
+    if lote_maximo:
+        print(f"⚠️ Modelo com lote fixo {lote_maximo}: o modo 'lote' roda em fatias de {lote_maximo} frames")
+
+    print(f"{'streams':>7} | {'modo':<10} | {'frames/s':>9} | {'frames/s/núcleo':>15}")
+    for streams in args.streams:
+        for lote in (False, True):
+            fps, fps_nucleo = medir(modelo, videos, streams, args.ciclos, lote)
+            modo = 'lote' if lote else 'sequencial'
+            print(f"{streams:>7} | {modo:<10} | {fps:9.1f} | {fps_nucleo:15.1f}")
+
+
+if __name__ == '__main__':
+    main()
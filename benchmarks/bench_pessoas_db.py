@@ -0,0 +1,134 @@
+"""Benchmark: array de pessoas no DB17, imagem inteira vs escrita incremental
+
+Pessoas sintéticas entram, andam e saem da área; a cada ciclo o resumo e
+o array de pessoas são atualizados na imagem do DB e enviados ao servidor
+snap7 local. Compara db_write, telegramas e bytes por ciclo e o tempo de
+escrita.
+
+Uso (na raiz do repositório):
+    python -m benchmarks.bench_pessoas_db --capacidade 4 16 32 --ciclos 2000 --rtt-ms 2
+"""
+import argparse
+import random
+import time
+
+import numpy as np
+import snap7
+
+from benchmarks.bench_plc_db17 import ClienteContado
+from plc_db17 import ArrayPessoasDB, EmpacotadorDB, layout_db17
+from plc_simulado import ServidorPLCSimulado
+from pos_processamento import PESSOA_DTYPE, resumo
+
+
+class ClienteBytes(ClienteContado):
+    """ClienteContado que soma também bytes e telegramas (PDUs) escritos
+
+    Um db_write maior que a PDU negociada é dividido pelo snap7 em vários
+    telegramas, cada um com seu round trip.
+    """
+
+    def __init__(self, cliente, rtt_s=0.0, carga_maxima=200):
+        super().__init__(cliente, rtt_s)
+        self.carga_maxima = carga_maxima
+        self.bytes_escritos = 0
+        self.telegramas = 0
+
+    def db_write(self, db_number, start, data):
+        self.bytes_escritos += len(data)
+        self.telegramas += -(-len(data) // self.carga_maxima)
+        return super().db_write(db_number, start, data)
+
+
+def gerar_cenario(ciclos, maximo, semente=42):
+    """Sequência de arrays PESSOA_DTYPE com trilhas persistentes"""
+    rnd = random.Random(semente)
+    trilhas = {}
+    proximo_id = 1
+    cenario = []
+    for ciclo in range(ciclos):
+        if len(trilhas) < maximo and rnd.random() < 0.05:
+            trilhas[proximo_id] = [rnd.uniform(0, 1800), rnd.uniform(200, 900), ciclo]
+            proximo_id += 1
+        if trilhas and rnd.random() < 0.04:
+            del trilhas[rnd.choice(list(trilhas))]
+
+        pessoas = np.zeros(len(trilhas), PESSOA_DTYPE)
+        for k, (i, trilha) in enumerate(trilhas.items()):
+            parado = rnd.random() < 0.5  # metade do tempo a pessoa não se mexe
+            if not parado:
+                trilha[0] += rnd.uniform(-8, 8)
+                trilha[1] += rnd.uniform(-3, 3)
+            pessoas[k]['id'] = i
+            pessoas[k]['x'], pessoas[k]['y'] = int(trilha[0]), 300
+            pessoas[k]['w'], pessoas[k]['h'] = 120, 340
+            pessoas[k]['distancia'] = round(trilha[1])
+            pessoas[k]['velocidade'] = 0.0 if parado else round(rnd.uniform(0, 6), 1)
+            pessoas[k]['idade'] = (ciclo - trilha[2]) / 15
+        cenario.append(pessoas)
+    return cenario
+
+
+def ciclo(plc, db_number, pessoas, empacotador, array, completo, carga_maxima):
+    quantidade, distancia_min, velocidade_max = resumo(pessoas)
+    empacotador.definir('pessoa_detectada', quantidade > 0)
+    empacotador.definir('quantidade_pessoas', quantidade)
+    empacotador.definir('distancia_minima', distancia_min or 0.0)
+    empacotador.definir('velocidade_maxima', velocidade_max)
+    empacotador.definir('timestamp_unix', int(time.time()))
+    for nome, valor in array.valores(pessoas).items():
+        empacotador.definir(nome, valor)
+    empacotador.escrever(plc, db_number, completo=completo, tamanho_maximo=carga_maxima)
+
+
+def medir(plc, db_number, cenario, capacidade, completo, carga_maxima):
+    layout = layout_db17(pessoas=capacidade)
+    empacotador = EmpacotadorDB(layout)
+    array = ArrayPessoasDB(capacidade)
+    plc.round_trips = plc.bytes_escritos = plc.telegramas = 0
+    latencias = []
+    for pessoas in cenario:
+        t0 = time.perf_counter()
+        ciclo(plc, db_number, pessoas, empacotador, array, completo, carga_maxima)
+        latencias.append((time.perf_counter() - t0) * 1000)
+
+    latencias.sort()
+    n = len(latencias)
+    return (layout.tamanho, plc.round_trips / n, plc.telegramas / n, plc.bytes_escritos / n,
+            latencias[n // 2], latencias[int(n * 0.99)])
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--capacidade', type=int, nargs='+', default=[4, 16, 32],
+                        help='registros de pessoa no DB')
+    parser.add_argument('--ciclos', type=int, default=2000)
+    parser.add_argument('--pessoas', type=int, default=6, help='máximo de pessoas simultâneas')
+    parser.add_argument('--porta', type=int, default=1102)
+    parser.add_argument('--rtt-ms', type=float, default=0.0,
+                        help='atraso simulado por round trip (rede da planta)')
+    args = parser.parse_args()
+
+    cenario = gerar_cenario(args.ciclos, args.pessoas)
+    maior = layout_db17(pessoas=max(args.capacidade)).tamanho
+
+    print(f"{'capacidade':>10} | {'DB bytes':>8} | {'modo':<11} | {'db_write/ciclo':>14} | "
+          f"{'PDUs/ciclo':>10} | {'bytes/ciclo':>11} | {'p50 ms':>7} | {'p99 ms':>7}")
+    with ServidorPLCSimulado(porta=args.porta, tamanho_db=maior) as servidor:
+        cliente = snap7.client.Client()
+        cliente.connect('127.0.0.1', 0, 1, args.porta)
+        carga_maxima = cliente.get_pdu_length() - 35
+        plc = ClienteBytes(cliente, args.rtt_ms / 1000, carga_maxima)
+
+        for capacidade in args.capacidade:
+            for modo, completo in (('inteira', True), ('incremental', False)):
+                tamanho, escritas, pdus, bytes_ciclo, p50, p99 = medir(
+                    plc, servidor.db_number, cenario, capacidade, completo, carga_maxima)
+                print(f"{capacidade:>10} | {tamanho:>8} | {modo:<11} | {escritas:14.2f} | "
+                      f"{pdus:10.2f} | {bytes_ciclo:11.1f} | {p50:7.3f} | {p99:7.3f}")
+
+        cliente.disconnect()
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,120 @@
+"""Benchmark: escrita do DB17 por campo (legado) vs bloco único empacotado
+
+Uso (na raiz do repositório):
+    python -m benchmarks.bench_plc_db17 --ciclos 2000 --rtt-ms 2
+"""
+import argparse
+import random
+import struct
+import time
+
+import snap7
+
+from plc_db17 import EmpacotadorDB, LAYOUT_DB17
+from plc_simulado import ServidorPLCSimulado
+
+
+class ClienteContado:
+    """Envolve o cliente snap7 contando round trips (e simulando RTT de rede)"""
+
+    def __init__(self, cliente, rtt_s=0.0):
+        self.cliente = cliente
+        self.rtt_s = rtt_s
+        self.round_trips = 0
+
+    def _contar(self):
+        self.round_trips += 1
+        if self.rtt_s > 0:
+            time.sleep(self.rtt_s)
+
+    def db_write(self, db_number, start, data):
+        self._contar()
+        return self.cliente.db_write(db_number, start, data)
+
+    def db_read(self, db_number, start, size):
+        self._contar()
+        return self.cliente.db_read(db_number, start, size)
+
+
+def gerar_cenario(ciclos, semente=42):
+    """Sequência de resultados com entradas/saídas de pessoas"""
+    rnd = random.Random(semente)
+    resultados = []
+    quantidade = 0
+    for _ in range(ciclos):
+        if rnd.random() < 0.05:
+            quantidade = rnd.choice([0, 0, 1, 2, 3])
+        resultados.append([
+            {'distancia': rnd.uniform(80, 900), 'velocidade': rnd.uniform(0, 6)}
+            for _ in range(quantidade)
+        ])
+    return resultados
+
+
+def ciclo_legado(plc, db_number, pessoas, estado):
+    """Caminho anterior de enviar_dados_plc: um db_write por campo"""
+    tem_pessoas = len(pessoas) > 0
+    if tem_pessoas != estado['ultimo']:
+        plc.db_write(db_number, 0, bytearray([0x01 if tem_pessoas else 0x00]))
+        plc.db_write(db_number, 2, struct.pack('>H', len(pessoas)))
+        estado['ultimo'] = tem_pessoas
+    if tem_pessoas:
+        plc.db_write(db_number, 4, struct.pack('>f', min(p['distancia'] for p in pessoas)))
+        plc.db_write(db_number, 8, struct.pack('>f', max(p['velocidade'] for p in pessoas)))
+    plc.db_write(db_number, 12, struct.pack('>L', int(time.time())))
+
+
+def ciclo_empacotado(plc, db_number, pessoas, empacotador):
+    """Caminho novo: imagem completa do DB17 num único db_write"""
+    tem_pessoas = len(pessoas) > 0
+    empacotador.definir('pessoa_detectada', tem_pessoas)
+    empacotador.definir('quantidade_pessoas', len(pessoas))
+    if tem_pessoas:
+        empacotador.definir('distancia_minima', min(p['distancia'] for p in pessoas))
+        empacotador.definir('velocidade_maxima', max(p['velocidade'] for p in pessoas))
+    empacotador.definir('timestamp_unix', int(time.time()))
+    empacotador.escrever(plc, db_number)
+
+
+def medir(nome, plc, cenario, ciclo):
+    latencias = []
+    plc.round_trips = 0
+    for pessoas in cenario:
+        t0 = time.perf_counter()
+        ciclo(pessoas)
+        latencias.append((time.perf_counter() - t0) * 1000)
+
+    latencias.sort()
+    n = len(latencias)
+    print(f"{nome:<12} round trips/ciclo: {plc.round_trips / n:5.2f} | "
+          f"média: {sum(latencias) / n:7.3f} ms | "
+          f"p50: {latencias[n // 2]:7.3f} ms | p99: {latencias[int(n * 0.99)]:7.3f} ms")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--ciclos', type=int, default=2000)
+    parser.add_argument('--porta', type=int, default=1102)
+    parser.add_argument('--rtt-ms', type=float, default=0.0,
+                        help='atraso simulado por round trip (rede da planta)')
+    args = parser.parse_args()
+
+    cenario = gerar_cenario(args.ciclos)
+
+    with ServidorPLCSimulado(porta=args.porta) as servidor:
+        cliente = snap7.client.Client()
+        cliente.connect('127.0.0.1', 0, 1, args.porta)
+        plc = ClienteContado(cliente, args.rtt_ms / 1000)
+        db = servidor.db_number
+
+        estado = {'ultimo': False}
+        medir('legado', plc, cenario, lambda p: ciclo_legado(plc, db, p, estado))
+
+        empacotador = EmpacotadorDB(LAYOUT_DB17)
+        medir('empacotado', plc, cenario, lambda p: ciclo_empacotado(plc, db, p, empacotador))
+
+        cliente.disconnect()
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,93 @@
+"""Benchmark: publicação no PLC a cada resultado vs política (banda morta + intervalos)
+
+N detectores sintéticos (um canal cada, todos na mesma conexão, como no
+multi_camera.py) publicam resultados na taxa de inferência: pessoas que
+entram, se aproximam e saem, com ruído de medição. Compara db_write por
+segundo, snapshots evitados e latência resultado → PLC, com e sem
+PoliticaPublicacao, contra o servidor snap7 local.
+
+Uso (na raiz do repositório):
+    python -m benchmarks.bench_politica_plc --detectores 1 8 --hz 15 --segundos 10
+"""
+import argparse
+import random
+import time
+
+from plc_db17 import LAYOUT_DB17
+from plc_io import EscritorPLC
+from plc_simulado import ServidorPLCSimulado
+from politica_plc import POLITICA_PADRAO
+from telemetria import TELEMETRIA
+
+
+def resultado(t, fase, rnd):
+    """Resumo de um frame: ciclo de 10 s com área vazia, aproximação, pessoa parada e saída"""
+    ciclo = (t + fase) % 10.0
+    if ciclo < 2.0:
+        return {'pessoa_detectada': False, 'quantidade_pessoas': 0, 'timestamp_unix': int(time.time())}
+    if ciclo < 4.0:
+        distancia = 300 - 110 * (ciclo - 2.0)   # aproximação até 80 cm
+    elif ciclo < 9.0:
+        distancia = 80                          # trabalhando na máquina
+    else:
+        distancia = 80 + 220 * (ciclo - 9.0)    # saída
+    return {
+        'pessoa_detectada': True,
+        'quantidade_pessoas': 1,
+        'distancia_minima': distancia + rnd.gauss(0, 2),  # ruído de ~2 cm
+        'velocidade_maxima': abs(rnd.gauss(0.2 if 4.0 <= ciclo < 9.0 else 3.0, 0.2)),
+        'timestamp_unix': int(time.time()),
+    }
+
+
+def rodar(args, detectores, politica):
+    escritor = EscritorPLC('127.0.0.1', porta=args.porta, db_number=None, politica=politica)
+    canais = [escritor.adicionar_canal(17, i * LAYOUT_DB17.tamanho) for i in range(detectores)]
+    escritor.iniciar()
+    while not escritor.conectado:
+        time.sleep(0.01)
+    escritor.aguardar_envio()
+
+    TELEMETRIA.zerar()
+    antes = escritor.contadores()
+    rnd = random.Random(5)
+    inicio = time.monotonic()
+    proximo = inicio
+    while proximo - inicio < args.segundos:
+        agora = time.time()
+        for i, canal in enumerate(canais):
+            canal.publicar(resultado(proximo - inicio, i * 0.7, rnd), origem=agora)
+        proximo += 1.0 / args.hz
+        time.sleep(max(0.0, proximo - time.monotonic()))
+
+    escritor.aguardar_envio()
+    depois = escritor.contadores()
+    escritor.parar()
+    ponta = TELEMETRIA.histograma('camera_plc')
+    return ((depois['escritas'] - antes['escritas']) / args.segundos,
+            (depois['evitadas'] - antes['evitadas']) / args.segundos,
+            ponta.percentil(50) * 1000, ponta.percentil(99) * 1000)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--detectores', type=int, nargs='+', default=[1, 8])
+    parser.add_argument('--hz', type=float, default=15, help='resultados por segundo por detector')
+    parser.add_argument('--segundos', type=float, default=10)
+    parser.add_argument('--porta', type=int, default=1102)
+    args = parser.parse_args()
+
+    tamanho = max(args.detectores) * LAYOUT_DB17.tamanho
+    print(f"{'detectores':>10} | {'política':<8} | {'db_write/s':>10} | {'evitadas/s':>10} | "
+          f"{'p50 ms':>7} | {'p99 ms':>7}")
+    with ServidorPLCSimulado(porta=args.porta, tamanho_db=tamanho):
+        for detectores in args.detectores:
+            for nome, politica in (('nenhuma', None), ('padrão', POLITICA_PADRAO)):
+                escritas, evitadas, p50, p99 = rodar(args, detectores, politica)
+                print(f"{detectores:>10} | {nome:<8} | {escritas:10.1f} | {evitadas:10.1f} | "
+                      f"{p50:7.1f} | {p99:7.1f}")
+                time.sleep(0.5)  # o servidor derruba a conexão antiga
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,165 @@
+"""Benchmark: pós-processamento do YOLO caixa a caixa (dicts) vs vetorizado (array estruturado)
+
+Cenas lotadas sintéticas: N pessoas andando (mais caixas de baixa
+confiança e fora da área) passam pelos dois caminhos com o mesmo
+rastreador. Mede o tempo por frame do filtro de confiança, remapeamento,
+teste da área, distância, rastreamento e agregação mín/máx para o PLC, e
+confere que os dois caminhos chegam ao mesmo resultado.
+
+Uso (na raiz do repositório):
+    python -m benchmarks.bench_pos_processamento --pessoas 10 50 200 --frames 500
+"""
+import argparse
+import math
+import time
+
+import cv2
+import numpy as np
+
+from detector_pessoas import DetectorPessoasInteligente
+from inferencia import Deteccoes
+from plc_io import EscritorPLC
+from pos_processamento import resumo
+
+
+def gerar_cena(pessoas, frames, recorte, fps=15, semente=7):
+    """Deteccoes por frame no recorte: pessoas andando + ruído de baixa confiança"""
+    rnd = np.random.default_rng(semente)
+    x0, y0, x1, y1 = recorte
+    largura, altura = x1 - x0, y1 - y0
+
+    posicoes = rnd.uniform([0, 0], [largura, altura], (pessoas, 2))
+    velocidades = rnd.uniform(-40, 40, (pessoas, 2))
+    tamanhos = rnd.uniform([15, 40], [40, 120], (pessoas, 2))
+
+    cena = []
+    for k in range(frames):
+        centros = posicoes + velocidades * (k / fps) + rnd.normal(0, 1, (pessoas, 2))
+        centros %= (largura, altura)
+        caixas = np.hstack((centros - tamanhos / 2, centros + tamanhos / 2))
+        conf = rnd.uniform(0.72, 0.95, pessoas)
+
+        # Candidatos de baixa confiança (o YOLO devolve com conf >= 0.25)
+        ruido = pessoas // 2
+        caixas_ruido = rnd.uniform([0, 0, 0, 0], [largura, altura, largura, altura], (ruido, 4))
+        caixas_ruido[:, 2:] = caixas_ruido[:, :2] + 30
+        conf_ruido = rnd.uniform(0.25, 0.69, ruido)
+
+        ordem = rnd.permutation(pessoas + ruido)
+        cena.append(Deteccoes(
+            np.vstack((caixas, caixas_ruido))[ordem].astype(np.float32),
+            np.concatenate((conf, conf_ruido))[ordem].astype(np.float32),
+        ))
+    return cena
+
+
+def pos_processamento_legado(detector, deteccoes, tempo_frame):
+    """Caminho antigo: conversão caixa a caixa, dict por pessoa, agregação em Python"""
+    pessoas_agora = []
+    ox, oy = detector.recorte[:2] if detector.recorte else (0, 0)
+
+    for k in range(len(deteccoes)):
+        confianca = float(deteccoes.conf[k])
+
+        if confianca >= detector.confianca_minima:
+            x1, y1, x2, y2 = map(float, deteccoes.xyxy[k])
+
+            e = detector.fator_escala
+            x1, y1 = int((x1 + ox) * e), int((y1 + oy) * e)
+            x2, y2 = int((x2 + ox) * e), int((y2 + oy) * e)
+
+            centro_x = (x1 + x2) // 2
+            centro_y = (y1 + y2) // 2
+
+            if cv2.pointPolygonTest(detector.area_coords, (float(centro_x), float(centro_y)), False) >= 0:
+                altura = y2 - y1
+                distancia = 0
+                if altura > 30:
+                    distancia_cm = (detector.altura_pessoa_real * detector.focal_length) / altura
+                    distancia = max(50, min(1000, distancia_cm))
+
+                pessoas_agora.append({
+                    'id': 0,
+                    'x': x1, 'y': y1, 'w': x2-x1, 'h': y2-y1,
+                    'centro': (centro_x, centro_y),
+                    'confianca': confianca,
+                    'distancia': distancia,
+                    'velocidade': 0,
+                    'tempo': tempo_frame
+                })
+
+    caixas = np.array(
+        [[p['x'], p['y'], p['x'] + p['w'], p['y'] + p['h']] for p in pessoas_agora],
+        np.float64
+    ).reshape(-1, 4)
+    ids, velocidades, _ = detector.rastreador.atualizar(caixas, tempo_frame)
+
+    for pessoa, id_trilha, velocidade_px in zip(pessoas_agora, ids, velocidades):
+        pessoa['id'] = int(id_trilha)
+        if pessoa['distancia'] > 0:
+            vel_km_h = math.hypot(*velocidade_px) * pessoa['distancia'] / 300 * 3.6 / 100
+            pessoa['velocidade'] = max(0, min(50, vel_km_h))
+
+    # Agregação para o PLC
+    distancias = [p['distancia'] for p in pessoas_agora if p['distancia'] > 0]
+    velocidade_max = max((p['velocidade'] for p in pessoas_agora), default=0.0)
+    distancia_min = min(distancias) if distancias else None
+    return pessoas_agora, (len(pessoas_agora), distancia_min, velocidade_max)
+
+
+def pos_processamento_vetorizado(detector, deteccoes, tempo_frame):
+    pessoas = detector.processar_resultado(deteccoes, tempo_frame)
+    return pessoas, resumo(pessoas)
+
+
+def novo_detector(frame):
+    # Escritor nunca iniciado: nada sai para a rede
+    canal = EscritorPLC('127.0.0.1', db_number=17).canal_padrao
+    detector = DetectorPessoasInteligente('bench', canal_plc=canal)
+    detector.definir_area_centro(frame)
+    return detector
+
+
+def medir(funcao, cena, frame, fps):
+    detector = novo_detector(frame)
+    tempos = []
+    saidas = []
+    for k, deteccoes in enumerate(cena):
+        t0 = time.perf_counter()
+        saidas.append(funcao(detector, deteccoes, k / fps))
+        tempos.append((time.perf_counter() - t0) * 1000)
+    return np.array(tempos[10:]), saidas
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--pessoas', type=int, nargs='+', default=[10, 50, 200])
+    parser.add_argument('--frames', type=int, default=500)
+    parser.add_argument('--fps', type=float, default=15)
+    args = parser.parse_args()
+
+    frame = np.zeros((1080, 1920, 3), np.uint8)
+    recorte = novo_detector(frame).recorte
+
+    print(f"{'pessoas':>7} | {'caminho':<11} | {'média ms':>8} | {'p99 ms':>7} | {'iguais':>6}")
+    for pessoas in args.pessoas:
+        cena = gerar_cena(pessoas, args.frames, recorte, args.fps)
+        tempos_leg, saidas_leg = medir(pos_processamento_legado, cena, frame, args.fps)
+        tempos_vet, saidas_vet = medir(pos_processamento_vetorizado, cena, frame, args.fps)
+
+        # Mesmas pessoas (ID, caixa) e mesma agregação nos dois caminhos
+        iguais = 0
+        for (leg, resumo_leg), (vet, resumo_vet) in zip(saidas_leg, saidas_vet):
+            caixas_leg = sorted((p['id'], p['x'], p['y'], p['w'], p['h']) for p in leg)
+            caixas_vet = sorted(zip(*(vet[c].tolist() for c in ('id', 'x', 'y', 'w', 'h'))))
+            agregado = resumo_leg[0] == resumo_vet[0] and np.allclose(
+                [resumo_leg[1] or 0, resumo_leg[2]], [resumo_vet[1] or 0, resumo_vet[2]], rtol=1e-4)
+            iguais += caixas_leg == caixas_vet and agregado
+
+        for nome, tempos in (('dicts', tempos_leg), ('vetorizado', tempos_vet)):
+            print(f"{pessoas:>7} | {nome:<11} | {tempos.mean():8.3f} | {np.percentile(tempos, 99):7.3f} | "
+                  f"{iguais * 100 // len(cena):5d}%")
+
+
+if __name__ == '__main__':
+    main()
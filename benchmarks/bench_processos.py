@@ -0,0 +1,109 @@
+"""Benchmark: pipeline em threads (um processo) vs pipeline em processos
+
+As duas topologias rodam o mesmo vídeo em loop, no ritmo gravado, contra o
+servidor snap7 local, pelo mesmo tempo, sem política de publicação (todo
+resultado vai ao PLC). Mede resultados de inferência por segundo, contados
+na saída da inferência (entregas ao YOLO nas threads, registros nos anéis
+de resultado nos processos), e a latência câmera → PLC (p50/p99) vista
+pelo EscritorPLC. Com inferência mais lenta que o vídeo, mais processos
+devem dar mais resultados/s.
+
+Uso (na raiz do repositório):
+    python -m benchmarks.bench_processos gravacao.mp4 --segundos 30 --inferencia 1 2
+"""
+import argparse
+import threading
+import time
+
+from plc_io import EscritorPLC
+from plc_simulado import ServidorPLCSimulado
+from telemetria import TELEMETRIA
+
+
+def rodar_threads(args):
+    from detector_pessoas import DetectorPessoasInteligente
+
+    escritor = EscritorPLC('127.0.0.1', porta=args.porta, pronto=False)
+    escritor.iniciar()
+    detector = DetectorPessoasInteligente(args.clipe, canal_plc=escritor.canal_padrao)
+    detector.headless = True
+    detector.modo_replay = 'tempo_real'
+    detector.backend_inferencia = args.backend
+    detector.modelo_yolo = args.modelo
+    try:
+        if not detector.inicializar():
+            raise RuntimeError("falha na partida")
+        detector.captura.repetir = True  # vídeo em loop, como uma câmera
+        TELEMETRIA.zerar()
+        inicio = detector.agendador.enviados
+        contagem = {}
+
+        def encerrar():
+            contagem['resultados'] = detector.agendador.enviados - inicio
+            detector.parar()
+
+        threading.Timer(args.segundos, encerrar).start()
+        detector.executar()
+    finally:
+        escritor.parar()
+    return contagem['resultados']
+
+
+def rodar_processos(args, inferencia):
+    from pipeline_processos import SupervisorPipeline
+
+    supervisor = SupervisorPipeline(
+        args.clipe, '127.0.0.1', porta_plc=args.porta, processos_inferencia=inferencia,
+        backend=args.backend, modelo=args.modelo, opcoes_captura={'tempo_real': True}, politica=None
+    )
+    if not supervisor.inicializar():
+        supervisor.finalizar()
+        raise RuntimeError("falha na partida")
+
+    def resultados():
+        return sum(anel.publicados for anel in supervisor.aneis_resultados)
+
+    TELEMETRIA.zerar()
+    inicio = resultados()
+    contagem = {}
+
+    def encerrar():
+        contagem['resultados'] = resultados() - inicio  # antes de liberar a memória compartilhada
+        supervisor.parar()
+
+    threading.Timer(args.segundos, encerrar).start()
+    supervisor.executar()
+    return contagem['resultados']
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('clipe', help='vídeo gravado no lugar da câmera')
+    parser.add_argument('--segundos', type=float, default=30)
+    parser.add_argument('--inferencia', type=int, nargs='+', default=[1, 2],
+                        help='processos de inferência a testar')
+    parser.add_argument('--backend', default='ultralytics')
+    parser.add_argument('--modelo', default='yolov8n.pt')
+    parser.add_argument('--porta', type=int, default=1102)
+    args = parser.parse_args()
+
+    variantes = [('threads', None)] + [(f'processos x{n}', n) for n in args.inferencia]
+    resultados = []
+    with ServidorPLCSimulado(porta=args.porta):
+        for nome, inferencia in variantes:
+            if inferencia is None:
+                n = rodar_threads(args)
+            else:
+                n = rodar_processos(args, inferencia)
+            ponta = TELEMETRIA.histograma('camera_plc')
+            resultados.append((nome, n / args.segundos,
+                               ponta.percentil(50) * 1000, ponta.percentil(99) * 1000))
+            time.sleep(0.5)  # o servidor derruba a conexão antiga
+
+    print(f"{'topologia':<14} | {'resultados/s':>12} | {'câmera→PLC p50 ms':>17} | {'p99 ms':>7}")
+    for nome, taxa, p50, p99 in resultados:
+        print(f"{nome:<14} | {taxa:12.1f} | {p50:17.1f} | {p99:7.1f}")
+
+
+if __name__ == '__main__':
+    main()
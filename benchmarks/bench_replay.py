@@ -0,0 +1,102 @@
+"""Benchmark: cenários gravados pelo pipeline completo, com PLC snap7 local
+
+Cada cenário (vídeo ou diretório de imagens) roda por replay.py: captura,
+porta de movimento, YOLO, pós-processamento, rastreamento e escrita no DB17
+de um servidor snap7 local. O modelo é carregado uma vez para todos os
+cenários. Mede frames/s, latência câmera → DB (p50/p95/p99) e escritas no
+DB17, e compara com uma execução de referência para pegar regressões.
+
+Arquivo de cenários (JSON): lista de {"nome", "fonte", "modo", "portao"},
+ver benchmarks/cenarios_exemplo.json. modo: 'rapido' (padrão) ou 'tempo_real'.
+
+Uso (na raiz do repositório):
+    python -m benchmarks.bench_replay benchmarks/cenarios_exemplo.json --json base.json
+    python -m benchmarks.bench_replay benchmarks/cenarios_exemplo.json --referencia base.json
+"""
+import argparse
+import json
+import sys
+
+from inferencia import BACKENDS, criar_backend
+from replay import executar_replay
+
+# Métrica → sentido em que piorar é regressão
+METRICAS = {
+    'fps': 'menor',
+    'camera_db_p50_ms': 'maior',
+    'camera_db_p95_ms': 'maior',
+    'camera_db_p99_ms': 'maior',
+    'escritas_por_frame': 'maior',
+}
+
+
+def comparar(resultados, referencia, tolerancia):
+    """Listar as métricas que pioraram além da tolerância relativa"""
+    base = {r['nome']: r for r in referencia}
+    regressoes = []
+    for r in resultados:
+        anterior = base.get(r['nome'])
+        if anterior is None:
+            continue
+        for metrica, pior in METRICAS.items():
+            antes, agora = anterior.get(metrica), r[metrica]
+            if not antes:
+                continue
+            variacao = (agora - antes) / antes
+            if (pior == 'maior' and variacao > tolerancia) or (pior == 'menor' and -variacao > tolerancia):
+                regressoes.append(f"{r['nome']}: {metrica} {antes} → {agora} ({variacao:+.0%})")
+    return regressoes
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('cenarios', help='arquivo JSON com a lista de cenários')
+    parser.add_argument('--backend', choices=BACKENDS, default='ultralytics')
+    parser.add_argument('--modelo', default='yolov8n.pt')
+    parser.add_argument('--imgsz', type=int, default=640)
+    parser.add_argument('--porta', type=int, default=1102)
+    parser.add_argument('--json', default=None, help='gravar os resultados (vira a referência da próxima vez)')
+    parser.add_argument('--referencia', default=None, help='resultados anteriores para comparar')
+    parser.add_argument('--tolerancia', type=float, default=0.15, help='piora relativa aceita (0.15 = 15%%)')
+    args = parser.parse_args()
+
+    with open(args.cenarios, encoding='utf-8') as f:
+        cenarios = json.load(f)
+
+    yolo = criar_backend(args.backend, args.modelo, args.imgsz)
+    yolo.aquecer()
+
+    resultados = []
+    for cenario in cenarios:
+        r = executar_replay(
+            cenario['fonte'], cenario.get('modo', 'rapido'), args.porta, yolo_model=yolo,
+            portao=cenario.get('portao', True), fps_imagens=cenario.get('fps_imagens', 15)
+        )
+        r['nome'] = cenario['nome']
+        r['escritas_por_frame'] = round(r['escritas_db17'] / max(1, r['frames']), 3)
+        resultados.append(r)
+
+    print(f"{'cenário':<20} | {'modo':<10} | {'frames':>6} | {'frames/s':>8} | {'inferidos':>9} | "
+          f"{'p50 ms':>7} | {'p95 ms':>7} | {'p99 ms':>7} | {'escritas':>8} | {'esc/frame':>9}")
+    for r in resultados:
+        print(f"{r['nome']:<20} | {r['modo']:<10} | {r['frames']:>6} | {r['fps']:8.1f} | {r['inferidos']:>9} | "
+              f"{r['camera_db_p50_ms']:7.1f} | {r['camera_db_p95_ms']:7.1f} | {r['camera_db_p99_ms']:7.1f} | "
+              f"{r['escritas_db17']:>8} | {r['escritas_por_frame']:9.3f}")
+
+    if args.json:
+        with open(args.json, 'w', encoding='utf-8') as f:
+            json.dump(resultados, f, ensure_ascii=False, indent=2)
+
+    if args.referencia:
+        with open(args.referencia, encoding='utf-8') as f:
+            regressoes = comparar(resultados, json.load(f), args.tolerancia)
+        if regressoes:
+            print(f"❌ {len(regressoes)} regressão(ões) além de {args.tolerancia:.0%}:")
+            for linha in regressoes:
+                print(f"   {linha}")
+            sys.exit(1)
+        print(f"✅ Sem regressões além de {args.tolerancia:.0%}")
+
+
+if __name__ == '__main__':
+    main()
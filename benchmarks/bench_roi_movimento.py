@@ -0,0 +1,93 @@
+"""Benchmark: YOLO no frame inteiro vs recorte da área vs recorte + porta de movimento
+
+Roda o clipe gravado nos três modos com o mesmo modelo e compara o custo
+médio de inferência por frame, a fração de frames que foi para o YOLO e os
+frames em que o modo perdeu uma detecção que o frame inteiro achou.
+
+Uso (na raiz do repositório):
+    python -m benchmarks.bench_roi_movimento gravacao.mp4 --frames 1500
+"""
+import argparse
+import time
+
+import cv2
+
+from detector_pessoas import DetectorPessoasInteligente
+from inferencia import BACKENDS, criar_backend
+from plc_io import EscritorPLC
+
+
+def carregar_clipe(caminho, limite):
+    cap = cv2.VideoCapture(caminho)
+    fps = cap.get(cv2.CAP_PROP_FPS) or 30
+    frames = []
+    while len(frames) < limite:
+        ret, frame = cap.read()
+        if not ret:
+            break
+        frames.append(frame)
+    cap.release()
+    return frames, fps
+
+
+def executar_modo(frames, fps, modelo, recorte, portao):
+    # Escritor nunca iniciado: nada sai para a rede
+    canal = EscritorPLC('127.0.0.1', db_number=17).canal_padrao
+    detector = DetectorPessoasInteligente('replay', canal_plc=canal)
+    detector.yolo_model = modelo
+    detector.inferir_recorte = recorte
+    if not portao:
+        detector.portao = None
+    detector.definir_area_centro(frames[0])
+
+    tempo_inferencia = 0.0
+    contagens = []
+    for k, frame in enumerate(frames):
+        tempo = k / fps
+        pequeno = cv2.resize(frame, (frame.shape[1]//2, frame.shape[0]//2))
+        entrada = detector.recortar(pequeno)
+
+        if detector.pular_inferencia(entrada, tempo):
+            pessoas = detector.pessoas_detectadas
+        else:
+            t0 = time.perf_counter()
+            pessoas = detector.processar_resultado(modelo.detectar([entrada])[0], tempo)
+            tempo_inferencia += time.perf_counter() - t0
+
+        detector.atualizar_resultado(pessoas, tempo)
+        contagens.append(len(pessoas))
+
+    taxa = detector.portao.taxa_inferencia() if detector.portao else 1.0
+    return tempo_inferencia / len(frames) * 1000, taxa, contagens
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('clipe')
+    parser.add_argument('--frames', type=int, default=1500)
+    parser.add_argument('--modelo', default='yolov8n.pt')
+    parser.add_argument('--backend', choices=BACKENDS, default='ultralytics')
+    args = parser.parse_args()
+
+    frames, fps = carregar_clipe(args.clipe, args.frames)
+    modelo = criar_backend(args.backend, args.modelo)
+    modelo.detectar([cv2.resize(frames[0], (frames[0].shape[1]//2, frames[0].shape[0]//2))])  # aquecimento
+
+    modos = [
+        ('frame inteiro', False, False),
+        ('recorte', True, False),
+        ('recorte+portão', True, True),
+    ]
+    referencia = None
+    print(f"{'modo':<15} | {'ms/frame':>8} | {'YOLO em':>7} | {'perdidos':>8} | {'contagem ≠':>10}")
+    for nome, recorte, portao in modos:
+        ms, taxa, contagens = executar_modo(frames, fps, modelo, recorte, portao)
+        if referencia is None:
+            referencia = contagens
+        perdidos = sum(1 for a, b in zip(referencia, contagens) if a > 0 and b == 0)
+        diferentes = sum(1 for a, b in zip(referencia, contagens) if a != b)
+        print(f"{nome:<15} | {ms:8.2f} | {taxa * 100:6.0f}% | {perdidos:8d} | {diferentes:10d}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,268 @@
+"""Benchmark: o mesmo resultado em vários PLCs - laço sequencial vs SaidasPLC
+
+Três alvos contra servidores snap7 locais: seguranca (DB17 padrão, sem
+política), linha e ihm (layout completo, com array de pessoas e política
+padrão). Resultados sintéticos chegam na taxa de inferência. Mede a
+latência resultado → escrita no PLC de segurança e as escritas/s, com a
+IHM viva e com a IHM travada (aceita TCP e nunca responde), e o maior
+intervalo sem dado novo no PLC de segurança (lido da memória do servidor).
+
+- sequencial: uma thread e um laço pelos alvos, recodificando a imagem de
+  cada um; a reconexão da IHM travada bloqueia o laço.
+- SaidasPLC: um EscritorPLC por alvo e o snapshot codificado uma vez.
+
+Também mede o custo de codificação por resultado (CPU, sem rede).
+
+Uso (na raiz do repositório):
+    python -m benchmarks.bench_saidas_plc --hz 15 --segundos 10 --pessoas 16
+"""
+import argparse
+import random
+import socket
+import threading
+import time
+
+import snap7
+
+from plc_db17 import LAYOUT_DB17, ArrayPessoasDB, EmpacotadorDB, layout_db17
+from plc_simulado import ServidorPLCSimulado
+from politica_plc import POLITICA_PADRAO
+from pos_processamento import PESSOA_DTYPE
+from saidas_plc import SaidasPLC, SnapshotCompartilhado
+from telemetria import TELEMETRIA, Histograma
+
+import numpy as np
+
+
+class ServidorTravado:
+    """Aceita conexões TCP e nunca responde (PLC/gateway pendurado)"""
+
+    def __init__(self, porta):
+        self.soquete = socket.socket()
+        self.soquete.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+        self.soquete.bind(('127.0.0.1', porta))
+        self.soquete.listen(16)
+        self.conexoes = []
+        threading.Thread(target=self._aceitar, daemon=True).start()
+
+    def _aceitar(self):
+        while True:
+            try:
+                self.conexoes.append(self.soquete.accept()[0])
+            except OSError:
+                return
+
+    def parar(self):
+        self.soquete.shutdown(socket.SHUT_RDWR)  # acorda o accept() para liberar a porta
+        self.soquete.close()
+        for conexao in self.conexoes:
+            conexao.close()
+
+
+class FanoutSequencial:
+    """Referência: uma thread percorre os alvos e recodifica a imagem de cada um"""
+
+    def __init__(self, alvos, intervalo_reconexao=1.0):
+        self.alvos = [{'nome': nome, 'porta': porta, 'plc': snap7.client.Client(), 'conectado': False,
+                       'tentativa': 0.0, 'empacotador': EmpacotadorDB(layout)}
+                      for nome, porta, layout in alvos]
+        self.intervalo_reconexao = intervalo_reconexao
+        self.latencia = Histograma()
+        self.escritas = {nome: 0 for nome, _, _ in alvos}
+        self._condicao = threading.Condition()
+        self._pendente = None
+        self.ativo = True
+        self._thread = threading.Thread(target=self._executar, daemon=True)
+        self._thread.start()
+
+    def publicar(self, valores, origem=None):
+        with self._condicao:
+            self._pendente = (valores, origem)
+            self._condicao.notify()
+
+    def parar(self):
+        self.ativo = False
+        with self._condicao:
+            self._condicao.notify()
+        self._thread.join(10)
+
+    def _executar(self):
+        while self.ativo:
+            with self._condicao:
+                self._condicao.wait_for(lambda: self._pendente is not None or not self.ativo)
+                pendente, self._pendente = self._pendente, None
+            if pendente is None:
+                continue
+            valores, origem = pendente
+            for alvo in self.alvos:
+                agora = time.monotonic()
+                if not alvo['conectado'] and agora >= alvo['tentativa']:
+                    alvo['tentativa'] = agora + self.intervalo_reconexao
+                    try:
+                        alvo['plc'].connect('127.0.0.1', 0, 1, alvo['porta'])
+                        alvo['conectado'] = True
+                    except Exception:
+                        pass
+                if not alvo['conectado']:
+                    continue
+                empacotador = alvo['empacotador']
+                for nome, valor in valores.items():
+                    if nome in empacotador.layout.campos:
+                        empacotador.definir(nome, valor)
+                try:
+                    self.escritas[alvo['nome']] += empacotador.escrever(alvo['plc'], 17, 0, completo=False)
+                except Exception:
+                    alvo['conectado'] = False
+                if alvo['nome'] == 'seguranca' and origem is not None:
+                    self.latencia.observar(time.time() - origem)
+
+
+def resultados(pessoas, hz, segundos):
+    """Valores do layout completo por resultado: pessoas andando, com ruído"""
+    rnd = random.Random(11)
+    array = ArrayPessoasDB(pessoas)
+    lista = []
+    for k in range(int(hz * segundos)):
+        n = 1 + (k // 20) % pessoas  # sempre alguém: a distância mínima muda a cada resultado
+        registros = np.zeros(n, PESSOA_DTYPE)
+        registros['id'] = np.arange(1, n + 1)
+        registros['distancia'] = [150 + 100 * np.sin(k / 15 + i) + rnd.gauss(0, 2) for i in range(n)]
+        registros['velocidade'] = [abs(rnd.gauss(2, 0.5)) for _ in range(n)]
+        registros['x'] = [400 + 10 * i + k % 30 for i in range(n)]
+        registros['zona'] = 1
+        valores = {
+            'pessoa_detectada': n > 0,
+            'quantidade_pessoas': n,
+            'timestamp_unix': int(time.time()),
+        }
+        if n:
+            valores['distancia_minima'] = float(registros['distancia'].min())
+            valores['velocidade_maxima'] = float(registros['velocidade'].max())
+        valores.update(array.valores(registros))
+        lista.append(valores)
+    return lista
+
+
+class MonitorDB:
+    """Maior intervalo sem mudança na distância mínima do DB de um servidor simulado"""
+
+    def __init__(self, servidor, periodo=0.002):
+        self.servidor = servidor
+        self.periodo = periodo
+        self.maior_intervalo = 0.0
+        self.ativo = True
+        self._thread = threading.Thread(target=self._executar, daemon=True)
+        self._thread.start()
+
+    def _executar(self):
+        anterior = self.servidor.ler(4, 4)
+        mudanca = time.monotonic()
+        while self.ativo:
+            time.sleep(self.periodo)
+            atual = self.servidor.ler(4, 4)
+            agora = time.monotonic()
+            if atual != anterior:
+                self.maior_intervalo = max(self.maior_intervalo, agora - mudanca)
+                anterior, mudanca = atual, agora
+
+    def parar(self):
+        self.ativo = False
+        self._thread.join()
+        return self.maior_intervalo
+
+
+def rodar(modo, alvos, layout, lista, hz, servidor_seguranca):
+    TELEMETRIA.zerar()
+    if modo == 'sequencial':
+        saida = FanoutSequencial([(nome, porta, LAYOUT_DB17 if nome == 'seguranca' else layout)
+                                  for nome, porta in alvos])
+    else:
+        saida = SaidasPLC([{'nome': nome, 'ip': '127.0.0.1', 'porta': porta,
+                            'blocos': [{'db': 17, 'layout': 'db17' if nome == 'seguranca' else 'completo'}],
+                            'politica': None if nome == 'seguranca' else POLITICA_PADRAO}
+                           for nome, porta in alvos], layout)
+        saida.iniciar()
+    time.sleep(0.5)
+
+    monitor = MonitorDB(servidor_seguranca)
+    inicio = time.monotonic()
+    proximo = inicio
+    for valores in lista:
+        saida.publicar(valores, origem=time.time())
+        proximo += 1.0 / hz
+        time.sleep(max(0.0, proximo - time.monotonic()))
+    duracao = time.monotonic() - inicio
+    time.sleep(0.3)
+    maior_intervalo = monitor.parar()
+
+    if modo == 'sequencial':
+        saida.parar()
+        latencia, escritas = saida.latencia, saida.escritas['seguranca']
+    else:
+        saida.aguardar_envio()
+        latencia = TELEMETRIA.histograma('camera_plc_seguranca')
+        escritas = saida.contadores_por_alvo()['seguranca']['escritas']
+        saida.parar(timeout=1)
+    return latencia, escritas / duracao, maior_intervalo
+
+
+def custo_codificacao(layout, lista, alvos=3):
+    """µs por resultado: cada alvo codificando campo a campo vs uma codificação + cópias"""
+    empacotadores = [EmpacotadorDB(layout) for _ in range(alvos)]
+    inicio = time.perf_counter()
+    for valores in lista:
+        for empacotador in empacotadores:
+            for nome, valor in valores.items():
+                empacotador.definir(nome, valor)
+            empacotador.sujas = []
+    por_alvo = (time.perf_counter() - inicio) / len(lista) * 1e6
+
+    snapshot = SnapshotCompartilhado(layout)
+    empacotadores = [EmpacotadorDB(layout) for _ in range(alvos)]
+    inicio = time.perf_counter()
+    for valores in lista:
+        snapshot.atualizar(valores)
+        for empacotador in empacotadores:
+            snapshot.copiar_para(empacotador)
+            empacotador.sujas = []
+    uma_vez = (time.perf_counter() - inicio) / len(lista) * 1e6
+    return por_alvo, uma_vez
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--hz', type=float, default=15)
+    parser.add_argument('--segundos', type=float, default=10)
+    parser.add_argument('--pessoas', type=int, default=16, help='capacidade do array de pessoas do layout completo')
+    parser.add_argument('--porta', type=int, default=1110, help='primeira porta dos servidores locais')
+    args = parser.parse_args()
+
+    layout = layout_db17(True, args.pessoas)
+    lista = resultados(args.pessoas, args.hz, args.segundos)
+
+    por_alvo, uma_vez = custo_codificacao(layout, lista)
+    print(f"Codificação por resultado (3 alvos, {layout.tamanho} bytes): "
+          f"campo a campo por alvo {por_alvo:.0f} µs | uma vez + cópias {uma_vez:.0f} µs")
+
+    alvos = [('seguranca', args.porta), ('linha', args.porta + 1), ('ihm', args.porta + 2)]
+    print(f"{'IHM':<8} | {'modo':<10} | {'seg. p50 ms':>11} | {'seg. p99 ms':>11} | "
+          f"{'seg. escritas/s':>15} | {'seg. maior intervalo ms':>23}")
+    with ServidorPLCSimulado(args.porta, tamanho_db=layout.tamanho) as seguranca, \
+            ServidorPLCSimulado(args.porta + 1, tamanho_db=layout.tamanho):
+        for estado_ihm in ('viva', 'travada'):
+            for modo in ('sequencial', 'SaidasPLC'):
+                if estado_ihm == 'viva':
+                    ihm = ServidorPLCSimulado(args.porta + 2, tamanho_db=layout.tamanho).iniciar()
+                else:
+                    ihm = ServidorTravado(args.porta + 2)
+                try:
+                    latencia, escritas, intervalo = rodar(modo, alvos, layout, lista, args.hz, seguranca)
+                finally:
+                    ihm.parar()
+                print(f"{estado_ihm:<8} | {modo:<10} | {latencia.percentil(50) * 1000:11.1f} | "
+                      f"{latencia.percentil(99) * 1000:11.1f} | {escritas:15.1f} | {intervalo * 1000:23.0f}")
+                time.sleep(0.5)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,70 @@
+"""Benchmark: classificação por zona com teste de polígono por pessoa vs máscara de rótulos
+
+Pontos dos pés sintéticos são classificados nas zonas de um arquivo
+(zonas_exemplo.json por padrão) de dois jeitos: cv2.pointPolygonTest por
+pessoa e por zona, na ordem de prioridade, e indexação da máscara de
+rótulos pré-calculada (ZonasMonitoradas.classificar). Mede o tempo por
+frame e a concordância (diferenças só na borda dos polígonos).
+
+Uso (na raiz do repositório):
+    python -m benchmarks.bench_zonas --pessoas 10 50 200 --zonas zonas_exemplo.json
+"""
+import argparse
+import time
+
+import cv2
+import numpy as np
+
+from roi import TIPOS_ZONA, carregar_zonas
+
+
+def classificar_poligonos(zonas, x, y, fator_escala):
+    """Caminho direto: teste de polígono por pessoa, zona de maior prioridade vence"""
+    rotulos = np.zeros(len(x), np.uint8)
+    for k in range(len(x)):
+        ponto = (float(x[k] * fator_escala), float(y[k] * fator_escala))
+        for tipo in TIPOS_ZONA:
+            for i, poligono in enumerate(zonas.poligonos):
+                if zonas.tipos[i] == tipo and cv2.pointPolygonTest(poligono, ponto, False) >= 0:
+                    rotulos[k] = i + 1
+    return rotulos
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--pessoas', type=int, nargs='+', default=[10, 50, 200])
+    parser.add_argument('--zonas', default='zonas_exemplo.json')
+    parser.add_argument('--frames', type=int, default=300)
+    args = parser.parse_args()
+
+    fator_escala = 2
+    zonas = carregar_zonas(args.zonas)
+    inicio = time.perf_counter()
+    zonas.preparar((1080, 1920, 3), fator_escala)
+    print(f"Máscara de rótulos {zonas.rotulos.shape[1]}x{zonas.rotulos.shape[0]} "
+          f"pré-calculada em {(time.perf_counter() - inicio) * 1000:.1f} ms")
+
+    rnd = np.random.default_rng(3)
+    h, w = zonas.rotulos.shape
+    print(f"{'pessoas':>7} | {'caminho':<10} | {'média ms':>8} | {'p99 ms':>7} | {'iguais':>6}")
+    for pessoas in args.pessoas:
+        pontos = [(rnd.uniform(0, w - 1, pessoas), rnd.uniform(0, h - 1, pessoas)) for _ in range(args.frames)]
+
+        resultados = {}
+        for nome, classificar in (('polígonos', lambda x, y: classificar_poligonos(zonas, x, y, fator_escala)),
+                                  ('máscara', zonas.classificar)):
+            tempos, rotulos = [], []
+            for x, y in pontos:
+                t0 = time.perf_counter()
+                rotulos.append(classificar(x, y))
+                tempos.append((time.perf_counter() - t0) * 1000)
+            resultados[nome] = (np.array(tempos), np.concatenate(rotulos))
+
+        iguais = np.mean(resultados['polígonos'][1] == resultados['máscara'][1]) * 100
+        for nome, (tempos, _) in resultados.items():
+            print(f"{pessoas:>7} | {nome:<10} | {tempos.mean():8.3f} | {np.percentile(tempos, 99):7.3f} | "
+                  f"{iguais:5.1f}%")
+
+
+if __name__ == '__main__':
+    main()
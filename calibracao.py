@@ -0,0 +1,110 @@
+import json
+
+import cv2
+import numpy as np
+
+
+def carregar_calibracao(caminho):
+    """Ler a calibração da câmera de um arquivo JSON (ver calibracao_exemplo.json)"""
+    with open(caminho, encoding='utf-8') as f:
+        config = json.load(f)
+    return CalibracaoChao(
+        config['resolucao'], config['pontos_imagem'], config['pontos_chao'],
+        matriz_camera=config.get('matriz_camera'), distorcao=config.get('distorcao'),
+        referencia=config.get('referencia', (0.0, 0.0)),
+    )
+
+
+class CalibracaoChao:
+    """Pixel → posição no chão (metros) por homografia, com tabelas pré-calculadas
+
+    A calibração é feita uma vez: intrínsecos opcionais (matriz da câmera e
+    distorção, do cv2.calibrateCamera com tabuleiro) e ≥ 4 pontos do piso
+    com posição conhecida, marcados na imagem na resolução `resolucao`.
+
+    preparar() monta, para cada pixel do frame de inferência, a posição no
+    chão (x, y) e a distância até `referencia` (ex.: a máquina ou o ponto
+    sob a câmera). Converter o ponto dos pés de uma detecção passa a ser uma
+    indexação de array. Pixels acima do horizonte ficam NaN (desconhecido).
+    """
+
+    def __init__(self, resolucao, pontos_imagem, pontos_chao, matriz_camera=None, distorcao=None,
+                 referencia=(0.0, 0.0)):
+        self.resolucao = tuple(resolucao)  # (largura, altura) dos pontos e intrínsecos
+        self.matriz_camera = None if matriz_camera is None else np.asarray(matriz_camera, np.float64)
+        self.distorcao = None if distorcao is None else np.asarray(distorcao, np.float64)
+        self.referencia = np.asarray(referencia, np.float64)
+
+        self.pontos_imagem = np.asarray(pontos_imagem, np.float64).reshape(-1, 2)
+        self.pontos_chao = np.asarray(pontos_chao, np.float64).reshape(-1, 2)
+        if len(self.pontos_imagem) < 4 or len(self.pontos_imagem) != len(self.pontos_chao):
+            raise ValueError("A calibração precisa de ≥ 4 pares ponto da imagem / ponto do chão")
+
+        self.homografia, _ = cv2.findHomography(self._sem_distorcao(self.pontos_imagem), self.pontos_chao)
+        if self.homografia is None:
+            raise ValueError("Pontos de calibração degenerados (colineares?)")
+
+        # O findHomography normaliza h33 = 1, então o sinal de w no chão é arbitrário:
+        # fixa w > 0 nos pontos do piso; o lado oposto (w < 0) é o céu
+        w = self._homogeneos(self._sem_distorcao(self.pontos_imagem))[:, 2]
+        if np.all(w < 0):
+            self.homografia = -self.homografia
+        elif not np.all(w > 0):
+            raise ValueError("Pontos de calibração dos dois lados do horizonte")
+        if not np.all(np.isfinite(self.erro_reprojecao())):
+            raise ValueError("Ponto de calibração reprojeta fora do chão")
+
+        self.chao = None       # (h, w, 2) metros por pixel do frame de inferência
+        self.distancias = None  # (h, w) metros até a referência
+
+    def _sem_distorcao(self, pontos):
+        """Pontos (N,2) na resolução da calibração, sem a distorção da lente"""
+        if self.matriz_camera is None or self.distorcao is None:
+            return pontos
+        pontos = np.ascontiguousarray(pontos, np.float64).reshape(-1, 1, 2)
+        return cv2.undistortPoints(pontos, self.matriz_camera, self.distorcao,
+                                   P=self.matriz_camera).reshape(-1, 2)
+
+    def para_chao_direto(self, pontos):
+        """Pixels (N,2) na resolução da calibração → metros (N,2), sem tabela"""
+        pontos = self._sem_distorcao(np.asarray(pontos, np.float64).reshape(-1, 2))
+        homogeneos = self._homogeneos(pontos)
+        with np.errstate(divide='ignore', invalid='ignore'):
+            chao = homogeneos[:, :2] / homogeneos[:, 2:]
+        chao[~(homogeneos[:, 2] > 0)] = np.nan  # horizonte e acima (w com o sinal do céu)
+        return chao
+
+    def _homogeneos(self, pontos):
+        return np.hstack((pontos, np.ones((len(pontos), 1)))) @ self.homografia.T
+
+    def erro_reprojecao(self):
+        """Erro (m) de cada ponto de calibração reprojetado no chão"""
+        return np.linalg.norm(self.para_chao_direto(self.pontos_imagem) - self.pontos_chao, axis=1)
+
+    def preparar(self, shape_inferencia):
+        """Tabelas pixel → chão e pixel → distância no frame de inferência"""
+        h, w = shape_inferencia[:2]
+        escala_x = self.resolucao[0] / w
+        escala_y = self.resolucao[1] / h
+
+        # Centro de cada pixel de inferência na resolução da calibração
+        xs = (np.arange(w) + 0.5) * escala_x
+        ys = (np.arange(h) + 0.5) * escala_y
+        grade = np.stack(np.meshgrid(xs, ys), axis=-1).reshape(-1, 2)
+
+        self.chao = self.para_chao_direto(grade).reshape(h, w, 2).astype(np.float32)
+        self.distancias = np.linalg.norm(self.chao - self.referencia.astype(np.float32), axis=2)
+
+    def _indices(self, x, y):
+        h, w = self.distancias.shape
+        x = np.clip(np.asarray(x, np.int64), 0, w - 1)
+        y = np.clip(np.asarray(y, np.int64), 0, h - 1)
+        return y, x
+
+    def para_chao(self, x, y):
+        """Pontos (arrays x, y no frame de inferência) → metros (N,2); NaN = desconhecido"""
+        return self.chao[self._indices(x, y)]
+
+    def distancia(self, x, y):
+        """Distância no chão (m) até a referência; NaN = desconhecida"""
+        return self.distancias[self._indices(x, y)]
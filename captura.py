@@ -0,0 +1,377 @@
+import glob
+import logging
+import os
+import shutil
+import subprocess
+import threading
+import time
+
+import cv2
+import numpy as np
+
+from telemetria import TELEMETRIA
+
+log = logging.getLogger(__name__)
+
+EXTENSOES_IMAGEM = ('jpg', 'jpeg', 'png', 'bmp')
+
+
+class SequenciaImagens:
+    """Diretório de imagens com a mesma interface usada do cv2.VideoCapture"""
+
+    def __init__(self, diretorio, fps=15):
+        self.arquivos = sorted(f for ext in EXTENSOES_IMAGEM
+                               for f in glob.glob(os.path.join(diretorio, f'*.{ext}')))
+        self.fps = fps
+        self.indice = 0
+        self._atual = None
+
+    def set(self, propriedade, valor):
+        return False
+
+    def get(self, propriedade):
+        if propriedade == cv2.CAP_PROP_FPS:
+            return self.fps
+        if propriedade == cv2.CAP_PROP_FRAME_COUNT:
+            return len(self.arquivos)
+        if propriedade == cv2.CAP_PROP_POS_MSEC:
+            return max(self.indice - 1, 0) * 1000.0 / self.fps  # imagem atual
+        return 0
+
+    def grab(self):
+        if self.indice >= len(self.arquivos):
+            return False
+        self._atual = cv2.imread(self.arquivos[self.indice])
+        self.indice += 1
+        return self._atual is not None
+
+    def retrieve(self, destino=None):
+        if destino is None or destino.shape != self._atual.shape:
+            return True, self._atual
+        np.copyto(destino, self._atual)
+        return True, destino
+
+    def read(self):
+        if not self.grab():
+            return False, None
+        return self.retrieve()
+
+    def release(self):
+        self.arquivos = []
+
+
+class CapturaFrames:
+    """Estágio de captura: decodifica sem parar e guarda só o frame mais recente
+
+    Ler o stream continuamente numa thread própria esvazia o buffer do
+    FFmpeg/RTSP (que CAP_PROP_BUFFERSIZE=1 não resolve), então o consumidor
+    sempre recebe o frame mais novo. Os frames vão para buffers NumPy
+    pré-alocados (double buffering) e os consumidores copiam para os seus
+    próprios buffers com copiar(), sem alocação por frame.
+
+    backend='opencv': cv2.VideoCapture; o frame de inferência é um resize
+    (no mesmo thread de captura) para fator_inferencia.
+    backend='ffmpeg': processo ffmpeg que já decodifica na resolução de
+    inferência (scale no decoder, hwaccel opcional) direto para rawvideo;
+    nesse modo o frame exibido é o próprio frame de inferência.
+
+    tempo_real=True cadencia fontes gravadas (arquivos) no FPS do vídeo,
+    como se fossem uma câmera ao vivo.
+
+    Replay (fontes gravadas, inclusive diretórios de imagens): sem_perdas=True
+    só decodifica o próximo frame depois que o consumidor copiou o atual
+    (nenhum frame é pulado, o mais rápido que o consumidor aguentar) e
+    repetir=False encerra a captura no fim do arquivo em vez de reabrir.
+
+    Tempo do frame: ao vivo, o time.time() da decodificação. Em fontes
+    gravadas, a posição na gravação (CAP_PROP_POS_MSEC; índice / fps em
+    diretórios de imagens e no backend ffmpeg) somada a um início fixo, então
+    rastreador, velocidades e política do PLC veem o tempo do vídeo mesmo no
+    replay acelerado. O relógio de parede da decodificação continua em
+    `relogio`, para latências.
+    """
+
+    def __init__(self, fonte, fator_inferencia=0.5, backend='opencv',
+                 tamanho_ffmpeg=None, hwaccel=None, aviso=None, tempo_real=False,
+                 sem_perdas=False, repetir=True, fps_imagens=15):
+        self.fonte = fonte
+        self.fator_inferencia = fator_inferencia
+        self.backend = backend
+        self.tamanho_ffmpeg = tamanho_ffmpeg  # (largura, altura) de saída do decoder
+        self.hwaccel = hwaccel
+        self.aviso = aviso
+        self.tempo_real = tempo_real
+        self.sem_perdas = sem_perdas
+        self.repetir = repetir
+        self.fps_imagens = fps_imagens  # cadência de diretórios de imagens
+        self.intervalo_fonte = 0.0
+        self.encerrada = False  # fim da fonte gravada (repetir=False)
+        self.gravada = os.path.isfile(str(fonte)) or os.path.isdir(str(fonte))
+        self._inicio_gravacao = 0.0  # tempo do frame na posição 0 da gravação
+        self._intervalo_gravacao = 1.0 / fps_imagens  # 1 / fps da gravação
+
+        self.ativo = False
+        self._condicao = threading.Condition()
+        self._thread = None
+        self._cap = None
+        self._processo = None
+
+        self.frame_shape = None
+        self.inferencia_shape = None
+        self.sequencia = 0
+        self._consumida = 0
+        self.tempo = 0.0
+        self.relogio = 0.0  # time.time() da decodificação do frame pronto
+        self.frames_decodificados = 0
+
+    @property
+    def fator_escala(self):
+        """Fator de coordenadas: frame de inferência → frame exibido"""
+        return self.frame_shape[1] / self.inferencia_shape[1]
+
+    def iniciar(self):
+        """Abrir a fonte, alocar os buffers e iniciar a thread"""
+        if self.backend == 'ffmpeg':
+            ok = self._abrir_ffmpeg(alocar=True)
+        else:
+            ok = self._abrir_opencv()
+        if not ok:
+            return False
+
+        self.ativo = True
+        self._thread = threading.Thread(target=self._executar, daemon=True)
+        self._thread.start()
+        return True
+
+    def parar(self):
+        self.ativo = False
+        with self._condicao:
+            self._condicao.notify_all()
+        if self._thread is not None:
+            self._thread.join(2)
+        self._fechar()
+
+    def novo_buffer(self):
+        """Buffer do tamanho do frame exibido (alocar uma vez por consumidor)"""
+        return np.empty(self.frame_shape, np.uint8)
+
+    def novo_buffer_inferencia(self):
+        """Buffer do tamanho do frame de inferência"""
+        return np.empty(self.inferencia_shape, np.uint8)
+
+    def aguardar(self, sequencia, timeout=1.0):
+        """Bloquear até existir frame mais novo que `sequencia`"""
+        with self._condicao:
+            self._condicao.wait_for(lambda: self.sequencia != sequencia or not self.ativo, timeout)
+            return self.sequencia
+
+    def copiar(self, destino=None, destino_inferencia=None, consumir=True):
+        """Copiar o frame mais recente para buffers do consumidor
+
+        consumir=False: leitor secundário (ex.: gravador de eventos), não
+        libera o próximo frame no modo sem_perdas.
+        Retorna (sequencia, tempo, relogio): tempo do frame e, em fontes
+        gravadas, o time.time() da decodificação (None ao vivo, onde o tempo
+        do frame já é esse relógio).
+        """
+        with self._condicao:
+            if destino is not None:
+                np.copyto(destino, self._pronto)
+            if destino_inferencia is not None:
+                np.copyto(destino_inferencia, self._pronto_inferencia)
+            if consumir and self._consumida != self.sequencia:
+                self._consumida = self.sequencia
+                self._condicao.notify_all()
+            return self.sequencia, self.tempo, self.relogio if self.gravada else None
+
+    def _nova_cap(self):
+        if os.path.isdir(str(self.fonte)):
+            return SequenciaImagens(self.fonte, self.fps_imagens)
+        cap = cv2.VideoCapture(self.fonte)
+        cap.set(cv2.CAP_PROP_BUFFERSIZE, 1)
+        return cap
+
+    def _abrir_opencv(self):
+        self._cap = self._nova_cap()
+
+        ret, frame = self._cap.read()
+        if not ret:
+            return False
+
+        fps_fonte = self._cap.get(cv2.CAP_PROP_FPS)
+        if self.tempo_real and fps_fonte > 0:
+            self.intervalo_fonte = 1.0 / fps_fonte
+        if fps_fonte > 0:
+            self._intervalo_gravacao = 1.0 / fps_fonte
+
+        h, w = frame.shape[:2]
+        self.frame_shape = frame.shape
+        self.tamanho_inferencia = (int(w * self.fator_inferencia), int(h * self.fator_inferencia))
+        self.inferencia_shape = (self.tamanho_inferencia[1], self.tamanho_inferencia[0], 3)
+
+        self._escrita = frame
+        self._pronto = frame.copy()
+        self._escrita_inferencia = np.empty(self.inferencia_shape, np.uint8)
+        self._pronto_inferencia = np.empty(self.inferencia_shape, np.uint8)
+        cv2.resize(frame, self.tamanho_inferencia, dst=self._pronto_inferencia)
+        self.relogio = self._inicio_gravacao = time.time()
+        self.tempo = self._tempo_frame(self.relogio)
+        self.sequencia = 1
+        return True
+
+    def _abrir_ffmpeg(self, alocar=False):
+        if shutil.which('ffmpeg') is None:
+            log.error("❌ ffmpeg não encontrado no PATH")
+            return False
+        if self.tamanho_ffmpeg is None:
+            raise ValueError("backend ffmpeg requer tamanho_ffmpeg=(largura, altura)")
+
+        w, h = self.tamanho_ffmpeg
+        comando = ['ffmpeg', '-loglevel', 'error', '-nostdin']
+        if self.hwaccel:
+            comando += ['-hwaccel', self.hwaccel]
+        if str(self.fonte).startswith('rtsp://'):
+            comando += ['-rtsp_transport', 'tcp', '-fflags', 'nobuffer', '-flags', 'low_delay']
+        comando += ['-i', str(self.fonte), '-an', '-vf', f'scale={w}:{h}',
+                    '-pix_fmt', 'bgr24', '-f', 'rawvideo', '-']
+
+        self._processo = subprocess.Popen(comando, stdout=subprocess.PIPE, bufsize=0)
+        if not alocar:
+            return True
+        if self.gravada and not os.path.isdir(str(self.fonte)):
+            # Sem posição no pipe rawvideo: o tempo conta frames no fps do arquivo
+            cap = cv2.VideoCapture(self.fonte)
+            fps_fonte = cap.get(cv2.CAP_PROP_FPS)
+            cap.release()
+            if fps_fonte > 0:
+                self._intervalo_gravacao = 1.0 / fps_fonte
+
+        # Decoder já entrega na resolução de inferência: exibido == inferência
+        self.frame_shape = self.inferencia_shape = (h, w, 3)
+        self._escrita = self._escrita_inferencia = np.empty(self.frame_shape, np.uint8)
+        self._pronto = self._pronto_inferencia = np.empty(self.frame_shape, np.uint8)
+
+        if not self._ler_ffmpeg(self._pronto):
+            self._fechar()
+            return False
+        self.relogio = self._inicio_gravacao = time.time()
+        self.tempo = self._tempo_frame(self.relogio)
+        self.sequencia = 1
+        return True
+
+    def _ler_ffmpeg(self, destino):
+        """Ler um frame rawvideo direto no buffer (readinto, sem cópia extra)
+
+        A espera pelo primeiro pedaço do frame vai para 'espera_captura';
+        o resto da leitura, para 'captura'.
+        """
+        memoria = memoryview(destino).cast('B')
+        inicio = time.perf_counter()
+        lidos = 0
+        while lidos < len(memoria):
+            n = self._processo.stdout.readinto(memoria[lidos:])
+            if not n:
+                return False
+            if not lidos:
+                chegada = time.perf_counter()
+                TELEMETRIA.observar('espera_captura', chegada - inicio)
+            lidos += n
+        TELEMETRIA.observar('captura', time.perf_counter() - chegada)
+        return True
+
+    def _ler(self):
+        if self.backend == 'ffmpeg':
+            return self._processo is not None and self._ler_ffmpeg(self._escrita)
+
+        # grab() bloqueia até a fonte ter frame (e já decodifica): fica fora de 'captura'
+        inicio = time.perf_counter()
+        if not self._cap.grab():
+            return False
+        capturado = time.perf_counter()
+        TELEMETRIA.observar('espera_captura', capturado - inicio)
+        ret, _ = self._cap.retrieve(self._escrita)
+        if not ret:
+            return False
+        decodificado = time.perf_counter()
+        TELEMETRIA.observar('captura', decodificado - capturado)
+
+        cv2.resize(self._escrita, self.tamanho_inferencia, dst=self._escrita_inferencia)
+        TELEMETRIA.observar('redimensionamento', time.perf_counter() - decodificado)
+        return True
+
+    def _tempo_frame(self, relogio):
+        """Tempo do frame recém-lido: relógio ao vivo, posição na gravação em fontes gravadas"""
+        if not self.gravada:
+            return relogio
+        if self.sequencia == 0:
+            return self._inicio_gravacao
+        posicao = self._cap.get(cv2.CAP_PROP_POS_MSEC) / 1000 if self._cap is not None else 0.0
+        tempo = self._inicio_gravacao + posicao
+        if tempo <= self.tempo:
+            # Sem posição (pipe do ffmpeg, contêiner sem timestamps): conta frames
+            tempo = self.tempo + self._intervalo_gravacao
+        return tempo
+
+    def _reabrir(self):
+        log.warning(f"🔄 Reabrindo câmera {self.fonte}")
+        self._fechar()
+        # Gravação repetida: a posição volta a 0, o tempo continua do último frame
+        self._inicio_gravacao = self.tempo + self._intervalo_gravacao
+        time.sleep(1)
+        if self.backend == 'ffmpeg':
+            self._abrir_ffmpeg()
+        else:
+            self._cap = self._nova_cap()
+
+    def _fechar(self):
+        if self._cap is not None:
+            self._cap.release()
+            self._cap = None
+        if self._processo is not None:
+            self._processo.kill()
+            self._processo.wait()
+            self._processo = None
+
+    def _executar(self):
+        proximo = time.monotonic()
+        while self.ativo:
+            if self.sem_perdas:
+                # Replay: só decodifica o próximo depois que o atual foi consumido
+                with self._condicao:
+                    self._condicao.wait_for(lambda: self._consumida == self.sequencia or not self.ativo)
+
+            if self.intervalo_fonte:
+                proximo += self.intervalo_fonte
+                time.sleep(max(0.0, proximo - time.monotonic()))
+
+            if not self._ler():
+                if not self.repetir:
+                    self.encerrada = True
+                    self.ativo = False
+                    break
+                self._reabrir()
+                continue
+
+            relogio = time.time()
+            tempo = self._tempo_frame(relogio)
+            self.frames_decodificados += 1
+            TELEMETRIA.contar('frames_capturados')
+
+            # Troca de buffers: o recém-decodificado vira o "pronto"
+            with self._condicao:
+                self._escrita, self._pronto = self._pronto, self._escrita
+                if self.backend != 'ffmpeg':
+                    self._escrita_inferencia, self._pronto_inferencia = (
+                        self._pronto_inferencia, self._escrita_inferencia)
+                else:
+                    self._escrita_inferencia, self._pronto_inferencia = self._escrita, self._pronto
+                self.tempo = tempo
+                self.relogio = relogio
+                self.sequencia += 1
+                self._condicao.notify_all()
+
+            if self.aviso is not None:
+                self.aviso.set()
+
+        with self._condicao:
+            self._condicao.notify_all()
@@ -0,0 +1,244 @@
+import json
+import logging
+import os
+import threading
+import time
+from collections import deque
+from queue import Full, Queue
+
+import cv2
+import numpy as np
+
+from telemetria import TELEMETRIA
+
+log = logging.getLogger(__name__)
+
+
+class GravadorEventos:
+    """Clipes de eventos (entrada em zona, pessoa perto) com memória limitada
+
+    Nada disso roda no laço de captura/inferência:
+    - uma thread de codificação lê o frame mais novo da CapturaFrames (sem
+      consumi-lo), codifica JPEG e mantém um anel de pré-disparo com os
+      últimos `segundos_antes`; se não der tempo de codificar, frames são
+      pulados. Anel + clipe em andamento + clipes esperando o disco ficam
+      dentro de `memoria_max_mb`: o anel cede espaço ao clipe, e o clipe
+      para de crescer (frames truncados) quando não há mais;
+    - disparar() e registrar() só anotam o evento/as trilhas sob uma trava;
+    - uma thread de escrita grava o clipe (.avi MJPG) e o registro das
+      trilhas (.json) no disco. Com a fila de escrita cheia o clipe é
+      descartado e contado, nunca bloqueia quem disparou.
+
+    Eventos que chegam durante um clipe o estendem (até segundos_max).
+    """
+
+    def __init__(self, diretorio, segundos_antes=5.0, segundos_depois=3.0, segundos_max=30.0,
+                 memoria_max_mb=64, fps=10, qualidade=80, largura=None):
+        self.diretorio = diretorio
+        self.segundos_antes = segundos_antes
+        self.segundos_depois = segundos_depois
+        self.segundos_max = segundos_max
+        self.memoria_max = int(memoria_max_mb * 1024 * 1024)
+        self.intervalo = 1.0 / fps
+        self.qualidade = qualidade
+        self.largura = largura  # None = resolução do frame exibido
+
+        self.ativo = False
+        self._trava = threading.Lock()
+        self._anel = deque()     # (tempo, jpeg) dos últimos segundos_antes
+        self._trilhas = deque()  # (tempo, pessoas PESSOA_DTYPE)
+        self._bytes_anel = 0
+        self._evento = None      # clipe em andamento
+        self._bytes_pendentes = 0  # clipes na fila de escrita
+        self._fila_escrita = Queue(4)
+        self._threads = []
+        self.captura = None
+
+        self.clipes = 0
+        self.clipes_descartados = 0
+        self.frames_truncados = 0
+
+    def iniciar(self, captura):
+        """Começar a bufferizar os frames da captura"""
+        os.makedirs(self.diretorio, exist_ok=True)
+        self.captura = captura
+        self.ativo = True
+        for alvo in (self._codificar, self._escrever):
+            thread = threading.Thread(target=alvo, daemon=True)
+            thread.start()
+            self._threads.append(thread)
+        TELEMETRIA.medidor('eventos_memoria_bytes',
+                           lambda: self._bytes_anel + self._bytes_evento() + self._bytes_pendentes)
+        log.info(f"🎬 Gravador de eventos em {self.diretorio} ({self.segundos_antes:.0f}s antes, "
+                 f"{self.segundos_depois:.0f}s depois, até {self.memoria_max // (1024 * 1024)} MB)")
+
+    def parar(self):
+        """Fechar o clipe em andamento e esperar a escrita"""
+        if not self._threads:
+            return
+        codificacao, escrita = self._threads
+        self.ativo = False
+        codificacao.join(2)
+        with self._trava:
+            self._fechar_evento()
+        self._fila_escrita.put(None)  # fim da escrita, depois dos clipes pendentes
+        escrita.join(10)
+
+    # ====== CHAMADAS DO LAÇO (SÓ ANOTAM) ======
+
+    def registrar(self, pessoas, tempo):
+        """Trilhas de um resultado (array PESSOA_DTYPE, não é modificado depois)"""
+        with self._trava:
+            self._trilhas.append((tempo, pessoas))
+            if self._evento is not None:
+                self._evento['trilhas'].append((tempo, pessoas))
+            while self._trilhas and self._trilhas[0][0] < tempo - self.segundos_antes:
+                self._trilhas.popleft()
+
+    def disparar(self, tipo, tempo, detalhes=None):
+        """Evento: abre um clipe com o anel de pré-disparo ou estende o atual"""
+        disparo = {'tipo': tipo, 'tempo': tempo, 'detalhes': detalhes or {}}
+        with self._trava:
+            evento = self._evento
+            if evento is None:
+                inicio = tempo - self.segundos_antes
+                self._evento = {
+                    'inicio': tempo,
+                    'fim': tempo + self.segundos_depois,
+                    'disparos': [disparo],
+                    'frames': [f for f in self._anel if f[0] >= inicio],
+                    'trilhas': [t for t in self._trilhas if t[0] >= inicio],
+                }
+                self._evento['bytes'] = sum(len(jpeg) for _, jpeg in self._evento['frames'])
+            else:
+                evento['disparos'].append(disparo)
+                evento['fim'] = min(max(evento['fim'], tempo + self.segundos_depois),
+                                    evento['inicio'] + self.segundos_max)
+        TELEMETRIA.contar(f'eventos_{tipo}')
+
+    def contadores(self):
+        return {'clipes': self.clipes, 'clipes_descartados': self.clipes_descartados,
+                'frames_truncados': self.frames_truncados}
+
+    # ====== THREAD DE CODIFICAÇÃO ======
+
+    def _bytes_evento(self):
+        evento = self._evento
+        return evento['bytes'] if evento is not None else 0
+
+    def _codificar(self):
+        buffer = None
+        sequencia = 0
+        ultimo = 0.0
+        while self.ativo:
+            nova = self.captura.aguardar(sequencia, timeout=0.5)
+            agora = time.time()
+            if nova == sequencia:
+                self._fechar_vencido(agora)  # câmera parada: o clipe fecha pelo relógio
+                continue
+            if agora - ultimo < self.intervalo:
+                sequencia = nova  # acima do fps do clipe: pula este frame
+                continue
+
+            if buffer is None:
+                buffer = self.captura.novo_buffer()
+            sequencia, tempo, _ = self.captura.copiar(buffer, consumir=False)
+            ultimo = agora
+
+            frame = buffer
+            if self.largura and buffer.shape[1] > self.largura:
+                altura = int(buffer.shape[0] * self.largura / buffer.shape[1])
+                frame = cv2.resize(buffer, (self.largura, altura), interpolation=cv2.INTER_AREA)
+            inicio = time.perf_counter()
+            ok, jpeg = cv2.imencode('.jpg', frame, [cv2.IMWRITE_JPEG_QUALITY, self.qualidade])
+            TELEMETRIA.observar('eventos_jpeg', time.perf_counter() - inicio)
+            if ok:
+                self._guardar(tempo, jpeg.tobytes())
+
+    def _guardar(self, tempo, jpeg):
+        with self._trava:
+            self._anel.append((tempo, jpeg))
+            self._bytes_anel += len(jpeg)
+
+            evento = self._evento
+            if evento is not None and tempo <= evento['fim']:
+                if evento['bytes'] + self._bytes_pendentes + len(jpeg) <= self.memoria_max:
+                    evento['frames'].append((tempo, jpeg))
+                    evento['bytes'] += len(jpeg)
+                else:
+                    self.frames_truncados += 1
+
+            # Anel: só os últimos segundos_antes, dentro do que sobra da memória
+            limite = self.memoria_max - self._bytes_evento() - self._bytes_pendentes
+            while self._anel and (self._anel[0][0] < tempo - self.segundos_antes or self._bytes_anel > limite):
+                self._bytes_anel -= len(self._anel.popleft()[1])
+
+            self._fechar_vencido(tempo, travado=True)
+
+    def _fechar_vencido(self, agora, travado=False):
+        if self._evento is None or agora <= self._evento['fim']:
+            return
+        if travado:
+            self._fechar_evento()
+        else:
+            with self._trava:
+                if self._evento is not None and agora > self._evento['fim']:
+                    self._fechar_evento()
+
+    def _fechar_evento(self):
+        """Passar o clipe em andamento para a thread de escrita (com a trava)"""
+        evento, self._evento = self._evento, None
+        if evento is None:
+            return
+        try:
+            self._fila_escrita.put_nowait(evento)
+            self._bytes_pendentes += evento['bytes']
+        except Full:
+            self.clipes_descartados += 1
+            log.warning(f"⚠️ Escrita de clipes atrasada, evento {evento['disparos'][0]['tipo']} descartado")
+
+    # ====== THREAD DE ESCRITA ======
+
+    def _escrever(self):
+        while True:
+            evento = self._fila_escrita.get()
+            if evento is None:
+                break
+            try:
+                self._gravar(evento)
+                self.clipes += 1
+            except Exception as e:
+                log.error(f"❌ Erro gravando clipe: {e}")
+            finally:
+                with self._trava:
+                    self._bytes_pendentes -= evento['bytes']
+
+    def _gravar(self, evento):
+        primeiro = evento['disparos'][0]
+        nome = time.strftime('%Y%m%d_%H%M%S', time.localtime(evento['inicio'])) + f"_{primeiro['tipo']}"
+        base = os.path.join(self.diretorio, nome)
+
+        frames = evento['frames']
+        if frames:
+            duracao = frames[-1][0] - frames[0][0]
+            fps = (len(frames) - 1) / duracao if duracao > 0 else 1.0 / self.intervalo
+            escritor = None
+            for _, jpeg in frames:
+                imagem = cv2.imdecode(np.frombuffer(jpeg, np.uint8), cv2.IMREAD_COLOR)
+                if escritor is None:
+                    escritor = cv2.VideoWriter(base + '.avi', cv2.VideoWriter_fourcc(*'MJPG'), fps,
+                                               (imagem.shape[1], imagem.shape[0]))
+                escritor.write(imagem)
+            escritor.release()
+
+        registro = {
+            'inicio': evento['inicio'],
+            'disparos': evento['disparos'],
+            'clipe': os.path.basename(base + '.avi') if frames else None,
+            'tempos_frames': [t for t, _ in frames],
+            'trilhas': [{'tempo': t, 'pessoas': [dict(zip(p.dtype.names, linha)) for linha in p.tolist()]}
+                        for t, p in evento['trilhas']],
+        }
+        with open(base + '.json', 'w', encoding='utf-8') as f:
+            json.dump(registro, f, ensure_ascii=False, default=float)
+        log.info(f"🎬 Evento {primeiro['tipo']}: {len(frames)} frames, {len(evento['trilhas'])} resultados → {base}")
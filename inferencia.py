@@ -0,0 +1,381 @@
+import glob
+import hashlib
+import logging
+import os
+
+import cv2
+import numpy as np
+
+log = logging.getLogger(__name__)
+
+
+class Deteccoes:
+    """Pessoas detectadas num frame: caixas xyxy e confiança, em pixels da entrada"""
+
+    __slots__ = ('xyxy', 'conf')
+
+    def __init__(self, xyxy, conf):
+        self.xyxy = xyxy  # Nx4 float32
+        self.conf = conf  # N float32
+
+    def __len__(self):
+        return len(self.conf)
+
+
+VAZIO = Deteccoes(np.empty((0, 4), np.float32), np.empty(0, np.float32))
+
+# Modelos exportados/compilados ficam em cache entre execuções (e reinícios do watchdog)
+DIRETORIO_CACHE = os.environ.get(
+    'DETECTOR_CACHE', os.path.join(os.path.expanduser('~'), '.cache', 'detector_pessoas'))
+
+
+# ====== BACKENDS ======
+
+class BackendInferencia:
+    """Interface dos backends: detectar([frames BGR]) → [Deteccoes]
+
+    Só a classe pessoa (0). Cada backend carrega sua dependência no
+    construtor, então o detector só importa o runtime que vai usar.
+    """
+
+    nome = '?'
+
+    def __init__(self, imgsz=640, threads=None, confianca=0.25, iou=0.7):
+        self.imgsz = imgsz  # entrada fixa imgsz x imgsz
+        self.threads = threads  # threads intra-op (None = padrão do runtime)
+        self.confianca = confianca
+        self.iou = iou
+
+    def detectar(self, frames):
+        raise NotImplementedError
+
+    def aquecer(self, repeticoes=2):
+        """Inferências descartáveis (grafo, alocações) antes de declarar pronto"""
+        frame = np.zeros((self.imgsz, self.imgsz, 3), np.uint8)
+        for _ in range(repeticoes):
+            self.detectar([frame])
+
+
+class BackendUltralytics(BackendInferencia):
+    """PyTorch eager via ultralytics (comportamento original)"""
+
+    nome = 'ultralytics'
+
+    def __init__(self, modelo='yolov8n.pt', **kwargs):
+        super().__init__(**kwargs)
+        from ultralytics import YOLO
+
+        if self.threads:
+            import torch
+            torch.set_num_threads(self.threads)
+
+        self.modelo = YOLO(modelo)
+        self.modelo.overrides['verbose'] = False
+
+    def detectar(self, frames):
+        results = self.modelo(frames, verbose=False, classes=[0], imgsz=self.imgsz,
+                              conf=self.confianca, iou=self.iou)
+        saida = []
+        for result in results:
+            boxes = result.boxes
+            if boxes is None or len(boxes) == 0:
+                saida.append(VAZIO)
+            else:
+                saida.append(Deteccoes(boxes.xyxy.cpu().numpy().astype(np.float32),
+                                       boxes.conf.cpu().numpy().astype(np.float32)))
+        return saida
+
+
+class BackendExportado(BackendInferencia):
+    """Base dos modelos exportados (ONNX / OpenVINO) com entrada fixa imgsz x imgsz
+
+    Faz o letterbox de cada frame direto no tensor de entrada pré-alocado
+    (lote, 3, imgsz, imgsz) e decodifica a saída crua do YOLOv8
+    (lote, 4 + classes, N) com NMS do OpenCV. Os frames de uma chamada
+    detectar() (câmeras do multi_camera.py, ladrilhos) vão numa única
+    execução do runtime quando o eixo de lote do modelo é dinâmico, como
+    exportar_modelo exporta; um modelo de lote fixo roda em fatias desse
+    tamanho.
+    """
+
+    lote_maximo = None  # None = eixo de lote dinâmico; int = lote fixo do modelo
+
+    def __init__(self, **kwargs):
+        super().__init__(**kwargs)
+        self._canvas = np.full((self.imgsz, self.imgsz, 3), 114, np.uint8)
+        self._tensor = np.empty((1, 3, self.imgsz, self.imgsz), np.float32)
+
+    def _executar(self, tensor):
+        raise NotImplementedError
+
+    def _reservar(self, n):
+        """Tensor de entrada para um lote de n frames (cresce só quando precisa)"""
+        if len(self._tensor) < n:
+            self._tensor = np.empty((n, 3, self.imgsz, self.imgsz), np.float32)
+        return self._tensor[:n]
+
+    def preparar(self, frame, destino=None):
+        """Letterbox em destino (3, imgsz, imgsz; padrão: posição 0 do lote); retorna (escala, pad_x, pad_y)"""
+        destino = self._tensor[0] if destino is None else destino
+        h, w = frame.shape[:2]
+        r = min(self.imgsz / h, self.imgsz / w)
+        nw, nh = int(round(w * r)), int(round(h * r))
+        px, py = (self.imgsz - nw) // 2, (self.imgsz - nh) // 2
+
+        self._canvas[:] = 114
+        cv2.resize(frame, (nw, nh), dst=self._canvas[py:py + nh, px:px + nw], interpolation=cv2.INTER_LINEAR)
+
+        # HWC BGR uint8 → CHW RGB float [0, 1]
+        for c in range(3):
+            np.multiply(self._canvas[:, :, 2 - c], 1 / 255, out=destino[c], casting='unsafe')
+        return r, px, py
+
+    def decodificar(self, pred, r, px, py):
+        """Saída YOLOv8 de um frame (4 + classes, N) → Deteccoes da classe pessoa"""
+        conf = pred[4]
+        manter = conf >= self.confianca
+        if not manter.any():
+            return VAZIO
+
+        cx, cy, bw, bh = pred[:4, manter]
+        conf = conf[manter]
+        xyxy = np.stack([cx - bw / 2, cy - bh / 2, cx + bw / 2, cy + bh / 2], axis=1)
+
+        xywh = np.stack([xyxy[:, 0], xyxy[:, 1], bw, bh], axis=1)
+        indices = cv2.dnn.NMSBoxes(xywh.tolist(), conf.tolist(), self.confianca, self.iou)
+        indices = np.asarray(indices, np.int64).reshape(-1)
+
+        # Desfazer o letterbox
+        xyxy = xyxy[indices]
+        xyxy[:, [0, 2]] -= px
+        xyxy[:, [1, 3]] -= py
+        xyxy /= r
+        return Deteccoes(xyxy.astype(np.float32), conf[indices].astype(np.float32))
+
+    def detectar(self, frames):
+        passo = max(self.lote_maximo or len(frames), 1)
+        saida = []
+        for inicio in range(0, len(frames), passo):
+            lote = frames[inicio:inicio + passo]
+            tensor = self._reservar(self.lote_maximo or len(lote))  # lote fixo: sobras ignoradas
+            escalas = [self.preparar(frame, tensor[i]) for i, frame in enumerate(lote)]
+            resultado = self._executar(tensor)
+            saida.extend(self.decodificar(resultado[i], *escala) for i, escala in enumerate(escalas))
+        return saida
+
+
+class BackendONNX(BackendExportado):
+    """ONNX Runtime na CPU"""
+
+    nome = 'onnx'
+
+    def __init__(self, caminho, **kwargs):
+        super().__init__(**kwargs)
+        import onnxruntime as ort
+
+        # Grafo otimizado em cache: nas próximas partidas carrega sem reotimizar.
+        # Fica no DIRETORIO_CACHE (o diretório do modelo pode ser só leitura),
+        # indexado pelo hash do .onnx e pela versão do runtime: trocar um dos dois
+        # gera outro arquivo em vez de reaproveitar um grafo velho
+        nome = os.path.splitext(os.path.basename(caminho))[0]
+        otimizado = os.path.join(DIRETORIO_CACHE, 'onnx',
+                                 f"{nome}_{_chave_modelo(caminho)}_ort{ort.__version__}.otimizado.onnx")
+        os.makedirs(os.path.dirname(otimizado), exist_ok=True)
+        opcoes = ort.SessionOptions()
+        if os.path.exists(otimizado):
+            caminho = otimizado
+            opcoes.graph_optimization_level = ort.GraphOptimizationLevel.ORT_DISABLE_ALL
+        else:
+            opcoes.graph_optimization_level = ort.GraphOptimizationLevel.ORT_ENABLE_ALL
+            opcoes.optimized_model_filepath = otimizado
+        if self.threads:
+            opcoes.intra_op_num_threads = self.threads
+            opcoes.inter_op_num_threads = 1
+
+        self.sessao = ort.InferenceSession(caminho, opcoes, providers=['CPUExecutionProvider'])
+        self.entrada = self.sessao.get_inputs()[0].name
+        lote = self.sessao.get_inputs()[0].shape[0]
+        self.lote_maximo = lote if isinstance(lote, int) else None  # nome simbólico = dinâmico
+
+    def _executar(self, tensor):
+        return self.sessao.run(None, {self.entrada: tensor})[0]
+
+
+class BackendOpenVINO(BackendExportado):
+    """OpenVINO Runtime na CPU (modelo .xml)"""
+
+    nome = 'openvino'
+
+    def __init__(self, caminho, **kwargs):
+        super().__init__(**kwargs)
+        import openvino as ov
+
+        config = {'PERFORMANCE_HINT': 'LATENCY'}
+        if self.threads:
+            config['INFERENCE_NUM_THREADS'] = self.threads
+
+        core = ov.Core()
+        core.set_property({'CACHE_DIR': os.path.join(DIRETORIO_CACHE, 'openvino')})  # blob compilado
+        modelo = core.read_model(caminho)
+        if modelo.input(0).get_partial_shape().is_dynamic:
+            modelo.reshape([-1, 3, self.imgsz, self.imgsz])  # lote dinâmico, resolução fixa
+        self.compilado = core.compile_model(modelo, 'CPU', config)
+        lote = self.compilado.input(0).get_partial_shape()[0]
+        self.lote_maximo = None if lote.is_dynamic else lote.get_length()
+        self.requisicao = self.compilado.create_infer_request()
+        self.saida = self.compilado.output(0)
+
+    def _executar(self, tensor):
+        return self.requisicao.infer([tensor])[self.saida]
+
+
+# ====== EXPORTAÇÃO E CALIBRAÇÃO INT8 ======
+
+def frames_calibracao(fonte, quantidade=200):
+    """Frames de calibração de um vídeo gravado ou de um diretório de imagens"""
+    if os.path.isdir(fonte):
+        arquivos = sorted(f for ext in ('jpg', 'jpeg', 'png', 'bmp')
+                          for f in glob.glob(os.path.join(fonte, f'*.{ext}')))
+        passo = max(1, len(arquivos) // quantidade)
+        return [cv2.imread(f) for f in arquivos[::passo][:quantidade]]
+
+    cap = cv2.VideoCapture(fonte)
+    total = int(cap.get(cv2.CAP_PROP_FRAME_COUNT)) or quantidade
+    passo = max(1, total // quantidade)
+    frames = []
+    k = 0
+    while len(frames) < quantidade:
+        ret = cap.grab()
+        if not ret:
+            break
+        if k % passo == 0:
+            frames.append(cap.retrieve()[1])
+        k += 1
+    cap.release()
+    return frames
+
+
+def _tensores_calibracao(frames, imgsz):
+    """Mesmo pré-processamento do runtime (letterbox) para a calibração"""
+    prep = BackendExportado(imgsz=imgsz)
+    for frame in frames:
+        prep.preparar(frame)
+        yield prep._tensor[:1].copy()
+
+
+def _quantizar_onnx(caminho, destino, frames, imgsz):
+    from onnxruntime.quantization import (CalibrationDataReader, QuantFormat,
+                                          QuantType, quantize_static)
+    import onnxruntime as ort
+
+    entrada = ort.InferenceSession(caminho, providers=['CPUExecutionProvider']).get_inputs()[0].name
+
+    class Leitor(CalibrationDataReader):
+        def __init__(self):
+            self.tensores = _tensores_calibracao(frames, imgsz)
+
+        def get_next(self):
+            tensor = next(self.tensores, None)
+            return None if tensor is None else {entrada: tensor}
+
+    quantize_static(caminho, destino, Leitor(), quant_format=QuantFormat.QDQ,
+                    activation_type=QuantType.QUInt8, weight_type=QuantType.QInt8,
+                    per_channel=True)
+
+
+def _quantizar_openvino(caminho, destino, frames, imgsz):
+    import nncf
+    import openvino as ov
+
+    modelo = ov.Core().read_model(caminho)
+    dados = nncf.Dataset(list(_tensores_calibracao(frames, imgsz)))
+    quantizado = nncf.quantize(modelo, dados, preset=nncf.QuantizationPreset.MIXED,
+                               subset_size=len(frames))
+    ov.save_model(quantizado, destino)
+
+
+def _chave_modelo(modelo):
+    """Hash dos pesos: trocar o .pt invalida o cache"""
+    h = hashlib.sha1()
+    with open(modelo, 'rb') as f:
+        for bloco in iter(lambda: f.read(1 << 20), b''):
+            h.update(bloco)
+    return h.hexdigest()[:12]
+
+
+def exportar_modelo(modelo='yolov8n.pt', formato='onnx', imgsz=640, int8=False, calibracao=None):
+    """Exportar o .pt para ONNX/OpenVINO com resolução fixa; INT8 opcional
+
+    O eixo de lote é dinâmico: várias câmeras ou ladrilhos vão numa única
+    execução. O resultado fica em DIRETORIO_CACHE, indexado pelo hash dos
+    pesos e pelo tamanho de entrada, e é reaproveitado nas partidas
+    seguintes. Para INT8 a calibração estática usa frames gravados da
+    própria câmera (`calibracao`: vídeo ou diretório de imagens), não o
+    dataset COCO.
+    """
+    nome = os.path.splitext(os.path.basename(modelo))[0]
+    if not os.path.exists(modelo):
+        # Pesos ainda não baixados (ex.: yolov8n.pt): baixar antes, para o hash
+        # ser sempre o do arquivo que vai ser exportado
+        from ultralytics.utils.downloads import attempt_download_asset
+
+        modelo = str(attempt_download_asset(modelo))
+    chave = _chave_modelo(modelo)
+    base = os.path.join(DIRETORIO_CACHE, f"{nome}_{chave}_{imgsz}_lote")  # _lote: eixo de lote dinâmico
+
+    if formato == 'onnx':
+        caminho = f"{base}.onnx"
+        caminho_int8 = f"{base}_int8.onnx"
+    else:
+        caminho = os.path.join(f"{base}_openvino_model", f"{nome}.xml")
+        caminho_int8 = os.path.join(f"{base}_openvino_model", f"{nome}_int8.xml")
+
+    if not os.path.exists(caminho):
+        from ultralytics import YOLO
+
+        log.info(f"📦 Exportando {modelo} → {formato} ({imgsz}x{imgsz})...")
+        os.makedirs(DIRETORIO_CACHE, exist_ok=True)
+        exportado = YOLO(modelo).export(format=formato, imgsz=imgsz, dynamic=True,
+                                        half=False, verbose=False)
+        if formato == 'onnx':
+            os.replace(exportado, caminho)
+        else:
+            os.replace(exportado, os.path.dirname(caminho))
+    else:
+        log.info(f"📦 Modelo exportado em cache: {caminho}")
+
+    if not int8:
+        return caminho
+    if os.path.exists(caminho_int8):
+        return caminho_int8
+    if not calibracao:
+        raise ValueError("INT8 requer frames de calibração (vídeo ou diretório de imagens)")
+
+    frames = frames_calibracao(calibracao)
+    log.info(f"🎯 Calibrando INT8 com {len(frames)} frames de {calibracao}...")
+    if formato == 'onnx':
+        _quantizar_onnx(caminho, caminho_int8, frames, imgsz)
+    else:
+        _quantizar_openvino(caminho, caminho_int8, frames, imgsz)
+    return caminho_int8
+
+
+BACKENDS = ('ultralytics', 'onnx', 'openvino')
+
+
+def criar_backend(tipo='ultralytics', modelo='yolov8n.pt', imgsz=640, threads=None,
+                  int8=False, calibracao=None):
+    """Criar o backend pedido, exportando o modelo se necessário"""
+    if tipo == 'ultralytics':
+        return BackendUltralytics(modelo, imgsz=imgsz, threads=threads)
+
+    if tipo not in BACKENDS:
+        raise ValueError(f"backend desconhecido: {tipo}")
+
+    caminho = modelo
+    if modelo.endswith('.pt'):
+        caminho = exportar_modelo(modelo, tipo, imgsz, int8, calibracao)
+
+    if tipo == 'onnx':
+        return BackendONNX(caminho, imgsz=imgsz, threads=threads)
+    return BackendOpenVINO(caminho, imgsz=imgsz, threads=threads)
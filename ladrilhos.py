@@ -0,0 +1,174 @@
+import numpy as np
+
+from inferencia import VAZIO, Deteccoes
+from telemetria import TELEMETRIA
+
+MODOS_LADRILHOS = ('auto', 'completo')
+
+
+def grade_ladrilhos(regiao, tamanho, sobreposicao=0.2):
+    """Ladrilhos (x0, y0, x1, y1) de até tamanho x tamanho px cobrindo a região, com sobreposição"""
+    x0, y0, x1, y1 = regiao
+    passo = max(1, int(tamanho * (1 - sobreposicao)))
+
+    def inicios(a, b):
+        if b - a <= tamanho:
+            return [a]
+        n = int(np.ceil((b - a - tamanho) / passo)) + 1
+        return np.linspace(a, b - tamanho, n).round().astype(int).tolist()  # último encostado na borda
+
+    return np.array([(x, y, min(x + tamanho, x1), min(y + tamanho, y1))
+                     for y in inicios(y0, y1) for x in inicios(x0, x1)], np.int32).reshape(-1, 4)
+
+
+def fundir_deteccoes(xyxy, conf, cortadas, iou=0.5, ios=0.8):
+    """NMS entre ladrilhos: índices das caixas mantidas
+
+    Duas caixas são a mesma pessoa com IoU >= iou, ou quando uma delas
+    encosta na borda interna de um ladrilho (pessoa cortada) e a menor fica
+    >= ios dentro da outra. Caixas inteiras vencem as cortadas; entre
+    inteiras, a de maior confiança.
+    """
+    ordem = np.lexsort((-conf, cortadas))
+    caixas = xyxy[ordem].astype(np.float32)
+    cortadas = cortadas[ordem]
+
+    area = (caixas[:, 2] - caixas[:, 0]) * (caixas[:, 3] - caixas[:, 1])
+    largura = np.minimum(caixas[:, None, 2], caixas[None, :, 2]) - np.maximum(caixas[:, None, 0], caixas[None, :, 0])
+    altura = np.minimum(caixas[:, None, 3], caixas[None, :, 3]) - np.maximum(caixas[:, None, 1], caixas[None, :, 1])
+    intersecao = np.clip(largura, 0, None) * np.clip(altura, 0, None)
+    uniao = area[:, None] + area[None, :] - intersecao
+    menor = np.minimum(area[:, None], area[None, :])
+    mesma = intersecao >= iou * np.maximum(uniao, 1e-6)
+    mesma |= (intersecao >= ios * np.maximum(menor, 1e-6)) & (cortadas[:, None] | cortadas[None, :])
+
+    manter = np.ones(len(caixas), bool)
+    for i in range(len(caixas)):
+        if manter[i]:
+            manter[i + 1:] &= ~mesma[i, i + 1:]
+    return ordem[manter]
+
+
+class InferenciaLadrilhada:
+    """Passada grossa + ladrilhos finos num único lote do YOLO
+
+    A passada grossa é a de sempre: recorte do frame de inferência reduzido
+    para imgsz, onde pessoas distantes ficam com poucos pixels. Os
+    ladrilhos vêm do frame exibido em resolução cheia, com tamanho x
+    tamanho px (1:1 com a entrada do modelo quando tamanho = imgsz), e vão
+    na mesma chamada detectar() que a passada grossa, que todos os backends
+    rodam como um único lote (os exportados em fatias, se o modelo tiver
+    lote fixo). O lote economiza chamadas, não computação: o custo cresce
+    com o número de entradas.
+
+    modo 'completo': todos os ladrilhos em toda inferência.
+    modo 'auto': só os ladrilhos onde há trilhas pequenas demais para a
+    passada grossa (altura < altura_minima px na entrada do modelo) mais
+    `varredura` ladrilhos por inferência em rodízio, para achar quem entra
+    longe. Sem ninguém longe o custo é a passada grossa + a varredura.
+
+    As caixas dos ladrilhos são fundidas com as da passada grossa
+    (fundir_deteccoes) e voltam nas coordenadas da entrada grossa, como se
+    viessem só dela.
+    """
+
+    def __init__(self, modo='auto', tamanho=640, sobreposicao=0.2, altura_minima=32, varredura=1,
+                 iou=0.5, ios=0.8):
+        if modo not in MODOS_LADRILHOS:
+            raise ValueError(f"modo de ladrilhos desconhecido: {modo}")
+        self.modo = modo
+        self.tamanho = tamanho
+        self.sobreposicao = sobreposicao
+        self.altura_minima = altura_minima  # px na entrada do modelo
+        self.varredura = varredura  # ladrilhos extras por inferência (modo auto)
+        self.iou = iou
+        self.ios = ios
+
+        self.ladrilhos = np.empty((0, 4), np.int32)
+        self.regiao = None
+        self.fator_escala = 1.0
+        self.origem = (0, 0)  # canto do recorte no frame de inferência
+        self.escala_grossa = 1.0  # px da entrada do modelo por px do frame exibido
+        self._proximo = 0
+
+    def preparar(self, shape_frame, fator_escala, recorte, imgsz):
+        """Grade de ladrilhos sobre o recorte (ou o frame todo), em coordenadas do frame exibido"""
+        h, w = shape_frame[:2]
+        self.fator_escala = fator_escala
+        if recorte is None:
+            self.origem = (0, 0)
+            self.regiao = (0, 0, w, h)
+        else:
+            x0, y0, x1, y1 = recorte
+            self.origem = (x0, y0)
+            self.regiao = (int(x0 * fator_escala), int(y0 * fator_escala),
+                           min(w, int(x1 * fator_escala)), min(h, int(y1 * fator_escala)))
+
+        rx0, ry0, rx1, ry1 = self.regiao
+        self.escala_grossa = min(imgsz / (rx1 - rx0), imgsz / (ry1 - ry0))
+        self.ladrilhos = grade_ladrilhos(self.regiao, self.tamanho, self.sobreposicao)
+        self._proximo = 0
+        return len(self.ladrilhos)
+
+    def escolher(self, pessoas):
+        """Índices dos ladrilhos desta inferência (pessoas: último resultado, frame exibido)"""
+        n = len(self.ladrilhos)
+        if self.modo == 'completo':
+            return np.arange(n)
+
+        escolhidos = []
+        pequenas = pessoas[pessoas['h'] * self.escala_grossa < self.altura_minima]
+        if len(pequenas):
+            # Ladrilho com o centro mais perto da pessoa (ela fica longe das bordas)
+            centros = (self.ladrilhos[:, :2] + self.ladrilhos[:, 2:]) / 2
+            cx = pequenas['x'] + pequenas['w'] / 2
+            cy = pequenas['y'] + pequenas['h'] / 2
+            distancias = np.hypot(cx[:, None] - centros[None, :, 0], cy[:, None] - centros[None, :, 1])
+            escolhidos.extend(np.unique(distancias.argmin(axis=1)).tolist())
+
+        for _ in range(min(self.varredura, n)):
+            escolhidos.append(self._proximo)
+            self._proximo = (self._proximo + 1) % n
+        return np.unique(np.asarray(escolhidos, np.int64))
+
+    def detectar(self, modelo, frame_grosso, frame_alta, pessoas):
+        """Passada grossa + ladrilhos escolhidos numa chamada; Deteccoes na entrada grossa
+
+        frame_alta: frame exibido em resolução cheia (None = só a passada grossa).
+        """
+        indices = self.escolher(pessoas) if frame_alta is not None and len(self.ladrilhos) else []
+        if len(indices) == 0:
+            return modelo.detectar([frame_grosso])[0]
+
+        ladrilhos = self.ladrilhos[indices]
+        entradas = [frame_grosso] + [frame_alta[y0:y1, x0:x1] for x0, y0, x1, y1 in ladrilhos]
+        resultados = modelo.detectar(entradas)  # views, sem cópia
+        TELEMETRIA.contar('ladrilhos_inferidos', len(ladrilhos))
+
+        # Tudo para o frame exibido; marcar caixas cortadas nas bordas internas
+        ox, oy = self.origem
+        f = self.fator_escala
+        grosso = resultados[0]
+        caixas = [(grosso.xyxy + np.float32((ox, oy, ox, oy))) * f]
+        confiancas = [grosso.conf]
+        cortadas = [np.zeros(len(grosso), bool)]
+        rx0, ry0, rx1, ry1 = self.regiao
+        for (x0, y0, x1, y1), deteccoes in zip(ladrilhos, resultados[1:]):
+            if not len(deteccoes):
+                continue
+            xyxy = deteccoes.xyxy + np.float32((x0, y0, x0, y0))
+            borda = (((xyxy[:, 0] <= x0 + 2) & (x0 > rx0)) | ((xyxy[:, 2] >= x1 - 2) & (x1 < rx1)) |
+                     ((xyxy[:, 1] <= y0 + 2) & (y0 > ry0)) | ((xyxy[:, 3] >= y1 - 2) & (y1 < ry1)))
+            caixas.append(xyxy)
+            confiancas.append(deteccoes.conf)
+            cortadas.append(borda)
+
+        xyxy = np.concatenate(caixas)
+        if not len(xyxy):
+            return VAZIO
+        conf = np.concatenate(confiancas)
+        manter = fundir_deteccoes(xyxy, conf, np.concatenate(cortadas), self.iou, self.ios)
+
+        # De volta às coordenadas da entrada grossa (o detector soma o recorte e escala)
+        xyxy = xyxy[manter] / f - np.float32((ox, oy, ox, oy))
+        return Deteccoes(xyxy.astype(np.float32), conf[manter].astype(np.float32))
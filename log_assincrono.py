@@ -0,0 +1,50 @@
+import atexit
+import logging
+import logging.handlers
+import sys
+from queue import Full, Queue
+
+from telemetria import TELEMETRIA
+
+FORMATO_CONSOLE = '%(message)s'
+FORMATO_ARQUIVO = '%(asctime)s %(levelname)s %(processName)s %(name)s: %(message)s'
+
+
+class HandlerFilaSemBloqueio(logging.handlers.QueueHandler):
+    """QueueHandler que nunca bloqueia: com a fila cheia o registro é descartado e contado"""
+
+    def enqueue(self, record):
+        try:
+            self.queue.put_nowait(record)
+        except Full:
+            TELEMETRIA.contar('logs_descartados')
+
+
+def configurar_log(nivel=logging.INFO, arquivo=None, tamanho_fila=10000):
+    """Todo log do processo passa por uma fila; uma thread própria escreve no console/arquivo
+
+    Quem loga (laço de captura, thread do YOLO, escritor do PLC) só faz um
+    put_nowait: stdout lento, terminal pausado ou disco cheio não travam o
+    laço. Retorna o QueueListener (parado automaticamente na saída).
+    """
+    console = logging.StreamHandler(sys.stdout)
+    console.setFormatter(logging.Formatter(FORMATO_CONSOLE))
+    destinos = [console]
+    if arquivo:
+        disco = logging.handlers.RotatingFileHandler(arquivo, maxBytes=10 * 1024 * 1024, backupCount=5,
+                                                     encoding='utf-8')
+        disco.setFormatter(logging.Formatter(FORMATO_ARQUIVO))
+        destinos.append(disco)
+
+    fila = Queue(tamanho_fila)
+    raiz = logging.getLogger()
+    for handler in raiz.handlers[:]:
+        raiz.removeHandler(handler)
+    raiz.addHandler(HandlerFilaSemBloqueio(fila))
+    raiz.setLevel(nivel)
+    logging.getLogger('snap7').setLevel(logging.WARNING)  # conexões do cliente/servidor snap7
+
+    ouvinte = logging.handlers.QueueListener(fila, *destinos, respect_handler_level=True)
+    ouvinte.start()
+    atexit.register(ouvinte.stop)  # esvazia a fila antes de sair
+    return ouvinte
@@ -0,0 +1,168 @@
+import json
+import logging
+import sys
+import threading
+import time
+
+from calibracao import carregar_calibracao
+from captura import CapturaFrames
+from detector_pessoas import DetectorPessoasInteligente
+from log_assincrono import configurar_log
+from plc_db17 import layout_db17
+from plc_io import EscritorPLC
+from politica_plc import POLITICA_PADRAO
+from roi import carregar_zonas
+
+log = logging.getLogger(__name__)
+
+
+class MotorMultiCamera:
+    """N câmeras → um único modelo YOLO com inferência em lote
+
+    Cada câmera tem seu próprio DetectorPessoasInteligente (área, estado de
+    rastreamento e canal DB/offset no PLC), mas todas compartilham o modelo,
+    a conexão com o PLC e uma única chamada yolo_model.detectar([...]) por ciclo.
+    """
+
+    def __init__(self, cameras, plc_ip, plc_rack=0, plc_slot=1):
+        self.escritor_plc = EscritorPLC(plc_ip, plc_rack, plc_slot, db_number=None, politica=POLITICA_PADRAO)
+        self.aviso = threading.Event()
+        self.ativo = True
+        self.yolo_model = None
+
+        self.detectores = []
+        self.capturas = []
+        for camera in cameras:
+            zonas = carregar_zonas(camera['zonas']) if camera.get('zonas') else None
+            layout = layout_db17(zonas=zonas.reportadas if zonas else ())
+            canal = self.escritor_plc.adicionar_canal(camera['db_number'], camera.get('offset', 0), layout)
+            detector = DetectorPessoasInteligente(camera['rtsp_url'], canal_plc=canal)
+            detector.zonas = zonas
+            if camera.get('calibracao_chao'):
+                detector.calibracao_chao = carregar_calibracao(camera['calibracao_chao'])
+            self.detectores.append(detector)
+            self.capturas.append(CapturaFrames(camera['rtsp_url'], camera.get('fator_inferencia', 0.5),
+                                               aviso=self.aviso))
+
+        self.ultima_sequencia = [0] * len(self.capturas)
+        self.buffers = []  # entrada do YOLO por câmera, alocada ao abrir
+
+    def carregar_yolo(self):
+        """Carregar o modelo uma vez e compartilhar entre as câmeras"""
+        if not self.detectores[0].carregar_yolo():
+            return False
+
+        self.yolo_model = self.detectores[0].yolo_model
+        for detector in self.detectores:
+            detector.yolo_model = self.yolo_model
+        return True
+
+    def abrir_cameras(self):
+        """Abrir as capturas, alocar buffers e definir a área de cada câmera"""
+        for captura, detector in zip(self.capturas, self.detectores):
+            if not captura.iniciar():
+                log.error(f"❌ Falha abrindo câmera {captura.fonte}")
+                return False
+
+            frame = captura.novo_buffer()
+            captura.copiar(frame)
+            detector.fator_escala = captura.fator_escala
+            detector.definir_area(frame)
+            self.buffers.append(captura.novo_buffer_inferencia())
+        return True
+
+    def coletar_lote(self):
+        """Frames novos desde o último ciclo: [(indice, frame, tempo, relogio)]"""
+        lote = []
+        for i, captura in enumerate(self.capturas):
+            if captura.sequencia == self.ultima_sequencia[i]:
+                continue
+
+            sequencia, tempo, relogio = captura.copiar(destino_inferencia=self.buffers[i])
+            self.ultima_sequencia[i] = sequencia
+
+            detector = self.detectores[i]
+            frame = detector.recortar(self.buffers[i])
+            if detector.pular_inferencia(frame, tempo):
+                # Área parada e vazia: mantém o último resultado da câmera
+                detector.atualizar_resultado(detector.pessoas_detectadas, tempo, relogio)
+                continue
+
+            lote.append((i, frame, tempo, relogio))
+        return lote
+
+    def executar(self):
+        """Loop de inferência em lote (sem janela)"""
+        log.info(f"🚀 MULTI-CÂMERA - {len(self.capturas)} streams, 1 modelo")
+
+        self.escritor_plc.iniciar()
+        if not self.abrir_cameras():
+            for captura in self.capturas:
+                captura.parar()
+            self.escritor_plc.parar()
+            return
+
+        ciclos = 0
+        frames = 0
+        tempo_log = time.time()
+
+        try:
+            while self.ativo:
+                self.aviso.wait(0.5)
+                self.aviso.clear()
+
+                lote = self.coletar_lote()
+                if not lote:
+                    continue
+
+                # Uma única chamada para todas as câmeras com frame novo
+                resultados = self.yolo_model.detectar([frame for _, frame, _, _ in lote])
+
+                # Demultiplexar: cada resultado volta para sua câmera
+                for (i, _, tempo, relogio), deteccoes in zip(lote, resultados):
+                    detector = self.detectores[i]
+                    detector.atualizar_resultado(detector.processar_resultado(deteccoes, tempo), tempo, relogio)
+
+                ciclos += 1
+                frames += len(lote)
+
+                agora = time.time()
+                if agora - tempo_log >= 3:
+                    log.info(f"Lotes/s: {ciclos / (agora - tempo_log):.1f} | "
+                          f"Frames/s: {frames / (agora - tempo_log):.1f} | "
+                          f"PLC: {'✅' if self.escritor_plc.conectado else '❌'}")
+                    for i, detector in enumerate(self.detectores):
+                        log.info(f"  Cam{i+1} DB{detector.db_number}: {len(detector.pessoas_detectadas)} pessoas")
+                    ciclos = frames = 0
+                    tempo_log = agora
+        finally:
+            for captura in self.capturas:
+                captura.parar()
+            self.escritor_plc.parar()
+
+
+def main():
+    if len(sys.argv) < 2:
+        print("Uso: python multi_camera.py cameras.json")
+        return
+
+    configurar_log()
+    with open(sys.argv[1], encoding='utf-8') as f:
+        config = json.load(f)
+
+    plc = config.get('plc', {})
+    motor = MotorMultiCamera(
+        config['cameras'],
+        plc.get('ip', '192.168.0.33'), plc.get('rack', 0), plc.get('slot', 1)
+    )
+
+    if not motor.carregar_yolo():
+        return
+
+    try:
+        motor.executar()
+    except KeyboardInterrupt:
+        log.info("Interrompido")
+
+if __name__ == "__main__":
+    main()
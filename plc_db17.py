@@ -0,0 +1,272 @@
+import struct
+
+import numpy as np
+
+# ====== LAYOUT DO DATA BLOCK ======
+# Cada campo: (nome, tipo S7, byte, bit). Valores S7 são big endian.
+CAMPOS_DB17 = (
+    ('pessoa_detectada', 'BOOL', 0, 0),       # DB17.DBX0.0
+    ('quantidade_pessoas', 'INT', 2, 0),      # DB17.DBW2
+    ('distancia_minima', 'REAL', 4, 0),       # DB17.DBD4
+    ('velocidade_maxima', 'REAL', 8, 0),      # DB17.DBD8
+    ('timestamp_unix', 'DINT', 12, 0),        # DB17.DBD12
+    ('sistema_funcionando', 'BOOL', 16, 0),   # DB17.DBX16.0
+)
+
+# Área opcional de telemetria logo após o DB17 padrão (o DB no PLC precisa ter >= 22 bytes)
+CAMPOS_DB17_TELEMETRIA = CAMPOS_DB17 + (
+    ('latencia_deteccao_ms', 'INT', 18, 0),   # DB17.DBW18 - câmera → resultado
+    ('inferencia_ms', 'INT', 20, 0),          # DB17.DBW20 - tempo médio do YOLO
+)
+
+# Array opcional de pessoas rastreadas: registros de tamanho fixo a partir do DB17.DBB24
+# (depois da área de telemetria). Cada registro: (campo, tipo S7, byte relativo, bit).
+CAMPOS_PESSOA = (
+    ('id', 'DINT', 0, 0),            # ID da trilha (0 = posição livre)
+    ('distancia', 'REAL', 4, 0),     # cm (0 = desconhecida)
+    ('velocidade', 'REAL', 8, 0),    # km/h
+    ('x', 'INT', 12, 0),             # caixa no frame exibido (px)
+    ('y', 'INT', 14, 0),
+    ('w', 'INT', 16, 0),
+    ('h', 'INT', 18, 0),
+    ('zona', 'INT', 20, 0),          # rótulo da zona (1 = área central sem arquivo de zonas)
+    ('idade_ms', 'DINT', 22, 0),     # tempo desde o início da trilha
+)
+OFFSET_PESSOAS = 24
+TAMANHO_PESSOA = 26
+
+# Registro de uma zona monitorada (roi.ZonasMonitoradas), no offset definido no arquivo de zonas
+CAMPOS_ZONA = (
+    ('ocupada', 'BOOL', 0, 0),
+    ('quantidade', 'INT', 2, 0),
+    ('distancia_minima', 'REAL', 4, 0),  # cm (0 = vazia ou desconhecida)
+)
+TAMANHO_ZONA = 8
+
+TIPOS_S7 = {
+    'BOOL': None,
+    'BYTE': struct.Struct('>B'),
+    'INT': struct.Struct('>h'),
+    'DINT': struct.Struct('>l'),
+    'REAL': struct.Struct('>f'),
+}
+
+
+class LayoutDB:
+    """Descritor de layout de um Data Block (offset/tipo por campo)"""
+
+    def __init__(self, campos):
+        self.campos = {}
+        self.tamanho = 0
+        bits_usados = {}  # byte → bits já ocupados
+
+        for nome, tipo, byte, bit in campos:
+            if tipo not in TIPOS_S7:
+                raise ValueError(f"Tipo S7 desconhecido: {tipo}")
+
+            formato = TIPOS_S7[tipo]
+            tamanho = 1 if formato is None else formato.size
+            bits = {bit} if formato is None else set(range(8))
+            for b in range(byte, byte + tamanho):
+                if bits_usados.get(b, set()) & bits:
+                    raise ValueError(f"Campo {nome} sobrepõe outro campo no byte {b}")
+                bits_usados[b] = bits_usados.get(b, set()) | bits
+            self.campos[nome] = (tipo, byte, bit, formato)
+            self.tamanho = max(self.tamanho, byte + tamanho)
+
+    def offset(self, nome):
+        """Offset em bytes de um campo"""
+        return self.campos[nome][1]
+
+    def mascara(self, nomes):
+        """Bits ocupados pelos campos `nomes`, por byte da imagem (uint8)"""
+        mascara = np.zeros(self.tamanho, np.uint8)
+        for nome in nomes:
+            tipo, byte, bit, formato = self.campos[nome]
+            if formato is None:
+                mascara[byte] |= 1 << bit
+            else:
+                mascara[byte:byte + formato.size] = 0xFF
+        return mascara
+
+
+LAYOUT_DB17 = LayoutDB(CAMPOS_DB17)
+LAYOUT_DB17_TELEMETRIA = LayoutDB(CAMPOS_DB17_TELEMETRIA)
+
+
+def campos_pessoas(capacidade, inicio=OFFSET_PESSOAS):
+    """Campos achatados do array de pessoas: pessoa{i}_{campo}"""
+    campos = []
+    for i in range(capacidade):
+        base = inicio + i * TAMANHO_PESSOA
+        for nome, tipo, byte, bit in CAMPOS_PESSOA:
+            campos.append((f'pessoa{i}_{nome}', tipo, base + byte, bit))
+    return tuple(campos)
+
+
+def campos_zonas(zonas):
+    """Campos das zonas reportadas [(rótulo, offset)]: zona{rótulo}_{campo}"""
+    campos = []
+    for rotulo, inicio in zonas:
+        for nome, tipo, byte, bit in CAMPOS_ZONA:
+            campos.append((f'zona{rotulo}_{nome}', tipo, inicio + byte, bit))
+    return tuple(campos)
+
+
+def layout_db17(telemetria=False, pessoas=0, zonas=()):
+    """Layout do DB17: padrão, + telemetria, + array de `pessoas` registros, + zonas
+
+    Com o array, o DB no PLC precisa ter 24 + 26 * pessoas bytes; as zonas
+    [(rótulo, offset)] ficam onde o arquivo de zonas mandar, sem sobrepor
+    os campos padrão nem o array (offset >= 24 + 26 * pessoas).
+    """
+    campos = CAMPOS_DB17_TELEMETRIA if telemetria else CAMPOS_DB17
+    if not pessoas and not zonas:
+        return LAYOUT_DB17_TELEMETRIA if telemetria else LAYOUT_DB17
+    fim_pessoas = OFFSET_PESSOAS + TAMANHO_PESSOA * pessoas
+    for rotulo, inicio in zonas:
+        if pessoas and inicio < fim_pessoas and inicio + TAMANHO_ZONA > OFFSET_PESSOAS:
+            raise ValueError(f"Zona {rotulo} (offset {inicio}) sobrepõe o array de {pessoas} pessoas "
+                             f"(bytes {OFFSET_PESSOAS}..{fim_pessoas - 1}); use offset >= {fim_pessoas}")
+    return LayoutDB(campos + campos_pessoas(pessoas) + campos_zonas(zonas))
+
+
+def capacidade_pessoas(layout):
+    """Quantos registros de pessoa o layout tem (0 = sem array)"""
+    return sum(1 for nome in layout.campos if nome.startswith('pessoa') and nome.endswith('_id'))
+
+
+class ArrayPessoasDB:
+    """Pessoas rastreadas (PESSOA_DTYPE) → campos do array de pessoas do DB
+
+    Cada ID de trilha fica na mesma posição enquanto continuar no array,
+    então só os registros que mudaram sujam a imagem. Com mais pessoas que
+    posições ficam as mais próximas; posições livres vão a zero (id = 0).
+    """
+
+    def __init__(self, capacidade):
+        self.capacidade = capacidade
+        self.posicoes = {}  # ID da trilha → índice no array
+
+    def valores(self, pessoas):
+        """Dict pessoa{i}_{campo} → valor para todas as posições"""
+        distancias = np.where(pessoas['distancia'] > 0, pessoas['distancia'], np.inf)
+        pessoas = pessoas[np.argsort(distancias, kind='stable')[:self.capacidade]]
+        ids = [int(i) for i in pessoas['id']]
+
+        self.posicoes = {i: p for i, p in self.posicoes.items() if i in ids}
+        livres = sorted(set(range(self.capacidade)) - set(self.posicoes.values()))
+        for i in ids:
+            if i not in self.posicoes:
+                self.posicoes[i] = livres.pop(0)
+
+        caixas = np.clip(np.stack((pessoas['x'], pessoas['y'], pessoas['w'], pessoas['h']), axis=1), 0, 32767)
+        registros = [dict.fromkeys((nome for nome, _, _, _ in CAMPOS_PESSOA), 0)
+                     for _ in range(self.capacidade)]
+        for k, i in enumerate(ids):
+            registro = registros[self.posicoes[i]]
+            registro['id'] = i
+            registro['distancia'] = float(pessoas['distancia'][k])
+            registro['velocidade'] = float(pessoas['velocidade'][k])
+            registro['x'], registro['y'], registro['w'], registro['h'] = (int(v) for v in caixas[k])
+            registro['zona'] = int(pessoas['zona'][k])
+            registro['idade_ms'] = int(pessoas['idade'][k] * 1000)
+
+        return {f'pessoa{posicao}_{nome}': valor
+                for posicao, registro in enumerate(registros)
+                for nome, valor in registro.items()}
+
+
+class EmpacotadorDB:
+    """Monta a imagem completa do DB num bytearray pré-alocado
+
+    Cada definir() que muda bytes da imagem marca a faixa como suja; a
+    escrita incremental envia só as faixas sujas, fundidas em poucos
+    db_write contíguos.
+    """
+
+    def __init__(self, layout=LAYOUT_DB17):
+        self.layout = layout
+        self.imagem = bytearray(layout.tamanho)
+        self.sujas = []  # faixas (início, fim) alteradas desde a última escrita
+
+    def definir(self, nome, valor):
+        """Atualizar um campo na imagem local (sem comunicação)"""
+        tipo, byte, bit, formato = self.layout.campos[nome]
+
+        if formato is None:
+            if valor:
+                novo = self.imagem[byte] | (1 << bit)
+            else:
+                novo = self.imagem[byte] & ~(1 << bit) & 0xFF
+            if novo != self.imagem[byte]:
+                self.imagem[byte] = novo
+                self.sujas.append((byte, byte + 1))
+        else:
+            dados = formato.pack(valor)
+            fim = byte + formato.size
+            if self.imagem[byte:fim] != dados:
+                self.imagem[byte:fim] = dados
+                self.sujas.append((byte, fim))
+
+    def ler(self, nome):
+        """Ler um campo da imagem local"""
+        tipo, byte, bit, formato = self.layout.campos[nome]
+
+        if formato is None:
+            return bool(self.imagem[byte] & (1 << bit))
+        return formato.unpack_from(self.imagem, byte)[0]
+
+    def copiar_de(self, origem, proprios):
+        """Copiar a imagem já codificada de outro empacotador (mesmo layout)
+
+        Os bits marcados em `proprios` (ex.: Sistema_Funcionando) continuam
+        os desta imagem. Só as faixas que mudam ficam sujas.
+        """
+        atual = np.frombuffer(self.imagem, np.uint8)
+        novo = np.frombuffer(origem.imagem, np.uint8) & ~proprios
+        novo |= atual & proprios
+        diferentes = np.empty(len(novo) + 2, np.int8)
+        diferentes[0] = diferentes[-1] = 0
+        np.not_equal(novo, atual, out=diferentes[1:-1], casting='unsafe')
+        bordas = np.diff(diferentes)  # 1 = início de faixa, -1 = fim
+        inicios = np.flatnonzero(bordas == 1)
+        if len(inicios) == 0:
+            return
+        atual[:] = novo
+        self.sujas.extend(zip(inicios.tolist(), np.flatnonzero(bordas == -1).tolist()))
+
+    def sincronizar(self, offset, dados):
+        """Copiar bytes lidos do PLC para a imagem local"""
+        self.imagem[offset:offset + len(dados)] = dados
+
+    def faixas_sujas(self, tamanho_maximo):
+        """Faixas sujas fundidas: o mínimo de escritas contíguas de até tamanho_maximo bytes
+
+        Faixas próximas são unidas mesmo com bytes limpos no meio (eles já
+        valem o mesmo no PLC): reenviar alguns bytes custa menos que outro
+        round trip.
+        """
+        faixas = []
+        for inicio, fim in sorted(self.sujas):
+            if faixas and max(fim, faixas[-1][1]) - faixas[-1][0] <= tamanho_maximo:
+                faixas[-1][1] = max(fim, faixas[-1][1])
+            else:
+                faixas.append([inicio, fim])
+        return faixas
+
+    def escrever(self, plc, db_number, offset=0, completo=True, tamanho_maximo=200):
+        """Enviar a imagem ao PLC; retorna o número de db_write
+
+        completo=True: a imagem inteira numa única escrita (conexão, heartbeat).
+        completo=False: só as faixas sujas, cada uma cabendo numa PDU.
+        """
+        if completo:
+            faixas = [(0, len(self.imagem))]
+        else:
+            faixas = self.faixas_sujas(tamanho_maximo)
+        self.sujas = []
+
+        for inicio, fim in faixas:
+            plc.db_write(db_number, offset + inicio, self.imagem[inicio:fim])
+        return len(faixas)
@@ -0,0 +1,429 @@
+import logging
+import threading
+import time
+
+import snap7
+
+from plc_db17 import EmpacotadorDB, LAYOUT_DB17
+from politica_plc import MUDOU, URGENTE
+from telemetria import TELEMETRIA
+
+log = logging.getLogger(__name__)
+
+
+class CanalPLC:
+    """Imagem de um bloco de dados (DB + offset) escrita pelo EscritorPLC
+
+    Com um SnapshotCompartilhado (saidas_plc.py), aplicar() copia a imagem
+    já codificada uma vez para todos os alvos, em vez de codificar campo a campo.
+    """
+
+    def __init__(self, escritor, db_number, offset=0, layout=LAYOUT_DB17, politica=None, snapshot=None):
+        self.escritor = escritor
+        self.db_number = db_number
+        self.offset = offset
+        self.empacotador = EmpacotadorDB(layout)
+        self.offset_status = layout.offset('sistema_funcionando')
+        self.ultima_escrita = 0.0
+        self.snapshot = snapshot
+
+        # Política de publicação (politica_plc.py); None = todo snapshot vai para o PLC
+        self.politica = politica
+        self.observado = {}  # valores mais recentes recebidos
+        self.publicado = {}  # valores da última publicação
+        self.ultima_publicacao = -float('inf')
+        self.prazo = float('inf')  # próxima reavaliação sem snapshot novo (relogio())
+        self.adiado = False  # mudança segurada pelo intervalo mínimo
+        self.mudanca = None  # MUDOU/URGENTE da última decisão (None = só atualização periódica)
+        self.origem = None  # time.time() do frame do snapshot observado ainda não escrito
+        self.tempo_fonte = None  # (tempo do frame na gravação, monotonic da chegada); None = ao vivo
+
+    @property
+    def conectado(self):
+        return self.escritor.conectado
+
+    def publicar(self, valores, origem=None, tempo=None):
+        """Entregar novos valores de campos deste canal (não bloqueia)"""
+        self.escritor.publicar(valores, canal=self, origem=origem, tempo=tempo)
+
+    def relogio(self, agora):
+        """Relógio da política: monotonic ao vivo; no replay de gravação, o tempo
+        do vídeo do último snapshot, avançando pelo monotonic até o próximo"""
+        if self.tempo_fonte is None:
+            return agora
+        tempo, chegada = self.tempo_fonte
+        return tempo + (agora - chegada)
+
+    def decidir(self, agora, novo):
+        """Se o snapshot observado vai para a imagem agora (só na thread de I/O)"""
+        if self.politica is None:
+            self.mudanca = MUDOU if novo else None
+            return novo
+        if not novo and agora < self.prazo:
+            return False
+
+        politica = self.politica
+        desde = agora - self.ultima_publicacao
+        mudanca = self.mudanca = politica.comparar(self.publicado, self.observado, self.empacotador.layout)
+        publicar = (mudanca == URGENTE or desde >= politica.intervalo_maximo
+                    or (mudanca == MUDOU and desde >= politica.intervalo_minimo))
+
+        if publicar:
+            self.publicado = dict(self.observado)
+            self.ultima_publicacao = agora
+            self.prazo = agora + politica.intervalo_maximo
+        else:
+            intervalo = politica.intervalo_minimo if mudanca else politica.intervalo_maximo
+            self.prazo = self.ultima_publicacao + intervalo
+        self.adiado = not publicar and mudanca is not None
+        return publicar
+
+    def aplicar(self):
+        """Copiar o snapshot observado para a imagem (marca só os bytes que mudam)"""
+        if self.snapshot is not None:
+            self.snapshot.copiar_para(self.empacotador)
+            if 'sistema_funcionando' in self.observado:  # o status é de cada alvo, não do snapshot
+                self.empacotador.definir('sistema_funcionando', self.observado['sistema_funcionando'])
+            return
+        for nome, valor in self.observado.items():
+            self.empacotador.definir(nome, valor)
+
+    def escrever(self, plc, completo=True, tamanho_maximo=200):
+        """Enviar a imagem do canal (inteira ou só as faixas sujas); retorna os db_write feitos"""
+        escritas = self.empacotador.escrever(plc, self.db_number, self.offset, completo, tamanho_maximo)
+        if completo:
+            self.ultima_escrita = time.monotonic()
+        return escritas
+
+    def ler_status(self, plc):
+        """Ler o byte de status do canal no PLC"""
+        return plc.db_read(self.db_number, self.offset + self.offset_status, 1)
+
+    def cabe_no_db(self, plc):
+        """Se o DB do PLC vai até o último byte da imagem (zonas, array de pessoas)"""
+        try:
+            plc.db_read(self.db_number, self.offset + self.empacotador.layout.tamanho - 1, 1)
+        except Exception as e:
+            if 'address' in str(e).lower():  # endereço fora do DB (snap7 1.x e 3.x)
+                return False
+            raise
+        return True
+
+
+class EscritorPLC:
+    """Subsistema de I/O do PLC - dono exclusivo do snap7.client.Client
+
+    Captura e inferência só chamam publicar(), que nunca bloqueia em rede.
+    Uma thread própria escreve sempre o snapshot mais recente (caixa de
+    correio de uma posição por canal), reconecta com backoff exponencial e
+    mantém o heartbeat Sistema_Funcionando.
+
+    O byte de status (DB17.DBB16) vive só na imagem local: é lido uma vez
+    por conexão e depois sai junto com a escrita cíclica, sem
+    read-modify-write. Com intervalo_verificacao, o byte é relido
+    periodicamente e reescrito se divergir da imagem.
+
+    Snapshots novos vão de forma incremental: só as faixas alteradas da
+    imagem, fundidas em db_write que cabem numa PDU. Conexão, heartbeat e
+    correção do status reenviam a imagem inteira.
+
+    Com uma PoliticaPublicacao, cada snapshot passa antes pela política
+    (banda morta, intervalos mínimo/máximo, transições urgentes); os que
+    não justificam escrita são contados em `evitadas`.
+
+    Vários canais (um por câmera, cada um com DB/offset próprios) podem
+    compartilhar a mesma conexão via adicionar_canal().
+
+    Com pronto=False a conexão e o heartbeat começam logo, mas
+    Sistema_Funcionando só vai a TRUE em sinalizar_pronto() (modelo e
+    câmera prontos); assim o PLC vê o processo vivo desde o início da partida.
+    """
+
+    def __init__(self, ip, rack=0, slot=1, db_number=17, porta=102,
+                 layout=LAYOUT_DB17, intervalo_heartbeat=10,
+                 backoff_inicial=0.5, backoff_maximo=30,
+                 intervalo_verificacao=None, pronto=True, politica=None, nome=None):
+        self.nome = nome  # alvo nomeado (saidas_plc.py): latência também em camera_plc_<nome>
+        self.ip = ip
+        self.rack = rack
+        self.slot = slot
+        self.porta = porta
+        self.intervalo_heartbeat = intervalo_heartbeat
+        self.backoff_inicial = backoff_inicial
+        self.backoff_maximo = backoff_maximo
+        self.intervalo_verificacao = intervalo_verificacao
+        self.politica = politica  # padrão dos canais adicionados
+
+        self.plc = snap7.client.Client()
+        self.conectado = False
+        self.pronto = pronto  # valor de Sistema_Funcionando enquanto conectado
+
+        # Caixa de correio: um snapshot pendente por canal (o mais recente vence)
+        self._condicao = threading.Condition()
+        self._pendentes = {}
+        self._origens = {}  # canal → time.time() do frame que originou o snapshot pendente
+        self._tempos = {}  # canal → (tempo do frame gravado, monotonic da publicação)
+        self._parar = threading.Event()
+        self._thread = None
+        self._proxima_verificacao = 0.0
+        self.carga_maxima = 200  # bytes de dados por db_write (ajustado pela PDU negociada)
+
+        # Canal padrão: o DB informado, a partir do byte 0
+        self.canais = []
+        self.canal_padrao = None
+        if db_number is not None:
+            self.canal_padrao = self.adicionar_canal(db_number, 0, layout)
+
+        # Contadores
+        self.escritas = 0
+        self.coalescidas = 0
+        self.descartadas = 0
+        self.falhas = 0
+        self.divergencias = 0
+        self.evitadas = 0
+
+    @property
+    def empacotador(self):
+        return self.canal_padrao.empacotador
+
+    @property
+    def rotulo(self):
+        return f"{self.nome} ({self.ip})" if self.nome else self.ip
+
+    def adicionar_canal(self, db_number, offset=0, layout=LAYOUT_DB17, politica=None, snapshot=None):
+        """Registrar mais um bloco de dados nesta conexão (antes de iniciar)"""
+        canal = CanalPLC(self, db_number, offset, layout, politica or self.politica, snapshot)
+        self.canais.append(canal)
+        return canal
+
+    def iniciar(self):
+        """Iniciar a thread de I/O (a conexão acontece nela)"""
+        self._parar.clear()
+        self._thread = threading.Thread(target=self._executar, daemon=True)
+        self._thread.start()
+
+    def parar(self, timeout=5):
+        """Parar a thread, avisar o PLC que o sistema parou e desconectar"""
+        self._parar.set()
+        with self._condicao:
+            self._condicao.notify()
+        if self._thread is not None:
+            self._thread.join(timeout)
+            if self._thread.is_alive():
+                # Thread presa numa chamada snap7: o cliente não é thread-safe, não mexer nele
+                log.warning(f"⚠️ Thread de I/O de {self.rotulo} não terminou em {timeout}s; "
+                            f"status de parada não enviado")
+                return
+
+        if self.conectado:
+            self.escrever_sistema_funcionando(False)
+            self._escrever_canais(self.canais)
+            self.plc.disconnect()
+            self.conectado = False
+
+    def publicar(self, valores, canal=None, origem=None, tempo=None):
+        """Entregar novos valores de campos (não bloqueia)
+
+        origem: time.time() da captura do frame, para medir a latência
+        câmera → PLC quando o snapshot for escrito.
+        tempo: tempo do frame numa fonte gravada (posição no vídeo); a política
+        de publicação passa a contar intervalos nele e não no relógio.
+        """
+        canal = canal or self.canal_padrao
+        with self._condicao:
+            if not self.conectado:
+                self.descartadas += 1
+                return
+
+            pendente = self._pendentes.get(canal)
+            if pendente is None:
+                self._pendentes[canal] = dict(valores)
+            else:
+                # Snapshot ainda não enviado: funde, o mais recente vence
+                pendente.update(valores)
+                self.coalescidas += 1
+            if origem is not None:
+                self._origens[canal] = origem
+            if tempo is not None:
+                self._tempos[canal] = (tempo, time.monotonic())
+            self._condicao.notify()
+
+    def sinalizar_pronto(self):
+        """Sistema pronto: Sistema_Funcionando = TRUE na próxima escrita (imediata)"""
+        with self._condicao:
+            if self.pronto:
+                return
+            self.pronto = True
+            if self.conectado:
+                for canal in self.canais:
+                    self._pendentes.setdefault(canal, {})['sistema_funcionando'] = True
+                self._condicao.notify()
+
+    def aguardar_envio(self, timeout=2.0):
+        """Esperar a thread de I/O esvaziar os snapshots pendentes (replay/benchmarks)"""
+        limite = time.monotonic() + timeout
+        def ocupado():
+            return self._pendentes or any(canal.adiado for canal in self.canais)
+
+        while ocupado() and self.conectado and time.monotonic() < limite:
+            time.sleep(0.005)
+        return not ocupado()
+
+    def contadores(self):
+        """Contadores de escrita para log/telemetria"""
+        return {
+            'escritas': self.escritas,
+            'coalescidas': self.coalescidas,
+            'descartadas': self.descartadas,
+            'falhas': self.falhas,
+            'divergencias': self.divergencias,
+            'evitadas': self.evitadas,
+        }
+
+    def conectar(self):
+        """Conectar ao PLC Siemens S7-1500"""
+        try:
+            log.info(f"🔌 Conectando ao PLC {self.rotulo}...")
+            self.plc.connect(self.ip, self.rack, self.slot, self.porta)
+            try:
+                # PDU negociada menos cabeçalhos S7 da requisição de escrita
+                self.carga_maxima = max(16, self.plc.get_pdu_length() - 35)
+            except Exception:
+                pass
+
+            # Imagem maior que o DB: as escritas das zonas/pessoas falhariam a
+            # cada ciclo. Recusar já na conexão, sem reconectar em laço
+            for canal in self.canais:
+                if not canal.cabe_no_db(self.plc):
+                    log.error(f"❌ DB{canal.db_number} de {self.rotulo} menor que o layout "
+                              f"({canal.empacotador.layout.tamanho} bytes a partir do byte {canal.offset}); "
+                              f"aumente o DB ou reduza zonas/pessoas. Escrita no PLC desativada")
+                    self._parar.set()
+                    self._marcar_desconectado()
+                    return False
+
+            # Sombra do byte de status: única leitura por conexão
+            for canal in self.canais:
+                canal.empacotador.sincronizar(canal.offset_status, canal.ler_status(self.plc))
+            self.conectado = True
+            log.info("✅ PLC conectado com sucesso!")
+
+            # Sinalizar que o sistema está funcionando (ou ainda partindo)
+            self.escrever_sistema_funcionando(self.pronto)
+            return self._escrever_canais(self.canais)
+
+        except Exception as e:
+            log.warning(f"⚠️ Erro conectando PLC {self.rotulo}: {e}")
+            self._marcar_desconectado()
+            return False
+
+    def escrever_sistema_funcionando(self, status):
+        """Atualizar Sistema_Funcionando (DB17.DBX16.0) na imagem local
+
+        O bit vai para o PLC na próxima escrita cíclica. Só deve ser
+        chamado da thread de I/O ou com ela parada.
+        """
+        for canal in self.canais:
+            canal.empacotador.definir('sistema_funcionando', status)
+
+    def _marcar_desconectado(self):
+        self.conectado = False
+        try:
+            self.plc.disconnect()
+        except Exception:
+            pass
+
+    def _executar(self):
+        backoff = self.backoff_inicial
+
+        while not self._parar.is_set():
+            if not self.conectado:
+                if self.conectar():
+                    backoff = self.backoff_inicial
+                elif not self._parar.is_set():
+                    log.warning(f"🔄 Nova tentativa de conexão com {self.rotulo} em {backoff:.1f}s")
+                    self._parar.wait(backoff)
+                    backoff = min(backoff * 2, self.backoff_maximo)
+                continue
+
+            # Esperar snapshot novo, vencimento do heartbeat ou prazo da política
+            agora = time.monotonic()
+            ultima_escrita = min((c.ultima_escrita for c in self.canais), default=agora)
+            espera = ultima_escrita + self.intervalo_heartbeat - agora
+            espera = min([espera] + [c.prazo - c.relogio(agora) for c in self.canais])
+            if self.intervalo_verificacao:
+                espera = min(espera, self._proxima_verificacao - agora)
+            with self._condicao:
+                if not self._pendentes and espera > 0 and not self._parar.is_set():
+                    self._condicao.wait(espera)
+                pendentes, self._pendentes = self._pendentes, {}
+                origens, self._origens = self._origens, {}
+                tempos, self._tempos = self._tempos, {}
+
+            # Política: o snapshot observado só vai para a imagem quando justifica escrita
+            agora = time.monotonic()
+            publicados = []
+            for canal in self.canais:
+                novo = canal in pendentes
+                if novo:
+                    canal.observado.update(pendentes[canal])
+                    canal.origem = origens.get(canal, canal.origem)
+                    canal.tempo_fonte = tempos.get(canal, canal.tempo_fonte)
+                if canal.decidir(canal.relogio(agora), novo):
+                    canal.aplicar()
+                    publicados.append(canal)
+                elif novo:
+                    self.evitadas += 1
+
+            # Heartbeat = reenviar a imagem inteira (com o bit de status) de canais parados;
+            # os demais canais com snapshot novo mandam só o que mudou
+            agora = time.monotonic()
+            completos = [c for c in self.canais if agora - c.ultima_escrita >= self.intervalo_heartbeat]
+            incrementais = [c for c in publicados if c not in completos]
+            if (completos or incrementais) and self._escrever_canais(completos) \
+                    and self._escrever_canais(incrementais, completo=False):
+                agora_unix = time.time()
+                for canal in publicados:
+                    # Latência só de publicações com mudança, não das atualizações periódicas
+                    if canal.origem is not None and canal.mudanca is not None:
+                        TELEMETRIA.observar('camera_plc', agora_unix - canal.origem)
+                        if self.nome:
+                            TELEMETRIA.observar(f'camera_plc_{self.nome}', agora_unix - canal.origem)
+                    canal.origem = None
+
+            if self.intervalo_verificacao and self.conectado and agora >= self._proxima_verificacao:
+                self._verificar_status()
+                self._proxima_verificacao = agora + self.intervalo_verificacao
+
+    def _escrever_canais(self, canais, completo=True):
+        try:
+            for canal in canais:
+                inicio = time.perf_counter()
+                escritas = canal.escrever(self.plc, completo, self.carga_maxima)
+                if escritas:
+                    TELEMETRIA.observar('plc_escrita', time.perf_counter() - inicio)
+                self.escritas += escritas
+            return True
+
+        except Exception as e:
+            log.error(f"❌ Erro enviando dados PLC {self.rotulo}: {e}")
+            self.falhas += 1
+            self._marcar_desconectado()
+            return False
+
+    def _verificar_status(self):
+        """Reler o byte de status e corrigir o PLC se divergir da sombra"""
+        for canal in self.canais:
+            try:
+                data = canal.ler_status(self.plc)
+            except Exception as e:
+                log.error(f"❌ Erro verificando status no PLC: {e}")
+                self.falhas += 1
+                self._marcar_desconectado()
+                return
+
+            offset = canal.offset_status
+            if bytes(data) != canal.empacotador.imagem[offset:offset + 1]:
+                self.divergencias += 1
+                log.warning(f"⚠️ Status no DB{canal.db_number} divergente ({data[0]:#04x}), reescrevendo")
+                self._escrever_canais([canal])
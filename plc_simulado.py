@@ -0,0 +1,36 @@
+import snap7
+from snap7.type import SrvArea
+
+
+class ServidorPLCSimulado:
+    """Servidor snap7 local que faz o papel do S7-1500 (testes e benchmarks)"""
+
+    def __init__(self, porta=1102, db_number=17, tamanho_db=64):
+        self.porta = porta
+        self.db_number = db_number
+        self.memoria_db = bytearray(tamanho_db)
+        self.servidor = None
+
+    def iniciar(self):
+        """Registrar o DB e abrir a porta TCP local"""
+        self.servidor = snap7.server.Server(log=False)
+        self.servidor.register_area(SrvArea.DB, self.db_number, self.memoria_db)
+        self.servidor.start(tcp_port=self.porta)
+        return self
+
+    def parar(self):
+        """Fechar o servidor"""
+        if self.servidor is not None:
+            self.servidor.stop()
+            self.servidor.destroy()
+            self.servidor = None
+
+    def ler(self, offset, tamanho):
+        """Ler bytes do DB direto da memória do servidor"""
+        return bytes(self.memoria_db[offset:offset + tamanho])
+
+    def __enter__(self):
+        return self.iniciar()
+
+    def __exit__(self, *args):
+        self.parar()
@@ -0,0 +1,91 @@
+import json
+from bisect import bisect_right
+from fnmatch import fnmatchcase
+
+# Resultado da comparação entre o snapshot observado e o último publicado
+MUDOU = 1     # mudança além da banda morta: publica respeitando o intervalo mínimo
+URGENTE = 2   # transição de segurança: publica na hora
+
+# Banda morta por campo (padrões fnmatch, o primeiro que casar vale). inf = o campo
+# nunca provoca escrita sozinho, só acompanha a próxima publicação.
+BANDAS_PADRAO = {
+    'timestamp_unix': float('inf'),      # atualizado pelo intervalo máximo
+    'pessoa*_idade_ms': float('inf'),
+    '*distancia*': 5.0,                  # cm
+    '*velocidade*': 0.5,                 # km/h
+    'pessoa*_[xywh]': 8,                 # px
+    'latencia_deteccao_ms': 20,
+    'inferencia_ms': 10,
+}
+
+# Limiares de segurança: cruzar um deles publica na hora (faixas de cor do desenho)
+LIMIARES_PADRAO = {
+    'distancia_minima': (100.0, 200.0),
+    'zona*_distancia_minima': (100.0, 200.0),
+    'pessoa*_distancia': (100.0, 200.0),
+}
+
+
+def carregar_politica(caminho):
+    """Política a partir de um arquivo JSON (ver politica_plc_exemplo.json)"""
+    with open(caminho, encoding='utf-8') as f:
+        config = json.load(f)
+    return PoliticaPublicacao(
+        bandas=config.get('bandas'), limiares=config.get('limiares'),
+        intervalo_minimo=config.get('intervalo_minimo', 0.1),
+        intervalo_maximo=config.get('intervalo_maximo', 1.0),
+    )
+
+
+class PoliticaPublicacao:
+    """Quando um snapshot novo justifica uma escrita no PLC
+
+    Compara o snapshot observado com o último publicado, campo a campo:
+    - BOOL que muda (pessoa entrou/saiu, zona ocupada) ou valor que cruza
+      um limiar de segurança → URGENTE, publica na hora;
+    - diferença maior que a banda morta do campo → MUDOU, publica, mas no
+      máximo uma vez por intervalo_minimo;
+    - senão o snapshot é absorvido; mesmo assim a imagem é republicada a
+      cada intervalo_maximo (timestamp_unix anda e os valores dentro da
+      banda morta são atualizados).
+
+    Só configuração: o estado (último publicado, prazos) fica em cada
+    CanalPLC, então uma política pode ser compartilhada por vários canais.
+    """
+
+    def __init__(self, bandas=None, limiares=None, intervalo_minimo=0.1, intervalo_maximo=1.0):
+        self.bandas = dict(BANDAS_PADRAO if bandas is None else bandas)
+        limiares = LIMIARES_PADRAO if limiares is None else limiares
+        self.limiares = {padrao: sorted(valores) for padrao, valores in limiares.items()}
+        self.intervalo_minimo = intervalo_minimo
+        self.intervalo_maximo = intervalo_maximo
+        self._regras = {}  # nome do campo → (banda, limiares), resolvido uma vez
+
+    def regras(self, nome):
+        """(banda morta, limiares) de um campo"""
+        regras = self._regras.get(nome)
+        if regras is None:
+            banda = next((b for padrao, b in self.bandas.items() if fnmatchcase(nome, padrao)), 0.0)
+            limiares = next((l for padrao, l in self.limiares.items() if fnmatchcase(nome, padrao)), ())
+            regras = self._regras[nome] = (banda, limiares)
+        return regras
+
+    def comparar(self, publicado, observado, layout):
+        """URGENTE, MUDOU ou None (nada que justifique escrita)"""
+        resultado = None
+        for nome, valor in observado.items():
+            anterior = publicado.get(nome)
+            if anterior == valor:
+                continue
+            if anterior is None or layout.campos[nome][0] == 'BOOL':
+                return URGENTE
+
+            banda, limiares = self.regras(nome)
+            if limiares and bisect_right(limiares, valor) != bisect_right(limiares, anterior):
+                return URGENTE
+            if abs(valor - anterior) > banda:
+                resultado = MUDOU
+        return resultado
+
+
+POLITICA_PADRAO = PoliticaPublicacao()
@@ -0,0 +1,61 @@
+import cv2
+import numpy as np
+
+
+# Registro compacto de uma pessoa detectada (coordenadas do frame exibido)
+PESSOA_DTYPE = np.dtype([
+    ('id', np.int32),
+    ('x', np.int32), ('y', np.int32), ('w', np.int32), ('h', np.int32),
+    ('cx', np.int32), ('cy', np.int32),  # centro da caixa
+    ('confianca', np.float32),
+    ('distancia', np.float32),  # cm (0 = desconhecida)
+    ('velocidade', np.float32),  # km/h
+    ('zona', np.int32),  # rótulo da zona (1 = área central sem arquivo de zonas)
+    ('idade', np.float32),  # s desde o início da trilha
+    ('tempo', np.float64),
+])
+
+
+def sem_pessoas():
+    """Array estruturado vazio (nenhuma pessoa)"""
+    return np.empty(0, PESSOA_DTYPE)
+
+
+def criar_pessoas(caixas, confiancas, tempo):
+    """Array estruturado a partir de caixas xyxy inteiras (Nx4)"""
+    pessoas = np.zeros(len(caixas), PESSOA_DTYPE)
+    x1, y1, x2, y2 = caixas.T
+    pessoas['x'] = x1
+    pessoas['y'] = y1
+    pessoas['w'] = x2 - x1
+    pessoas['h'] = y2 - y1
+    pessoas['cx'] = (x1 + x2) // 2
+    pessoas['cy'] = (y1 + y2) // 2
+    pessoas['confianca'] = confiancas
+    pessoas['tempo'] = tempo
+    return pessoas
+
+
+def mascara_area(area_coords, shape_frame):
+    """Máscara uint8 do polígono da área (teste de pertinência vetorizado)"""
+    mascara = np.zeros(shape_frame[:2], np.uint8)
+    cv2.fillPoly(mascara, [np.asarray(area_coords, np.int32)], 1)
+    return mascara
+
+
+def pontos_na_mascara(mascara, x, y):
+    """Quais pontos (arrays x, y) caem dentro da máscara"""
+    h, w = mascara.shape
+    dentro = (x >= 0) & (x < w) & (y >= 0) & (y < h)
+    dentro[dentro] = mascara[y[dentro], x[dentro]] > 0
+    return dentro
+
+
+def resumo(pessoas):
+    """(quantidade, distância mínima > 0 ou None, velocidade máxima)"""
+    if len(pessoas) == 0:
+        return 0, None, 0.0
+    distancias = pessoas['distancia']
+    distancias = distancias[distancias > 0]
+    distancia_min = float(distancias.min()) if distancias.size else None
+    return len(pessoas), distancia_min, float(pessoas['velocidade'].max())
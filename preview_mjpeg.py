@@ -0,0 +1,95 @@
+import logging
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import cv2
+
+log = logging.getLogger(__name__)
+
+
+class ServidorPreview:
+    """Preview MJPEG anotado em baixa taxa, servido numa porta local
+
+    O detector só desenha e codifica JPEG quando precisa_frame() é
+    verdadeiro: há cliente conectado e o intervalo mínimo já passou.
+    Sem clientes, o custo de renderização é zero.
+    """
+
+    def __init__(self, porta=8081, host='127.0.0.1', fps=2, qualidade=70):
+        self.porta = porta
+        self.host = host
+        self.intervalo = 1.0 / fps
+        self.qualidade = qualidade
+
+        self.clientes = 0
+        self._condicao = threading.Condition()
+        self._jpeg = None
+        self._sequencia = 0
+        self._ultimo_envio = 0.0
+        self._servidor = None
+
+    def iniciar(self):
+        preview = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_GET(self):
+                preview._atender(self)
+
+            def log_message(self, *args):
+                pass
+
+        self._servidor = ThreadingHTTPServer((self.host, self.porta), Handler)
+        self._servidor.daemon_threads = True
+        threading.Thread(target=self._servidor.serve_forever, daemon=True).start()
+        log.info(f"📺 Preview MJPEG em http://{self.host}:{self.porta}/")
+
+    def parar(self):
+        if self._servidor is not None:
+            self._servidor.shutdown()
+            self._servidor.server_close()
+            self._servidor = None
+        with self._condicao:
+            self._condicao.notify_all()
+
+    def precisa_frame(self):
+        """Há cliente e já é hora de um novo frame?"""
+        return self.clientes > 0 and time.monotonic() - self._ultimo_envio >= self.intervalo
+
+    def publicar(self, frame):
+        """Codificar JPEG e entregar aos clientes conectados"""
+        ok, jpeg = cv2.imencode('.jpg', frame, [cv2.IMWRITE_JPEG_QUALITY, self.qualidade])
+        if not ok:
+            return
+        with self._condicao:
+            self._jpeg = jpeg.tobytes()
+            self._sequencia += 1
+            self._ultimo_envio = time.monotonic()
+            self._condicao.notify_all()
+
+    def _atender(self, handler):
+        handler.send_response(200)
+        handler.send_header('Content-Type', 'multipart/x-mixed-replace; boundary=frame')
+        handler.send_header('Cache-Control', 'no-cache')
+        handler.end_headers()
+
+        with self._condicao:
+            self.clientes += 1
+        sequencia = 0
+        try:
+            while self._servidor is not None:
+                with self._condicao:
+                    self._condicao.wait_for(lambda: self._sequencia != sequencia or self._servidor is None, 5)
+                    if self._sequencia == sequencia:
+                        continue
+                    sequencia, jpeg = self._sequencia, self._jpeg
+
+                handler.wfile.write(b'--frame\r\nContent-Type: image/jpeg\r\n')
+                handler.wfile.write(f'Content-Length: {len(jpeg)}\r\n\r\n'.encode())
+                handler.wfile.write(jpeg)
+                handler.wfile.write(b'\r\n')
+        except (BrokenPipeError, ConnectionResetError):
+            pass
+        finally:
+            with self._condicao:
+                self.clientes -= 1
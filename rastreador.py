@@ -0,0 +1,219 @@
+import numpy as np
+
+try:
+    from scipy.optimize import linear_sum_assignment
+except ImportError:  # scipy é opcional: sem ele usa atribuição gulosa global
+    linear_sum_assignment = None
+
+CUSTO_INVIAVEL = 1e6
+
+
+def matriz_iou(a, b):
+    """IoU entre todas as caixas de a (N,4) e b (M,4) no formato xyxy"""
+    x1 = np.maximum(a[:, None, 0], b[None, :, 0])
+    y1 = np.maximum(a[:, None, 1], b[None, :, 1])
+    x2 = np.minimum(a[:, None, 2], b[None, :, 2])
+    y2 = np.minimum(a[:, None, 3], b[None, :, 3])
+
+    intersecao = np.clip(x2 - x1, 0, None) * np.clip(y2 - y1, 0, None)
+    area_a = (a[:, 2] - a[:, 0]) * (a[:, 3] - a[:, 1])
+    area_b = (b[:, 2] - b[:, 0]) * (b[:, 3] - b[:, 1])
+
+    return intersecao / (area_a[:, None] + area_b[None, :] - intersecao + 1e-9)
+
+
+def associar(custo):
+    """Atribuição global linha→coluna de menor custo (pares viáveis apenas)"""
+    if custo.size == 0:
+        vazio = np.empty(0, np.intp)
+        return vazio, vazio
+
+    if linear_sum_assignment is not None:
+        linhas, colunas = linear_sum_assignment(custo)
+    else:
+        # Guloso global: aceita os pares em ordem crescente de custo
+        candidatas, alvos = np.nonzero(custo < CUSTO_INVIAVEL)
+        ordem = np.argsort(custo[candidatas, alvos], kind='stable')
+        linha_livre = np.ones(custo.shape[0], bool)
+        coluna_livre = np.ones(custo.shape[1], bool)
+        linhas, colunas = [], []
+        for i, j in zip(candidatas[ordem], alvos[ordem]):
+            if linha_livre[i] and coluna_livre[j]:
+                linha_livre[i] = coluna_livre[j] = False
+                linhas.append(i)
+                colunas.append(j)
+        linhas = np.array(linhas, np.intp)
+        colunas = np.array(colunas, np.intp)
+
+    viaveis = custo[linhas, colunas] < CUSTO_INVIAVEL
+    return linhas[viaveis], colunas[viaveis]
+
+
+class RastreadorPessoas:
+    """Rastreador multi-pessoa com IDs persistentes
+
+    Custo IoU + distância de centróide (NumPy), atribuição global
+    (Hungarian via scipy, ou gulosa global) e um filtro de Kalman de
+    velocidade constante por trilha, vetorizado para todas as trilhas.
+    Estado por trilha: [cx, cy, vx, vy] em pixels e pixels/s.
+
+    Com posições no chão (câmera calibrada), cada trilha também tem um
+    filtro alfa-beta em metros; a velocidade devolvida passa a ser o
+    deslocamento no chão (m/s), não a velocidade na imagem.
+    """
+
+    def __init__(self, distancia_max=100, max_perdidos=5,
+                 ruido_aceleracao=400.0, ruido_medicao=6.0, velocidade_inicial=300.0,
+                 alfa_chao=0.5, beta_chao=0.15):
+        self.distancia_max = distancia_max
+        self.max_perdidos = max_perdidos
+        self.ruido_aceleracao = ruido_aceleracao
+        self.ruido_medicao = ruido_medicao
+        self.velocidade_inicial = velocidade_inicial
+        self.alfa_chao = alfa_chao
+        self.beta_chao = beta_chao
+
+        self.estados = np.zeros((0, 4))
+        self.covariancias = np.zeros((0, 4, 4))
+        self.tamanhos = np.zeros((0, 2))
+        self.ids = np.zeros(0, np.int64)
+        self.perdidos = np.zeros(0, np.int64)
+        self.nascimento = np.zeros(0)
+        self.chao = np.zeros((0, 4))  # [x, y, vx, vy] em m e m/s (NaN = sem posição no chão)
+        self.tempo = None
+        self.proximo_id = 1
+
+    def atualizar(self, caixas, tempo, pontos_chao=None):
+        """Associar as caixas (N,4 xyxy) do frame às trilhas
+
+        pontos_chao: posição no chão (N,2 metros, NaN = desconhecida) de cada caixa.
+        Retorna (ids, velocidades (N,2), idades em s) na ordem das caixas; as
+        velocidades são px/s, ou m/s no chão quando pontos_chao é informado.
+        """
+        caixas = np.asarray(caixas, np.float64).reshape(-1, 4)
+        centros = (caixas[:, :2] + caixas[:, 2:]) / 2
+        tamanhos = caixas[:, 2:] - caixas[:, :2]
+
+        dt = 0.0 if self.tempo is None else max(tempo - self.tempo, 0.0)
+        self.tempo = tempo
+        self._prever(dt)
+
+        linhas, colunas = associar(self._custo(caixas, centros))
+        self._corrigir(linhas, centros[colunas])
+        if pontos_chao is not None:
+            pontos_chao = np.asarray(pontos_chao, np.float64).reshape(-1, 2)
+            self._corrigir_chao(dt, linhas, pontos_chao[colunas])
+        self.tamanhos[linhas] = tamanhos[colunas]
+        self.perdidos += 1
+        self.perdidos[linhas] = 0
+
+        # Caixas sem trilha viram trilhas novas
+        indice_trilha = np.full(len(caixas), -1, np.intp)
+        indice_trilha[colunas] = linhas
+        novas = np.flatnonzero(indice_trilha < 0)
+        indice_trilha[novas] = len(self.ids) + np.arange(len(novas))
+        self._criar(centros[novas], tamanhos[novas], tempo,
+                    None if pontos_chao is None else pontos_chao[novas])
+
+        velocidades = self.estados if pontos_chao is None else self.chao
+        resultado = (
+            self.ids[indice_trilha],
+            velocidades[indice_trilha, 2:].copy(),
+            tempo - self.nascimento[indice_trilha],
+        )
+
+        # Descartar trilhas perdidas há muitos frames
+        vivas = self.perdidos <= self.max_perdidos
+        if not vivas.all():
+            self._manter(vivas)
+
+        return resultado
+
+    def _prever(self, dt):
+        if dt <= 0 or len(self.ids) == 0:
+            return
+
+        F = np.eye(4)
+        F[0, 2] = F[1, 3] = dt
+        q = self.ruido_aceleracao ** 2
+        Q = q * np.array([
+            [dt**4 / 4, 0, dt**3 / 2, 0],
+            [0, dt**4 / 4, 0, dt**3 / 2],
+            [dt**3 / 2, 0, dt**2, 0],
+            [0, dt**3 / 2, 0, dt**2],
+        ])
+
+        self.estados = self.estados @ F.T
+        self.covariancias = F @ self.covariancias @ F.T + Q
+
+    def _custo(self, caixas, centros):
+        if len(self.ids) == 0 or len(caixas) == 0:
+            return np.zeros((len(self.ids), len(caixas)))
+
+        previstos = self.estados[:, :2]
+        caixas_previstas = np.hstack((previstos - self.tamanhos / 2, previstos + self.tamanhos / 2))
+
+        distancias = np.linalg.norm(previstos[:, None, :] - centros[None, :, :], axis=2)
+        custo = 0.5 * (1 - matriz_iou(caixas_previstas, caixas)) + 0.5 * (distancias / self.distancia_max)
+        custo[distancias >= self.distancia_max] = CUSTO_INVIAVEL
+        return custo
+
+    def _corrigir(self, linhas, medidas):
+        if len(linhas) == 0:
+            return
+
+        # H = [I2 0]: a medida é só o centro
+        P = self.covariancias[linhas]
+        S = P[:, :2, :2] + np.eye(2) * self.ruido_medicao ** 2
+        K = P[:, :, :2] @ np.linalg.inv(S)
+        inovacao = medidas - self.estados[linhas, :2]
+
+        self.estados[linhas] += (K @ inovacao[:, :, None])[:, :, 0]
+        self.covariancias[linhas] = P - K @ P[:, :2, :]
+
+    def _corrigir_chao(self, dt, linhas, medidas):
+        """Filtro alfa-beta no chão: prever todas as trilhas, corrigir as medidas válidas"""
+        self.chao[:, :2] += self.chao[:, 2:] * dt
+
+        validas = np.isfinite(medidas).all(axis=1)
+        linhas, medidas = linhas[validas], medidas[validas]
+        sem_estado = np.isnan(self.chao[linhas, 0])
+        self.chao[linhas[sem_estado]] = np.hstack((medidas[sem_estado], np.zeros((sem_estado.sum(), 2))))
+
+        residuo = medidas - self.chao[linhas, :2]
+        self.chao[linhas, :2] += self.alfa_chao * residuo
+        if dt > 0:
+            self.chao[linhas, 2:] += (self.beta_chao / dt) * residuo
+
+    def _criar(self, centros, tamanhos, tempo, pontos_chao=None):
+        n = len(centros)
+        if n == 0:
+            return
+
+        chao = np.full((n, 4), np.nan)
+        if pontos_chao is not None:
+            chao[:, :2] = pontos_chao
+            chao[:, 2:] = np.where(np.isfinite(pontos_chao), 0.0, np.nan)
+
+        estados = np.zeros((n, 4))
+        estados[:, :2] = centros
+        covariancias = np.zeros((n, 4, 4))
+        covariancias[:] = np.diag([self.ruido_medicao ** 2] * 2 + [self.velocidade_inicial ** 2] * 2)
+
+        self.estados = np.vstack((self.estados, estados))
+        self.covariancias = np.concatenate((self.covariancias, covariancias))
+        self.tamanhos = np.vstack((self.tamanhos, tamanhos))
+        self.ids = np.concatenate((self.ids, np.arange(self.proximo_id, self.proximo_id + n)))
+        self.perdidos = np.concatenate((self.perdidos, np.zeros(n, np.int64)))
+        self.nascimento = np.concatenate((self.nascimento, np.full(n, tempo)))
+        self.chao = np.vstack((self.chao, chao))
+        self.proximo_id += n
+
+    def _manter(self, mascara):
+        self.estados = self.estados[mascara]
+        self.covariancias = self.covariancias[mascara]
+        self.tamanhos = self.tamanhos[mascara]
+        self.ids = self.ids[mascara]
+        self.perdidos = self.perdidos[mascara]
+        self.nascimento = self.nascimento[mascara]
+        self.chao = self.chao[mascara]
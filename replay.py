@@ -0,0 +1,153 @@
+import argparse
+import json
+import time
+
+from detector_pessoas import DetectorPessoasInteligente
+from gravador_eventos import GravadorEventos
+from inferencia import BACKENDS
+from ladrilhos import MODOS_LADRILHOS, InferenciaLadrilhada
+from log_assincrono import configurar_log
+from plc_db17 import LAYOUT_DB17, EmpacotadorDB
+from plc_io import EscritorPLC
+from plc_simulado import ServidorPLCSimulado
+from politica_plc import POLITICA_PADRAO
+from telemetria import TELEMETRIA
+
+
+def executar_replay(fonte, modo='rapido', porta_plc=1102, yolo_model=None,
+                    backend='ultralytics', modelo='yolov8n.pt', imgsz=640, threads=None,
+                    portao=True, fps_imagens=15, politica=POLITICA_PADRAO, gravador=None,
+                    fator_inferencia=0.5, ladrilhos=None):
+    """Rodar o pipeline completo sobre uma gravação, com um PLC snap7 local
+
+    fonte: arquivo de vídeo ou diretório de imagens.
+    modo: 'rapido' (todos os frames, o mais rápido possível) ou
+    'tempo_real' (no ritmo gravado, como uma câmera ao vivo).
+    yolo_model: backend já carregado (reaproveitado entre cenários).
+    politica: PoliticaPublicacao do PLC (None = todo resultado é publicado).
+    gravador: GravadorEventos opcional (clipes dos eventos da gravação).
+    fator_inferencia / ladrilhos: resolução da passada grossa e InferenciaLadrilhada opcional.
+
+    Retorna um dicionário com frames/s, latência câmera → DB e escritas no DB17.
+    """
+    TELEMETRIA.zerar()
+
+    with ServidorPLCSimulado(porta=porta_plc) as servidor:
+        escritor = EscritorPLC('127.0.0.1', porta=porta_plc, politica=politica)
+        escritor.iniciar()
+
+        detector = DetectorPessoasInteligente(fonte, canal_plc=escritor.canal_padrao)
+        detector.headless = True
+        detector.modo_replay = modo
+        detector.fps_imagens = fps_imagens
+        detector.backend_inferencia = backend
+        detector.modelo_yolo = modelo
+        detector.imgsz = imgsz
+        detector.threads_inferencia = threads
+        detector.gravador = gravador
+        detector.fator_inferencia = fator_inferencia
+        detector.ladrilhos = ladrilhos
+        if not portao:
+            detector.portao = None
+        if modo == 'rapido':
+            # Sem orçamento de latência: o próximo frame vai assim que o YOLO libera
+            detector.agendador.orcamento_latencia = 0.0
+
+        try:
+            # Modelo pronto (e aquecido) antes do 1º frame: a gravação só
+            # começa a andar quando o laço também começa
+            if yolo_model is not None:
+                detector.yolo_model = yolo_model
+            elif detector.carregar_yolo():
+                detector.yolo_model.aquecer()
+            else:
+                raise RuntimeError(f"não foi possível carregar {modelo}")
+            if not detector.conectar_camera():
+                raise RuntimeError(f"não foi possível abrir {fonte}")
+
+            # Nada é publicado antes do PLC simulado aceitar a conexão
+            limite = time.monotonic() + 5
+            while not escritor.conectado and time.monotonic() < limite:
+                time.sleep(0.01)
+
+            inicio = time.perf_counter()
+            detector.executar()
+            duracao = time.perf_counter() - inicio
+
+            escritor.aguardar_envio()
+            contadores = escritor.contadores()
+        finally:
+            escritor.parar()
+
+        db = EmpacotadorDB(LAYOUT_DB17)
+        db.imagem[:] = servidor.ler(0, LAYOUT_DB17.tamanho)
+
+    frames = detector.captura.sequencia  # inclui o 1º frame, lido na abertura
+    ponta = TELEMETRIA.histograma('camera_plc')
+    return {
+        'fonte': fonte,
+        'modo': modo,
+        'frames': frames,
+        'inferidos': TELEMETRIA.histograma('inferencia').total,
+        'duracao_s': round(duracao, 3),
+        'fps': round(frames / duracao, 2) if duracao > 0 else 0.0,
+        'camera_db_p50_ms': round(ponta.percentil(50) * 1000, 2),
+        'camera_db_p95_ms': round(ponta.percentil(95) * 1000, 2),
+        'camera_db_p99_ms': round(ponta.percentil(99) * 1000, 2),
+        'escritas_db17': contadores['escritas'],
+        'coalescidas': contadores['coalescidas'],
+        'descartadas': contadores['descartadas'],
+        'evitadas': contadores['evitadas'],
+        'db17_final': {nome: db.ler(nome) for nome in LAYOUT_DB17.campos},
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Replay de gravação pelo pipeline completo, com PLC snap7 local")
+    parser.add_argument('fonte', help='arquivo de vídeo ou diretório de imagens')
+    parser.add_argument('--tempo-real', action='store_true',
+                        help='reproduzir no ritmo gravado (padrão: todos os frames, o mais rápido possível)')
+    parser.add_argument('--fps-imagens', type=float, default=15,
+                        help='cadência de um diretório de imagens')
+    parser.add_argument('--porta-plc', type=int, default=1102, help='porta do servidor snap7 local')
+    parser.add_argument('--sem-portao', action='store_true', help='YOLO em todo frame (sem porta de movimento)')
+    parser.add_argument('--backend', choices=BACKENDS, default='ultralytics')
+    parser.add_argument('--modelo', default='yolov8n.pt')
+    parser.add_argument('--imgsz', type=int, default=640)
+    parser.add_argument('--threads', type=int, default=None)
+    parser.add_argument('--fator-inferencia', type=float, default=0.5,
+                        help='resolução da passada grossa do YOLO, em fração do frame gravado')
+    parser.add_argument('--ladrilhos', choices=MODOS_LADRILHOS, default=None,
+                        help='ladrilhos em resolução cheia no mesmo lote do YOLO')
+    parser.add_argument('--sem-politica-plc', action='store_true',
+                        help='publicar todo resultado (sem banda morta nem limite de taxa)')
+    parser.add_argument('--json', default=None, help='gravar o resultado neste arquivo')
+    parser.add_argument('--eventos', default=None, help='diretório para os clipes de eventos da gravação')
+    args = parser.parse_args()
+    configurar_log()
+
+    resultado = executar_replay(
+        args.fonte, 'tempo_real' if args.tempo_real else 'rapido', args.porta_plc,
+        backend=args.backend, modelo=args.modelo, imgsz=args.imgsz, threads=args.threads,
+        portao=not args.sem_portao, fps_imagens=args.fps_imagens,
+        politica=None if args.sem_politica_plc else POLITICA_PADRAO,
+        gravador=GravadorEventos(args.eventos) if args.eventos else None,
+        fator_inferencia=args.fator_inferencia,
+        ladrilhos=InferenciaLadrilhada(args.ladrilhos, args.imgsz) if args.ladrilhos else None
+    )
+
+    print("=" * 50)
+    print(f"🎞️ {resultado['frames']} frames em {resultado['duracao_s']:.1f}s → {resultado['fps']:.1f} frames/s "
+          f"({resultado['inferidos']} inferidos)")
+    print(f"⏱️ Câmera→DB: p50 {resultado['camera_db_p50_ms']:.0f}ms | p95 {resultado['camera_db_p95_ms']:.0f}ms "
+          f"| p99 {resultado['camera_db_p99_ms']:.0f}ms")
+    print(f"📤 DB17: {resultado['escritas_db17']} escritas | {resultado['evitadas']} evitadas "
+          f"| {resultado['coalescidas']} coalescidas | {resultado['descartadas']} descartadas")
+    print(f"📊 DB17 final: {resultado['db17_final']}")
+
+    if args.json:
+        with open(args.json, 'w', encoding='utf-8') as f:
+            json.dump(resultado, f, ensure_ascii=False, indent=2)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,198 @@
+import json
+
+import cv2
+import numpy as np
+
+
+def retangulo_recorte(area_coords, fator_escala, shape_inferencia, margem=0.1):
+    """Retângulo (x0, y0, x1, y1) no frame de inferência que cobre a área
+
+    area_coords está em coordenadas do frame exibido (polígono qualquer).
+    A margem (fração do frame) evita cortar o corpo de quem tem o centro
+    dentro da área mas os pés/cabeça fora dela.
+    """
+    h, w = shape_inferencia[:2]
+    x, y, largura, altura = cv2.boundingRect(np.asarray(area_coords, np.int32))
+
+    margem_x = int(w * margem)
+    margem_y = int(h * margem)
+    x0 = max(0, int(x / fator_escala) - margem_x)
+    y0 = max(0, int(y / fator_escala) - margem_y)
+    x1 = min(w, int((x + largura) / fator_escala) + margem_x)
+    y1 = min(h, int((y + altura) / fator_escala) + margem_y)
+    return x0, y0, x1, y1
+
+
+class PortaoMovimento:
+    """Porta de movimento barata na frente do YOLO
+
+    Compara o recorte da área (reduzido, cinza, suavizado) com um fundo de
+    média móvel. Se a área está parada e vazia, o YOLO é pulado. Com
+    movimento o YOLO volta à taxa cheia por tempo_acordado segundos; com
+    pessoas presentes ele não é pulado; e a cada intervalo_maximo roda de
+    qualquer forma, para não perder quem entrou devagar.
+    """
+
+    def __init__(self, escala=0.25, limiar_pixel=25, fracao_movimento=0.002,
+                 alfa_fundo=0.05, tempo_acordado=2.0, intervalo_maximo=1.0):
+        self.escala = escala
+        self.limiar_pixel = limiar_pixel
+        self.fracao_movimento = fracao_movimento
+        self.alfa_fundo = alfa_fundo
+        self.tempo_acordado = tempo_acordado
+        self.intervalo_maximo = intervalo_maximo
+
+        self._fundo = None
+        self._cinza = None
+        self._fundo_u8 = None
+        self._diferenca = None
+        self.ultimo_movimento = -float('inf')
+        self.ultima_inferencia = -float('inf')
+
+        # Contadores
+        self.inferidos = 0
+        self.pulados = 0
+
+    def ha_movimento(self, frame):
+        """Atualizar o fundo e dizer se a imagem mudou"""
+        pequeno = cv2.resize(frame, None, fx=self.escala, fy=self.escala, interpolation=cv2.INTER_AREA)
+        cinza = cv2.cvtColor(pequeno, cv2.COLOR_BGR2GRAY, dst=self._cinza)
+        cv2.GaussianBlur(cinza, (5, 5), 0, dst=cinza)
+        self._cinza = cinza
+
+        if self._fundo is None or self._fundo.shape != cinza.shape:
+            self._fundo = cinza.astype(np.float32)
+            self._fundo_u8 = np.empty_like(cinza)
+            self._diferenca = np.empty_like(cinza)
+            return True
+
+        cv2.convertScaleAbs(self._fundo, dst=self._fundo_u8)
+        cv2.absdiff(cinza, self._fundo_u8, dst=self._diferenca)
+        cv2.accumulateWeighted(cinza, self._fundo, self.alfa_fundo)
+
+        cv2.threshold(self._diferenca, self.limiar_pixel, 255, cv2.THRESH_BINARY, dst=self._diferenca)
+        mudados = cv2.countNonZero(self._diferenca)
+        return mudados > self.fracao_movimento * cinza.size
+
+    def deve_inferir(self, frame, tempo, ha_pessoas):
+        """Decidir se este frame vai para o YOLO"""
+        if self.ha_movimento(frame):
+            self.ultimo_movimento = tempo
+
+        inferir = (
+            ha_pessoas
+            or tempo - self.ultimo_movimento <= self.tempo_acordado
+            or tempo - self.ultima_inferencia >= self.intervalo_maximo
+        )
+
+        if inferir:
+            self.ultima_inferencia = tempo
+            self.inferidos += 1
+        else:
+            self.pulados += 1
+        return inferir
+
+    def taxa_inferencia(self):
+        """Fração dos frames que foram para o YOLO"""
+        total = self.inferidos + self.pulados
+        return self.inferidos / total if total else 1.0
+
+
+# ====== ZONAS MONITORADAS ======
+# Ordem de pintura da máscara: em sobreposição vale o tipo que vem depois
+TIPOS_ZONA = ('alerta', 'parada', 'ignorar')
+
+
+def carregar_zonas(caminho):
+    """Ler as zonas de um arquivo JSON (ver zonas_exemplo.json)"""
+    with open(caminho, encoding='utf-8') as f:
+        config = json.load(f)
+    return ZonasMonitoradas(config['zonas'])
+
+
+class ZonasMonitoradas:
+    """Zonas poligonais (alerta / parada / ignorar) com máscara de rótulos pré-calculada
+
+    Os polígonos vêm em frações do frame (0..1), independentes da
+    resolução. preparar() pinta uma máscara uint8 na resolução de
+    inferência onde cada pixel guarda o rótulo da zona (1..N na ordem do
+    arquivo, 0 = fora de todas); classificar o ponto dos pés de cada
+    detecção é uma indexação da máscara, sem teste de polígono por pessoa.
+
+    Quem está numa zona 'ignorar' (ou fora de todas) é descartado. As demais
+    zonas reportam ocupação, quantidade e distância mínima no próprio
+    offset do DB.
+    """
+
+    def __init__(self, zonas):
+        if not 0 < len(zonas) < 256:
+            raise ValueError("O arquivo de zonas precisa ter de 1 a 255 zonas")
+
+        self.nomes = []
+        self.tipos = []
+        self.poligonos_relativos = []
+        self.offsets = []  # offset do registro no DB (None = zona não reportada)
+        for zona in zonas:
+            tipo = zona.get('tipo', 'alerta')
+            if tipo not in TIPOS_ZONA:
+                raise ValueError(f"Tipo de zona desconhecido: {tipo}")
+            if tipo != 'ignorar' and 'offset' not in zona:
+                raise ValueError(f"Zona {zona['nome']} sem offset no DB")
+            self.nomes.append(zona['nome'])
+            self.tipos.append(tipo)
+            self.poligonos_relativos.append(np.asarray(zona['poligono'], np.float64).reshape(-1, 2))
+            self.offsets.append(zona.get('offset') if tipo != 'ignorar' else None)
+
+        # Tabela rótulo → conta como presença (índice 0 = fora de todas)
+        self.monitoradas = np.array([False] + [t != 'ignorar' for t in self.tipos])
+        if not self.monitoradas.any():
+            raise ValueError("Nenhuma zona monitorada (só 'ignorar')")
+
+        self.poligonos = []  # px do frame exibido (desenho e recorte)
+        self.rotulos = None  # máscara de rótulos no frame de inferência
+
+    @property
+    def reportadas(self):
+        """[(rótulo, offset no DB)] das zonas que vão para o PLC"""
+        return [(i + 1, offset) for i, offset in enumerate(self.offsets) if offset is not None]
+
+    def preparar(self, shape_frame, fator_escala):
+        """Polígonos no frame exibido e máscara de rótulos no frame de inferência"""
+        h, w = shape_frame[:2]
+        self.poligonos = [np.round(p * (w, h)).astype(np.int32) for p in self.poligonos_relativos]
+
+        altura, largura = int(h / fator_escala), int(w / fator_escala)
+        self.rotulos = np.zeros((altura, largura), np.uint8)
+        for tipo in TIPOS_ZONA:
+            for i, poligono in enumerate(self.poligonos_relativos):
+                if self.tipos[i] == tipo:
+                    pontos = np.round(poligono * (largura, altura)).astype(np.int32)
+                    cv2.fillPoly(self.rotulos, [pontos], i + 1)
+
+    def contorno(self):
+        """Polígono (frame exibido) que cobre todas as zonas monitoradas"""
+        pontos = np.concatenate([p for p, m in zip(self.poligonos, self.monitoradas[1:]) if m])
+        return cv2.convexHull(pontos).reshape(-1, 2)
+
+    def classificar(self, x, y):
+        """Rótulo da zona de cada ponto (arrays x, y no frame de inferência)"""
+        h, w = self.rotulos.shape
+        x = np.clip(np.asarray(x, np.int64), 0, w - 1)
+        y = np.clip(np.asarray(y, np.int64), 0, h - 1)
+        return self.rotulos[y, x]
+
+    def valores(self, pessoas):
+        """Campos zona{rótulo}_{campo} de todas as zonas reportadas"""
+        n = len(self.nomes) + 1
+        quantidades = np.bincount(pessoas['zona'], minlength=n)
+        distancias = np.full(n, np.inf)
+        conhecidas = pessoas['distancia'] > 0
+        np.minimum.at(distancias, pessoas['zona'][conhecidas], pessoas['distancia'][conhecidas])
+
+        valores = {}
+        for rotulo, _ in self.reportadas:
+            distancia = distancias[rotulo]
+            valores[f'zona{rotulo}_ocupada'] = bool(quantidades[rotulo])
+            valores[f'zona{rotulo}_quantidade'] = int(quantidades[rotulo])
+            valores[f'zona{rotulo}_distancia_minima'] = float(distancia) if np.isfinite(distancia) else 0.0
+        return valores
@@ -0,0 +1,155 @@
+import json
+import logging
+import threading
+import time
+
+from plc_db17 import LAYOUT_DB17, EmpacotadorDB
+from plc_io import EscritorPLC
+from politica_plc import POLITICA_PADRAO, carregar_politica
+from telemetria import TELEMETRIA
+
+log = logging.getLogger(__name__)
+
+CONTADORES = ('escritas', 'coalescidas', 'descartadas', 'falhas', 'divergencias', 'evitadas')
+
+
+def carregar_saidas(caminho, layout=LAYOUT_DB17, politica=POLITICA_PADRAO, pronto=True):
+    """Saídas a partir de um arquivo JSON (ver saidas_plc_exemplo.json)
+
+    "politica" por alvo: ausente = `politica`, null = todo resultado vai
+    para o alvo, caminho = arquivo de política (politica_plc_exemplo.json).
+    """
+    with open(caminho, encoding='utf-8') as f:
+        config = json.load(f)
+
+    alvos = []
+    for alvo in config['alvos']:
+        alvo = dict(alvo)
+        if 'politica' not in alvo:
+            alvo['politica'] = politica
+        elif alvo['politica'] is not None:
+            alvo['politica'] = carregar_politica(alvo['politica'])
+        alvos.append(alvo)
+    return SaidasPLC(alvos, layout, pronto=pronto)
+
+
+class SnapshotCompartilhado:
+    """Imagem de um layout codificada uma vez por resultado
+
+    Todos os canais com esse layout (em qualquer alvo) copiam os bytes
+    prontos em CanalPLC.aplicar(), sem recodificar campo a campo.
+    """
+
+    def __init__(self, layout):
+        self.layout = layout
+        self.empacotador = EmpacotadorDB(layout)
+        self.proprios = layout.mascara(('sistema_funcionando',))  # status de cada alvo
+        self._trava = threading.Lock()
+
+    def atualizar(self, valores):
+        """Codificar os campos deste layout; retorna só esses campos (para a política dos canais)"""
+        campos = self.layout.campos
+        filtrados = {nome: valor for nome, valor in valores.items() if nome in campos}
+        with self._trava:
+            for nome, valor in filtrados.items():
+                self.empacotador.definir(nome, valor)
+            self.empacotador.sujas = []  # quem escreve são os canais
+        return filtrados
+
+    def copiar_para(self, empacotador):
+        with self._trava:
+            empacotador.copiar_de(self.empacotador, self.proprios)
+
+
+class SaidasPLC:
+    """O mesmo resultado publicado em vários PLCs/gateways (segurança, linha, IHM...)
+
+    Cada alvo nomeado tem o seu EscritorPLC: conexão, thread de I/O,
+    reconexão com backoff, heartbeat, política e mapa de DBs próprios.
+    Um alvo morto ou lento só atrasa a si mesmo; publicar() nunca espera
+    rede. O snapshot é codificado uma vez por layout e copiado pelos canais.
+
+    Mapa de DBs de um alvo: blocos [{db, offset, layout}], layout
+    'completo' (o do detector: telemetria, pessoas, zonas) ou 'db17'
+    (só o DB17 padrão de 18 bytes).
+
+    Tem a interface de EscritorPLC e de CanalPLC usada pelo detector e pelo
+    supervisor do pipeline (publicar, contadores, conectado,
+    sinalizar_pronto, empacotador.layout, db_number, escritor).
+    """
+
+    def __init__(self, alvos, layout=LAYOUT_DB17, pronto=True):
+        self.escritor = self
+        self.empacotador = EmpacotadorDB(layout)  # só o layout é usado pelo detector
+        layouts = {'completo': layout, 'db17': LAYOUT_DB17}
+
+        self.snapshots = {}
+        self.escritores = {}
+        self._canais = []  # (canal, tipo do layout)
+        for alvo in alvos:
+            nome = alvo['nome']
+            escritor = EscritorPLC(
+                alvo['ip'], alvo.get('rack', 0), alvo.get('slot', 1), db_number=None,
+                porta=alvo.get('porta', 102), pronto=pronto, politica=alvo.get('politica'), nome=nome,
+                intervalo_verificacao=alvo.get('intervalo_verificacao'),
+            )
+            for bloco in alvo.get('blocos', [{'db': 17}]):
+                tipo = bloco.get('layout', 'completo')
+                if tipo not in self.snapshots:
+                    self.snapshots[tipo] = SnapshotCompartilhado(layouts[tipo])
+                snapshot = self.snapshots[tipo]
+                canal = escritor.adicionar_canal(bloco['db'], bloco.get('offset', 0), snapshot.layout,
+                                                 snapshot=snapshot)
+                self._canais.append((canal, tipo))
+            self.escritores[nome] = escritor
+            TELEMETRIA.medidor(f'plc_conectado_{nome}', lambda e=escritor: int(e.conectado))
+
+        self.db_number = self._canais[0][0].db_number
+
+    @property
+    def canal_padrao(self):
+        return self
+
+    @property
+    def conectado(self):
+        """Todos os alvos conectados"""
+        return all(e.conectado for e in self.escritores.values())
+
+    def conectados(self):
+        return {nome: e.conectado for nome, e in self.escritores.items()}
+
+    def iniciar(self):
+        for escritor in self.escritores.values():
+            escritor.iniciar()
+        log.info(f"🔀 Saídas PLC: {', '.join(e.rotulo for e in self.escritores.values())}")
+
+    def parar(self, timeout=5):
+        """Parar todos os alvos em paralelo (um alvo travado não segura os outros)"""
+        threads = [threading.Thread(target=e.parar, args=(timeout,), daemon=True)
+                   for e in self.escritores.values()]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join(timeout + 1)
+
+    def publicar(self, valores, canal=None, origem=None, tempo=None):
+        """Codificar uma vez e entregar a todos os alvos (não bloqueia)"""
+        filtrados = {tipo: snapshot.atualizar(valores) for tipo, snapshot in self.snapshots.items()}
+        for canal_alvo, tipo in self._canais:
+            canal_alvo.publicar(filtrados[tipo], origem=origem, tempo=tempo)
+
+    def sinalizar_pronto(self):
+        for escritor in self.escritores.values():
+            escritor.sinalizar_pronto()
+
+    def aguardar_envio(self, timeout=2.0):
+        limite = time.monotonic() + timeout
+        return all([e.aguardar_envio(max(0.0, limite - time.monotonic())) for e in self.escritores.values()])
+
+    def contadores(self):
+        """Contadores somados de todos os alvos"""
+        por_alvo = self.contadores_por_alvo()
+        return {nome: sum(c[nome] for c in por_alvo.values()) for nome in CONTADORES}
+
+    def contadores_por_alvo(self):
+        return {nome: e.contadores() for nome, e in self.escritores.items()}
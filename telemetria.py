@@ -0,0 +1,246 @@
+import bisect
+import json
+import logging
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+log = logging.getLogger(__name__)
+
+# Limites dos baldes (segundos): 0.1 ms … 10 s, ~4 por década
+LIMITES_PADRAO = (
+    0.0001, 0.00025, 0.0005, 0.00075,
+    0.001, 0.0025, 0.005, 0.0075,
+    0.01, 0.025, 0.05, 0.075,
+    0.1, 0.25, 0.5, 0.75,
+    1.0, 2.5, 5.0, 10.0,
+)
+
+# Etapas medidas pelo detector (nome da métrica → descrição)
+ETAPAS = {
+    'espera_captura': 'espera pelo próximo frame da fonte (grab() do OpenCV, que já decodifica; 1º byte do pipe ffmpeg)',
+    'captura': 'retrieve/leitura do frame para o buffer (thread de captura), sem a espera pela fonte',
+    'redimensionamento': 'resize para a resolução de inferência',
+    'espera_fila': 'frame entregue ao YOLO até a thread pegá-lo',
+    'inferencia': 'chamada do modelo',
+    'pos_processamento': 'filtro, remapeamento, área e distância',
+    'rastreamento': 'rastreador Kalman',
+    'plc_escrita': 'db_write no PLC',
+    'renderizacao': 'desenho e exibição/preview',
+    'camera_plc': 'decodificação do frame até a escrita no PLC (ponta a ponta)',
+}
+
+
+class Histograma:
+    """Histograma de baldes fixos (estilo Prometheus), custo O(log baldes) por amostra
+
+    Várias threads podem observar o mesmo histograma (ex.: camera_plc e
+    plc_escrita, um EscritorPLC por alvo), então cada um tem sua trava;
+    leituras pegam uma cópia consistente (copia()).
+    """
+
+    def __init__(self, limites=LIMITES_PADRAO):
+        self.limites = limites
+        self.baldes = [0] * (len(limites) + 1)  # último = +Inf
+        self.total = 0
+        self.soma = 0.0
+        self._trava = threading.Lock()
+
+    def observar(self, valor):
+        i = bisect.bisect_left(self.limites, valor)
+        with self._trava:
+            self.baldes[i] += 1
+            self.total += 1
+            self.soma += valor
+
+    def copia(self):
+        """(baldes, total, soma) consistentes entre si"""
+        with self._trava:
+            return list(self.baldes), self.total, self.soma
+
+    def percentil(self, p):
+        """Percentil aproximado (interpolação linear dentro do balde)"""
+        baldes, total, _ = self.copia()
+        if total == 0:
+            return 0.0
+        alvo = p / 100 * total
+        acumulado = 0
+        for i, n in enumerate(baldes):
+            if n and acumulado + n >= alvo:
+                inferior = self.limites[i - 1] if i > 0 else 0.0
+                superior = self.limites[i] if i < len(self.limites) else self.limites[-1]
+                return inferior + (superior - inferior) * (alvo - acumulado) / n
+            acumulado += n
+        return self.limites[-1]
+
+
+class Telemetria:
+    """Registro de métricas do processo: histogramas, contadores e medidores
+
+    Observar custa uma busca binária e três somas; nada é formatado até
+    alguém pedir (endpoint /metrics ou exportação JSON lines).
+    """
+
+    def __init__(self):
+        self.histogramas = {}
+        self.contadores = {}
+        self.medidores = {}  # nome → função sem argumentos (lida só na exportação)
+        self._trava = threading.Lock()
+
+    def histograma(self, nome):
+        h = self.histogramas.get(nome)
+        if h is None:
+            with self._trava:
+                h = self.histogramas.setdefault(nome, Histograma())
+        return h
+
+    def observar(self, nome, segundos):
+        """Registrar a duração de uma etapa"""
+        self.histograma(nome).observar(segundos)
+
+    def contar(self, nome, n=1):
+        with self._trava:  # ler-somar-escrever vindo de várias threads
+            self.contadores[nome] = self.contadores.get(nome, 0) + n
+
+    def _contadores(self):
+        with self._trava:
+            return dict(self.contadores)
+
+    def medidor(self, nome, funcao):
+        """Registrar um valor instantâneo lido sob demanda (profundidade de fila, etc.)"""
+        self.medidores[nome] = funcao
+
+    def zerar(self):
+        """Descartar histogramas e contadores (replay: um cenário por vez)"""
+        with self._trava:
+            self.histogramas = {}
+            self.contadores = {}
+
+    def resumo(self):
+        """Snapshot com percentis em ms (JSON lines / log)"""
+        etapas = {}
+        for nome, h in list(self.histogramas.items()):
+            _, total, soma = h.copia()
+            if total:
+                etapas[nome] = {
+                    'n': total,
+                    'media_ms': round(soma / total * 1000, 3),
+                    'p50_ms': round(h.percentil(50) * 1000, 3),
+                    'p95_ms': round(h.percentil(95) * 1000, 3),
+                    'p99_ms': round(h.percentil(99) * 1000, 3),
+                }
+        return {
+            'tempo': time.time(),
+            'etapas': etapas,
+            'contadores': self._contadores(),
+            'medidores': {nome: _ler(f) for nome, f in list(self.medidores.items())},
+        }
+
+    def texto_prometheus(self):
+        """Formato de exposição de texto do Prometheus"""
+        linhas = []
+        for nome, h in sorted(self.histogramas.items()):
+            baldes, total, soma = h.copia()
+            metrica = f"detector_{nome}_segundos"
+            linhas.append(f"# HELP {metrica} {ETAPAS.get(nome, nome)}")
+            linhas.append(f"# TYPE {metrica} histogram")
+            acumulado = 0
+            for limite, n in zip(h.limites, baldes):
+                acumulado += n
+                linhas.append(f'{metrica}_bucket{{le="{limite}"}} {acumulado}')
+            linhas.append(f'{metrica}_bucket{{le="+Inf"}} {total}')
+            linhas.append(f"{metrica}_sum {soma}")
+            linhas.append(f"{metrica}_count {total}")
+
+        for nome, valor in sorted(self._contadores().items()):
+            linhas.append(f"# TYPE detector_{nome}_total counter")
+            linhas.append(f"detector_{nome}_total {valor}")
+
+        for nome, funcao in sorted(self.medidores.items()):
+            linhas.append(f"# TYPE detector_{nome} gauge")
+            linhas.append(f"detector_{nome} {_ler(funcao)}")
+        return '\n'.join(linhas) + '\n'
+
+
+def _ler(funcao):
+    try:
+        return float(funcao())
+    except Exception:
+        return float('nan')
+
+
+# Registro único do processo (captura, YOLO e PLC escrevem aqui)
+TELEMETRIA = Telemetria()
+
+
+class ServidorMetricas:
+    """Endpoint HTTP local /metrics no formato de texto do Prometheus
+
+    O texto só é montado quando alguém faz scrape; sem scrape não há custo.
+    """
+
+    def __init__(self, porta=9108, host='127.0.0.1', telemetria=TELEMETRIA):
+        self.porta = porta
+        self.host = host
+        self.telemetria = telemetria
+        self._servidor = None
+
+    def iniciar(self):
+        metricas = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_GET(self):
+                if self.path.split('?')[0] not in ('/', '/metrics'):
+                    self.send_error(404)
+                    return
+                corpo = metricas.telemetria.texto_prometheus().encode()
+                self.send_response(200)
+                self.send_header('Content-Type', 'text/plain; version=0.0.4')
+                self.send_header('Content-Length', str(len(corpo)))
+                self.end_headers()
+                self.wfile.write(corpo)
+
+            def log_message(self, *args):
+                pass
+
+        self._servidor = ThreadingHTTPServer((self.host, self.porta), Handler)
+        self._servidor.daemon_threads = True
+        threading.Thread(target=self._servidor.serve_forever, daemon=True).start()
+        log.info(f"📈 Métricas Prometheus em http://{self.host}:{self.porta}/metrics")
+
+    def parar(self):
+        if self._servidor is not None:
+            self._servidor.shutdown()
+            self._servidor.server_close()
+            self._servidor = None
+
+
+class ExportadorJSONL:
+    """Anexa um snapshot de telemetria por linha num arquivo, a cada intervalo"""
+
+    def __init__(self, caminho, intervalo=10, telemetria=TELEMETRIA):
+        self.caminho = caminho
+        self.intervalo = intervalo
+        self.telemetria = telemetria
+        self._parar = threading.Event()
+        self._thread = None
+
+    def iniciar(self):
+        self._parar.clear()
+        self._thread = threading.Thread(target=self._executar, daemon=True)
+        self._thread.start()
+        log.info(f"📈 Telemetria em JSON lines: {self.caminho} (a cada {self.intervalo}s)")
+
+    def parar(self):
+        self._parar.set()
+        if self._thread is not None:
+            self._thread.join(2)
+        self._escrever()
+
+    def _escrever(self):
+        with open(self.caminho, 'a', encoding='utf-8') as f:
+            f.write(json.dumps(self.telemetria.resumo(), ensure_ascii=False) + '\n')
+
+    def _executar(self):
+        while not self._parar.wait(self.intervalo):
+            self._escrever()
@@ -0,0 +1,174 @@
+"""Validação da calibração do chão contra posições conhecidas numa gravação
+
+Para cada frame anotado, roda o YOLO, pega a detecção cujo ponto dos pés
+cai mais perto da posição medida e compara:
+- posição no chão pela tabela (CalibracaoChao.para_chao) vs a medida;
+- distância até a referência pela tabela vs pela altura da caixa
+  (estimativa antiga, altura_pessoa_real=170 e focal_length=800);
+- tabela vs homografia direta (erro de quantização da tabela).
+
+Arquivo de posições (JSON), no mesmo referencial dos pontos_chao:
+    {"posicoes": [{"frame": 120, "x": -0.5, "y": 3.0}, ...]}
+frame = índice do frame no vídeo; x/y = posição dos pés (m), medida no piso.
+
+Antes de tudo, confere a homografia numa câmera sintética inclinada 15°
+com o horizonte dentro da imagem: pixels abaixo do horizonte têm de cair
+no chão certo e os de cima (céu) têm de ficar NaN. Sem argumentos, só
+essa conferência roda.
+
+Uso:
+    python validar_calibracao.py gravacao.mp4 calibracao_exemplo.json posicoes.json
+    python validar_calibracao.py
+"""
+import argparse
+import json
+
+import cv2
+import numpy as np
+
+from calibracao import CalibracaoChao, carregar_calibracao
+from inferencia import BACKENDS, criar_backend
+
+ALTURA_PESSOA_REAL = 170  # cm, mesma estimativa do detector_pessoas.py
+FOCAL_LENGTH = 800
+
+
+def resumo(nome, erros, unidade='cm'):
+    erros = np.asarray(erros) * 100
+    if len(erros) == 0:
+        print(f"{nome:<34} | sem amostras")
+        return
+    print(f"{nome:<34} | {erros.mean():7.1f} | {np.percentile(erros, 95):7.1f} | {erros.max():7.1f} {unidade}")
+
+
+def camera_sintetica(inclinacao=15.0, altura=3.0, focal=1000.0, resolucao=(1920, 1080)):
+    """Projeção chão (m) → pixel de uma câmera pinhole inclinada; linha do horizonte"""
+    a = np.radians(inclinacao)
+    cx, cy = resolucao[0] / 2, resolucao[1] / 2
+    eixos = np.array([[1.0, 0.0, 0.0],             # x da câmera (direita)
+                      [0.0, -np.sin(a), -np.cos(a)],  # y da câmera (para baixo)
+                      [0.0, np.cos(a), -np.sin(a)]])  # eixo óptico
+
+    def projetar(chao):
+        chao = np.asarray(chao, np.float64).reshape(-1, 2)
+        camera = (np.column_stack((chao, np.full(len(chao), -altura)))) @ eixos.T
+        return np.column_stack((cx + focal * camera[:, 0] / camera[:, 2], cy + focal * camera[:, 1] / camera[:, 2]))
+
+    return projetar, cy - focal * np.tan(a)
+
+
+def verificar_horizonte():
+    """Câmera com o horizonte na imagem: chão correto abaixo dele e NaN acima; True se ok"""
+    resolucao = (1920, 1080)
+    projetar, horizonte = camera_sintetica(resolucao=resolucao)
+    pontos_chao = np.array([(-2.0, 4.0), (2.0, 4.0), (3.0, 15.0), (-3.0, 15.0)])
+    calibracao = CalibracaoChao(resolucao, projetar(pontos_chao), pontos_chao)
+
+    xs, ys = np.meshgrid(np.linspace(0, resolucao[0], 25), np.linspace(0, resolucao[1], 25))
+    pixels = np.column_stack((xs.ravel(), ys.ravel()))
+    chao = calibracao.para_chao_direto(pixels)
+    ceu = pixels[:, 1] < horizonte - 1
+    piso = pixels[:, 1] > horizonte + 1
+
+    erro = np.linalg.norm(projetar(chao[piso]) - pixels[piso], axis=1)
+    erro_max = np.nanmax(erro) if np.isfinite(erro).any() else float('nan')
+    ok = bool(np.isnan(chao[ceu]).all() and np.isfinite(chao[piso]).all() and erro_max < 0.5)
+    print(f"🌅 Horizonte na imagem (v = {horizonte:.0f} px): {np.isnan(chao[ceu]).mean():.0%} do céu NaN, "
+          f"{np.isfinite(chao[piso]).mean():.0%} do piso no chão, erro máx. {erro_max:.2f} px "
+          f"-> {'ok' if ok else 'FALHOU'}")
+    return ok
+
+
+def frames_anotados(caminho, posicoes):
+    """(frame, posições anotadas nele) em ordem, decodificando o vídeo uma vez"""
+    por_frame = {}
+    for p in posicoes:
+        por_frame.setdefault(int(p['frame']), []).append((p['x'], p['y']))
+
+    cap = cv2.VideoCapture(caminho)
+    k = 0
+    ultimo = max(por_frame)
+    while k <= ultimo:
+        if k in por_frame:
+            ret, frame = cap.read()
+            if not ret:
+                break
+            yield frame, np.array(por_frame[k], np.float64)
+        elif not cap.grab():
+            break
+        k += 1
+    cap.release()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('video', nargs='?')
+    parser.add_argument('calibracao', nargs='?')
+    parser.add_argument('posicoes', nargs='?', help='JSON com as posições medidas no chão por frame')
+    parser.add_argument('--backend', choices=BACKENDS, default='ultralytics')
+    parser.add_argument('--modelo', default='yolov8n.pt')
+    parser.add_argument('--imgsz', type=int, default=640)
+    parser.add_argument('--fator-escala', type=int, default=2, help='frame exibido → frame de inferência')
+    parser.add_argument('--confianca', type=float, default=0.7)
+    parser.add_argument('--raio', type=float, default=1.5,
+                        help='distância máx. (m) entre a detecção e a posição medida para parear')
+    args = parser.parse_args()
+
+    if not verificar_horizonte():
+        raise SystemExit(1)
+    if args.posicoes is None:
+        if args.video is not None:
+            parser.error('informe video, calibracao e posicoes')
+        return
+
+    calibracao = carregar_calibracao(args.calibracao)
+    with open(args.posicoes, encoding='utf-8') as f:
+        posicoes = json.load(f)['posicoes']
+    backend = criar_backend(args.backend, args.modelo, args.imgsz)
+
+    erro_posicao, erro_distancia, erro_altura, erro_tabela = [], [], [], []
+    perdidas = 0
+    for frame, medidas in frames_anotados(args.video, posicoes):
+        h, w = frame.shape[:2]
+        inferencia = cv2.resize(frame, (w // args.fator_escala, h // args.fator_escala))
+        if calibracao.chao is None or calibracao.chao.shape[:2] != inferencia.shape[:2]:
+            calibracao.preparar(inferencia.shape)
+
+        deteccoes = backend.detectar([inferencia])[0]
+        xyxy = deteccoes.xyxy[deteccoes.conf >= args.confianca].astype(np.float64)
+        pes_x = (xyxy[:, 0] + xyxy[:, 2]) / 2
+        pes_y = xyxy[:, 3]
+        chao = calibracao.para_chao(pes_x, pes_y).astype(np.float64)
+
+        for medida in medidas:
+            erros = np.linalg.norm(chao - medida, axis=1)
+            if not np.isfinite(erros).any() or np.nanmin(erros) > args.raio:
+                perdidas += 1
+                continue
+            i = int(np.nanargmin(erros))
+            erro_posicao.append(erros[i])
+
+            distancia_real = np.linalg.norm(medida - calibracao.referencia)
+            erro_distancia.append(abs(calibracao.distancia(pes_x[i:i + 1], pes_y[i:i + 1])[0] - distancia_real))
+
+            altura_px = (xyxy[i, 3] - xyxy[i, 1]) * args.fator_escala
+            distancia_altura = ALTURA_PESSOA_REAL * FOCAL_LENGTH / max(altura_px, 1) / 100
+            erro_altura.append(abs(distancia_altura - distancia_real))
+
+            # Ponto dos pés na resolução da calibração, sem tabela
+            escala = (calibracao.resolucao[0] / inferencia.shape[1], calibracao.resolucao[1] / inferencia.shape[0])
+            direto = calibracao.para_chao_direto([[pes_x[i] * escala[0], pes_y[i] * escala[1]]])[0]
+            erro_tabela.append(np.linalg.norm(chao[i] - direto))
+
+    print(f"📐 Erro de reprojeção dos pontos de calibração: média "
+          f"{calibracao.erro_reprojecao().mean() * 100:.1f} cm, máx. {calibracao.erro_reprojecao().max() * 100:.1f} cm")
+    print(f"🎯 {len(erro_posicao)} posições pareadas, {perdidas} sem detecção a menos de {args.raio} m")
+    print(f"{'':<34} | {'média':>7} | {'p95':>7} | {'máx.':>7}")
+    resumo('posição no chão (tabela)', erro_posicao)
+    resumo('distância (tabela)', erro_distancia)
+    resumo('distância (altura da caixa)', erro_altura)
+    resumo('tabela vs homografia direta', erro_tabela)
+
+
+if __name__ == '__main__':
+    main()